@@ -20,18 +20,104 @@ class Settings:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
     
+    # Supabase bulk upsert tuning
+    SUPABASE_UPSERT_CHUNK_SIZE: int = int(os.getenv("SUPABASE_UPSERT_CHUNK_SIZE", "1000"))
+    SUPABASE_UPSERT_MAX_RETRIES: int = int(os.getenv("SUPABASE_UPSERT_MAX_RETRIES", "3"))
+    SUPABASE_UPSERT_RETRY_BACKOFF: float = float(os.getenv("SUPABASE_UPSERT_RETRY_BACKOFF", "0.5"))
+    
+    # Worker threads running blocking Supabase calls, and the duration logged as slow
+    SUPABASE_MAX_WORKERS: int = int(os.getenv("SUPABASE_MAX_WORKERS", "8"))
+    SUPABASE_SLOW_CALL_SECONDS: float = float(os.getenv("SUPABASE_SLOW_CALL_SECONDS", "1.0"))
+    
+    # Rows requested per keyset page (Supabase caps a single response at 1000 rows by default)
+    SUPABASE_PAGE_SIZE: int = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
+    
     # NYC OpenData API configuration
     NYC_OPENDATA_APP_TOKEN: Optional[str] = os.getenv("NYC_OPENDATA_APP_TOKEN")
     
     # NYC OpenData API endpoint
     NYC_OPENDATA_BASE_URL: str = "https://data.cityofnewyork.us/resource/p5f6-bkga.json"
     
+    # NYC OpenData ingest tuning
+    NYC_OPENDATA_PAGE_SIZE: int = int(os.getenv("NYC_OPENDATA_PAGE_SIZE", "5000"))
+    NYC_OPENDATA_MAX_CONCURRENCY: int = int(os.getenv("NYC_OPENDATA_MAX_CONCURRENCY", "4"))
+    NYC_OPENDATA_MAX_RETRIES: int = int(os.getenv("NYC_OPENDATA_MAX_RETRIES", "3"))
+    NYC_OPENDATA_RETRY_BACKOFF: float = float(os.getenv("NYC_OPENDATA_RETRY_BACKOFF", "1.0"))
+    
+    # Incremental refreshes re-fetch this many minutes before the newest stored complaint
+    INCREMENTAL_OVERLAP_MINUTES: int = int(os.getenv("INCREMENTAL_OVERLAP_MINUTES", "30"))
+    
+    # Heatmap tile pyramid, precomputed whenever the complaint index is rebuilt
+    HEATMAP_TILE_MIN_ZOOM: int = int(os.getenv("HEATMAP_TILE_MIN_ZOOM", "8"))
+    HEATMAP_TILE_MAX_ZOOM: int = int(os.getenv("HEATMAP_TILE_MAX_ZOOM", "16"))
+    HEATMAP_TILE_BINS: int = int(os.getenv("HEATMAP_TILE_BINS", "64"))
+    HEATMAP_TILE_MAX_AGE_SECONDS: int = int(os.getenv("HEATMAP_TILE_MAX_AGE_SECONDS", "300"))
+    HEATMAP_TILE_CACHE_MAX_ENTRIES: int = int(os.getenv("HEATMAP_TILE_CACHE_MAX_ENTRIES", "4096"))
+    
+    # Seconds between background incremental refreshes (0 disables the scheduler)
+    REFRESH_INTERVAL_SECONDS: float = float(os.getenv("REFRESH_INTERVAL_SECONDS", "3600"))
+    
+    # Date-partitioned archive of historical complaints (filled by scripts/backfill_archive.py)
+    ARCHIVE_DIR: Path = Path(os.getenv("ARCHIVE_DIR", str(backend_dir / "archive")))
+    ARCHIVE_MAX_QUERY_DAYS: int = int(os.getenv("ARCHIVE_MAX_QUERY_DAYS", "366"))
+    
+    # Shared outbound HTTP client pool
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    
     # Google Places API configuration
     GOOGLE_PLACES_API_KEY: Optional[str] = os.getenv("GOOGLE_PLACES_API_KEY")
     
+    # Google Places nearby search cache
+    PLACES_CACHE_TTL_SECONDS: int = int(os.getenv("PLACES_CACHE_TTL_SECONDS", "21600"))
+    PLACES_CACHE_MAX_ENTRIES: int = int(os.getenv("PLACES_CACHE_MAX_ENTRIES", "2048"))
+    PLACES_CACHE_SNAP_DEGREES: float = float(os.getenv("PLACES_CACHE_SNAP_DEGREES", "0.005"))
+    PLACES_CACHE_RADIUS_STEP: int = int(os.getenv("PLACES_CACHE_RADIUS_STEP", "500"))
+    
+    # Google Places nearby search pagination (Google returns at most 60 results);
+    # results beyond the request prefetched into the cache (0 disables prefetching)
+    PLACES_MAX_RESULTS: int = int(os.getenv("PLACES_MAX_RESULTS", "20"))
+    PLACES_PREFETCH_MAX_RESULTS: int = int(os.getenv("PLACES_PREFETCH_MAX_RESULTS", "0"))
+    PLACES_PAGE_TOKEN_DELAY_SECONDS: float = float(os.getenv("PLACES_PAGE_TOKEN_DELAY_SECONDS", "2.0"))
+    
+    # Radius (in meters) of the complaint-weighted quietness score of a place
+    QUIETNESS_RADIUS_METERS: float = float(os.getenv("QUIETNESS_RADIUS_METERS", "250"))
+    
+    # Place details disk cache (served stale while refreshed in the background)
+    CACHE_DIR: Path = Path(os.getenv("CACHE_DIR", str(backend_dir / ".cache")))
+    PLACE_DETAILS_FRESH_SECONDS: int = int(os.getenv("PLACE_DETAILS_FRESH_SECONDS", "86400"))
+    PLACE_DETAILS_STALE_SECONDS: int = int(os.getenv("PLACE_DETAILS_STALE_SECONDS", "2592000"))
+    PLACE_DETAILS_CACHE_MAX_BYTES: int = int(os.getenv("PLACE_DETAILS_CACHE_MAX_BYTES", "104857600"))
+    PLACE_DETAILS_PREWARM_COUNT: int = int(os.getenv("PLACE_DETAILS_PREWARM_COUNT", "10"))
+    
+    # Street View and place photo disk cache, and how long browsers may keep images
+    IMAGE_CACHE_FRESH_SECONDS: int = int(os.getenv("IMAGE_CACHE_FRESH_SECONDS", "2592000"))
+    IMAGE_CACHE_STALE_SECONDS: int = int(os.getenv("IMAGE_CACHE_STALE_SECONDS", "7776000"))
+    IMAGE_CACHE_MAX_BYTES: int = int(os.getenv("IMAGE_CACHE_MAX_BYTES", "268435456"))
+    IMAGE_MAX_AGE_SECONDS: int = int(os.getenv("IMAGE_MAX_AGE_SECONDS", "604800"))
+    IMAGE_SNAP_DEGREES: float = float(os.getenv("IMAGE_SNAP_DEGREES", "0.0001"))
+    
     # Google Gemini API configuration
     GOOGLE_GEMINI_API_KEY: Optional[str] = os.getenv("GOOGLE_GEMINI_API_KEY")
     
+    # Concurrent Gemini chat calls, and how long a request waits for a free slot
+    CHAT_MAX_CONCURRENCY: int = int(os.getenv("CHAT_MAX_CONCURRENCY", "4"))
+    CHAT_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("CHAT_QUEUE_TIMEOUT_SECONDS", "10"))
+    
+    # Chat answer cache; near-duplicate questions (same content words, other function words)
+    # need this word similarity, such as 0.85 (0 only answers exact normalized repeats)
+    CHAT_CACHE_TTL_SECONDS: int = int(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+    CHAT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "1024"))
+    CHAT_CACHE_SIMILARITY: float = float(os.getenv("CHAT_CACHE_SIMILARITY", "0"))
+    
+    # Chat sessions: idle timeout, and turns kept verbatim before older ones are summarized
+    CHAT_SESSION_TTL_SECONDS: int = int(os.getenv("CHAT_SESSION_TTL_SECONDS", "1800"))
+    CHAT_SESSION_MAX_ENTRIES: int = int(os.getenv("CHAT_SESSION_MAX_ENTRIES", "1000"))
+    CHAT_SESSION_MAX_TURNS: int = int(os.getenv("CHAT_SESSION_MAX_TURNS", "6"))
+    CHAT_SESSION_SUMMARY_MAX_CHARS: int = int(os.getenv("CHAT_SESSION_SUMMARY_MAX_CHARS", "2000"))
+    
     @property
     def supabase_configured(self) -> bool:
         """Check if Supabase is properly configured."""
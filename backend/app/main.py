@@ -1,15 +1,53 @@
 """FastAPI application entry point."""
 
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import health, complaints, places, chat
+from app.routers import health, complaints, places, chat, metrics
+from app.services.complaint_index import complaint_index_service
+from app.services.http_client import shared_http_client
+from app.services.image_proxy import image_proxy
+from app.services.nyc_opendata import nyc_opendata_client
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.supabase_service import supabase_service
+from app.utils.metrics import MetricsMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load shared in-memory state and start background refreshes on startup; stop them and close pooled clients on shutdown."""
+    # Open the pooled client up front so the first request does not pay for it
+    shared_http_client.client
+    
+    try:
+        await complaint_index_service.rebuild()
+    except Exception as e:
+        # The index is built lazily on the first density request instead
+        logger.warning(f"Could not build complaint index on startup: {e}")
+    
+    refresh_scheduler.start()
+    
+    yield
+    
+    await refresh_scheduler.stop()
+    await shared_http_client.close()
+    await nyc_opendata_client.close()
+    places.place_details_cache.close()
+    image_proxy.close()
+    supabase_service.shutdown()
+
 
 # Create FastAPI app instance
 app = FastAPI(
     title="NYC Quiet Spaces API",
     description="API for finding quiet spaces in NYC using 311 Noise Complaints data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS middleware
@@ -22,13 +60,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Metadata of binary heatmap responses is sent in headers
+    expose_headers=["ETag", "X-Point-Count", "X-Total-Complaints", "X-Max-Density", "X-Grid-Size", "X-Next-Cursor", "X-Chat-Session"],
 )
 
+# Time every request, including the CORS middleware
+app.add_middleware(MetricsMiddleware)
+
 # Register routers
 app.include_router(health.router)
 app.include_router(complaints.router)
 app.include_router(places.router)
 app.include_router(chat.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,6 +1,7 @@
 """Pydantic models for NYC 311 Noise Complaints data."""
 
-from typing import Optional
+from datetime import datetime
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +13,54 @@ class NoiseComplaint(BaseModel):
     latitude: Optional[float] = Field(None, description="Latitude coordinate")
     longitude: Optional[float] = Field(None, description="Longitude coordinate")
     complaint_type: Optional[str] = Field(None, description="Type of complaint")
+    created_date: Optional[datetime] = Field(None, description="When the complaint was created")
+
+
+class ComplaintRow(NamedTuple):
+    """Compact, tuple-backed complaint record used on the ingest path."""
+    
+    unique_key: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    complaint_type: Optional[str]
+    created_date: Optional[str]
+    
+    @classmethod
+    def from_socrata(cls, item: dict) -> "ComplaintRow":
+        """
+        Build a row from a Socrata record.
+        
+        Args:
+            item: Record with (a subset of) the selected columns
+        
+        Returns:
+            ComplaintRow with coordinates parsed to floats
+        
+        Raises:
+            ValueError: If unique_key is missing or a coordinate is not a number
+        """
+        unique_key = item.get("unique_key")
+        if not unique_key:
+            raise ValueError("Missing unique_key")
+        
+        latitude = item.get("latitude")
+        longitude = item.get("longitude")
+        
+        return cls(
+            unique_key=unique_key,
+            latitude=float(latitude) if latitude is not None else None,
+            longitude=float(longitude) if longitude is not None else None,
+            complaint_type=item.get("complaint_type"),
+            created_date=item.get("created_date"),
+        )
+    
+    def to_record(self) -> dict:
+        """Convert to a JSON-safe dictionary without empty fields, for upserts."""
+        return {field: value for field, value in zip(self._fields, self) if value is not None}
+    
+    def to_model(self) -> NoiseComplaint:
+        """Convert to a validated NoiseComplaint."""
+        return NoiseComplaint(**self._asdict())
 
 
 class NoiseComplaintCreate(NoiseComplaint):
@@ -1,14 +1,31 @@
 """Chat router for Gemini AI chatbot."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from starlette.background import BackgroundTask
 import google.generativeai as genai
 
 from app.config import settings
+from app.services.chat_cache import ChatCacheKey, chat_response_cache
+from app.services.chat_sessions import ChatSession, chat_session_store
+from app.utils.metrics import track_upstream
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+GEMINI_MODEL = "gemini-flash-latest"
+
+# Limits concurrent Gemini calls so chat traffic cannot crowd out the map endpoints
+chat_slots = asyncio.Semaphore(settings.CHAT_MAX_CONCURRENCY)
+
 
 class PlaceContext(BaseModel):
     """Place information for context."""
@@ -22,11 +39,14 @@ class ChatRequest(BaseModel):
     """Chat request model."""
     message: str
     places: Optional[list[PlaceContext]] = None
+    session_id: Optional[str] = None  # From an earlier response, to continue that conversation
 
 
 class ChatResponse(BaseModel):
     """Chat response model."""
     response: str
+    session_id: str
+    cached: bool = False
 
 
 SYSTEM_PROMPT = """You are a helpful assistant for NYC Quiet Spaces, an app that helps people find quiet places in New York City to study, work, or relax.
@@ -45,41 +65,250 @@ Guidelines:
 """
 
 
-@router.post("", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+def format_places(places: list[PlaceContext]) -> str:
+    """Format the places the user can see as a list for the model."""
+    return "\n".join([
+        f"- {p.name} ({p.type or 'unknown type'}): {p.address or 'address unknown'}, Rating: {p.rating or 'N/A'}"
+        for p in places
+    ])
+
+
+def build_system_instruction(session: ChatSession) -> str:
     """
-    Send a message to the Gemini chatbot.
+    Build the system instruction of a session's next turn.
+    
+    The places context and the summary of compacted turns are sent here,
+    once per request, rather than repeated in every message of the history.
+    """
+    instruction = SYSTEM_PROMPT
+    if session.places_text:
+        instruction += f"\n\nNearby quiet places the user can see:\n{session.places_text}"
+    if session.summary:
+        instruction += f"\n\nSummary of the earlier conversation:\n{session.summary}"
+    return instruction
+
+
+def cache_key(request: ChatRequest) -> ChatCacheKey:
+    """Get the answer cache key of a chat request."""
+    return chat_response_cache.key_for(request.message, [p.model_dump() for p in request.places or []])
+
+
+def get_model(system_instruction: Optional[str] = None) -> genai.GenerativeModel:
+    """
+    Get a Gemini model client.
+    
+    Args:
+        system_instruction: Optional system instruction for the model
     
-    Optionally include nearby places for context-aware recommendations.
+    Raises:
+        HTTPException: If the Gemini API key is not configured
     """
     if not settings.gemini_configured:
         raise HTTPException(
-            status_code=503,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Gemini API is not configured. Please set GOOGLE_GEMINI_API_KEY."
         )
     
+    genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
+    return genai.GenerativeModel(GEMINI_MODEL, system_instruction=system_instruction)
+
+
+async def acquire_chat_slot() -> None:
+    """
+    Wait for one of the CHAT_MAX_CONCURRENCY chat slots.
+    
+    Raises:
+        HTTPException: 503 with Retry-After if no slot frees up within
+            CHAT_QUEUE_TIMEOUT_SECONDS
+    """
     try:
-        # Configure Gemini
-        genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-flash-latest")
+        await asyncio.wait_for(chat_slots.acquire(), timeout=settings.CHAT_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Rejected chat request: all chat slots busy")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The assistant is busy. Please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+
+
+@asynccontextmanager
+async def chat_slot() -> AsyncIterator[None]:
+    """Hold a chat slot for the duration of the block."""
+    await acquire_chat_slot()
+    try:
+        yield
+    finally:
+        chat_slots.release()
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> bytes:
+    """Format one Server-Sent Event with a JSON payload."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+def open_session(request: ChatRequest) -> ChatSession:
+    """
+    Get the request's chat session, updating its places context if places were sent.
+    
+    Raises:
+        HTTPException: 503 if Gemini is not configured
+    """
+    get_model()
+    session = chat_session_store.get_or_create(request.session_id)
+    if request.places is not None:
+        session.places_text = format_places(request.places)
+    return session
+
+
+@router.post("", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """
+    Send a message to the Gemini chatbot.
+    
+    Optionally include nearby places for context-aware recommendations,
+    and the ``session_id`` of an earlier response to continue that
+    conversation. Repeated and near-duplicate opening questions about the
+    same places are answered from the chat cache.
+    """
+    session = open_session(request)
+    
+    async with session.lock:
+        async def generate() -> str:
+            async with chat_slot():
+                # Generate response without blocking the event loop
+                model = get_model(build_system_instruction(session))
+                chat = model.start_chat(history=session.history)
+                with track_upstream("gemini", "generate"):
+                    response = await chat.send_message_async(request.message)
+                    return response.text
         
-        # Build context with places if provided
-        context = SYSTEM_PROMPT
-        if request.places:
-            places_info = "\n".join([
-                f"- {p.name} ({p.type or 'unknown type'}): {p.address or 'address unknown'}, Rating: {p.rating or 'N/A'}"
-                for p in request.places
-            ])
-            context += f"\n\nNearby quiet places the user can see:\n{places_info}"
+        try:
+            if session.turns == 0:
+                answer, match = await chat_response_cache.get_or_generate(cache_key(request), generate)
+            else:
+                answer, match = await generate(), None
         
-        # Generate response
-        chat = model.start_chat(history=[])
-        response = chat.send_message(f"{context}\n\nUser: {request.message}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating chat response: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate response: {str(e)}"
+            )
         
-        return ChatResponse(response=response.text)
+        chat_session_store.record_turn(session, request.message, answer)
+    
+    return ChatResponse(response=answer, session_id=session.id, cached=match is not None)
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Send a message to the Gemini chatbot and stream the answer as Server-Sent Events.
+    
+    Each generated chunk is sent as ``data: {"text": "..."}`` as soon as
+    Gemini produces it. The stream ends with an ``event: done`` carrying
+    the full response and the ``session_id`` (also sent up front in the
+    ``X-Chat-Session`` header), or an ``event: error`` carrying a
+    ``detail`` message if generation fails part-way. Cached answers are
+    sent as a single chunk, with ``"cached": true`` in the done event.
+    
+    Returns:
+        StreamingResponse of ``text/event-stream`` events
+    
+    Raises:
+        HTTPException: 503 if Gemini is not configured or all chat slots are busy
+    """
+    session = open_session(request)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Chat-Session": session.id}
+    
+    cached = None
+    if session.turns == 0:
+        cached, _ = chat_response_cache.lookup(cache_key(request))
+    
+    if cached is not None:
+        async with session.lock:
+            chat_session_store.record_turn(session, request.message, cached)
+        
+        async def cached_events() -> AsyncIterator[bytes]:
+            yield sse_event({"text": cached})
+            yield sse_event({"response": cached, "session_id": session.id, "cached": True}, event="done")
+        
+        return StreamingResponse(cached_events(), media_type="text/event-stream", headers=headers)
+    
+    # Turns of one session run one at a time, in order, and like /chat take
+    # the session lock before a slot, so a session never holds two slots.
+    # Both are taken before responding, so a full queue still gets a 503.
+    await session.lock.acquire()
+    try:
+        await acquire_chat_slot()
+    except BaseException:
+        session.lock.release()
+        raise
+    released = False
+    
+    def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            chat_slots.release()
+            session.lock.release()
+    
+    async def events() -> AsyncIterator[bytes]:
+        parts = []
+        try:
+            first_turn = session.turns == 0
+            model = get_model(build_system_instruction(session))
+            chat = model.start_chat(history=session.history)
+            # Timed until the last chunk has been sent on
+            with track_upstream("gemini", "stream"):
+                response = await chat.send_message_async(request.message, stream=True)
+                async for chunk in response:
+                    text = chunk.text
+                    if text:
+                        parts.append(text)
+                        yield sse_event({"text": text})
+            
+            full_response = "".join(parts)
+            chat_session_store.record_turn(session, request.message, full_response)
+            release()
+            
+            if first_turn:
+                chat_response_cache.set(cache_key(request), full_response)
+            yield sse_event({"response": full_response, "session_id": session.id, "cached": False}, event="done")
         
-    except Exception as e:
+        except Exception as e:
+            logger.error(f"Error streaming chat response: {e}")
+            yield sse_event({"detail": f"Failed to generate response: {str(e)}"}, event="error")
+        finally:
+            # Also runs when the client disconnects mid-stream
+            release()
+    
+    stream = events()
+    
+    async def close() -> None:
+        # Runs once the response has finished or the client has gone; a
+        # stream that was never started never runs its finally block
+        await stream.aclose()
+        release()
+    
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers, background=BackgroundTask(close))
+
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def end_session(session_id: str) -> Response:
+    """
+    End a chat session and discard its history.
+    
+    Raises:
+        HTTPException: 404 if the session does not exist or has expired
+    """
+    if not chat_session_store.delete(session_id):
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate response: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chat session not found: {session_id}"
         )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
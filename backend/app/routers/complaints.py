@@ -1,20 +1,60 @@
 """Complaints API endpoints."""
 
+import asyncio
 import logging
-from typing import List, Optional
-from collections import defaultdict
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
+from app.config import settings
 from app.models.noise_complaint import NoiseComplaint
+from app.services.archive import complaint_archive
+from app.services.complaint_index import (
+    BoundingBox,
+    ComplaintIndex,
+    complaint_index_service,
+    grid_size_for_zoom,
+)
+from app.services.refresh_scheduler import refresh_scheduler
 from app.services.supabase_service import supabase_service
-from app.services.nyc_opendata import nyc_opendata_client
+from app.utils.cache import TTLCache
+from app.utils.wire_format import (
+    FORMAT_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPE,
+    POINT_FORMATS,
+    compress_body,
+    compressed_response,
+    dump_json,
+    encode_points,
+    encoded_response,
+    etag_matches,
+    negotiate_encoding,
+    negotiate_format,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/complaints", tags=["complaints"])
 
+# Limits for nearby complaint queries
+MAX_NEAR_RADIUS_METERS = 5000
+MAX_NEAR_K = 100
+MAX_NEAR_BATCH_POINTS = 1000
+
+# Serialized, compressed heatmap tiles with their content encoding and format headers,
+# keyed by (index version, z, x, y, format, negotiated encoding)
+heatmap_tile_cache: TTLCache[
+    Tuple[str, int, int, int, str, Optional[str]],
+    Tuple[bytes, Optional[str], Dict[str, str]],
+] = TTLCache(
+    name="heatmap_tiles",
+    maxsize=settings.HEATMAP_TILE_CACHE_MAX_ENTRIES,
+    ttl=24 * 60 * 60,
+)
+
 
 class HeatmapPoint(BaseModel):
     """A point for the heatmap with lat, lng, and weight."""
@@ -28,29 +68,214 @@ class DensityResponse(BaseModel):
     points: List[HeatmapPoint]
     total_complaints: int
     max_density: int
+    grid_size: Optional[float] = None
+
+
+class NearbyComplaint(BaseModel):
+    """A complaint close to a query point."""
+    lat: float
+    lng: float
+    complaint_type: str
+    distance_m: float
+
+
+class NearbyComplaintsResponse(BaseModel):
+    """Complaints around a single point."""
+    lat: float
+    lng: float
+    radius: float
+    count: int
+    by_type: Optional[Dict[str, int]] = None
+    nearest: List[NearbyComplaint] = []
+
+
+class NearbyPoint(BaseModel):
+    """A point to query nearby complaints for."""
+    lat: float
+    lng: float
+
+
+class NearbyBatchRequest(BaseModel):
+    """Several points to query nearby complaints for in one request."""
+    points: List[NearbyPoint] = Field(..., max_length=MAX_NEAR_BATCH_POINTS)
+    radius: float = Field(300, gt=0, le=MAX_NEAR_RADIUS_METERS, description="Radius in meters")
+    k: int = Field(0, ge=0, le=MAX_NEAR_K, description="Number of nearest complaints to return")
+    by_type: bool = Field(False, description="Include per-complaint_type counts")
+
+
+class NearbyBatchResponse(BaseModel):
+    """Nearby complaints for each requested point, in request order."""
+    results: List[NearbyComplaintsResponse]
+
+
+class DailyCount(BaseModel):
+    """Number of archived complaints on one day."""
+    date: date
+    count: int
+
+
+class TrendResponse(BaseModel):
+    """Daily archived complaint counts over a date range."""
+    start: date
+    end: date
+    days: List[DailyCount]
+    total: int
+
+
+def validate_date_range(start: date, end: date) -> None:
+    """Reject inverted or overly long archive query ranges with a 400."""
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days + 1 > settings.ARCHIVE_MAX_QUERY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {settings.ARCHIVE_MAX_QUERY_DAYS} days",
+        )
+
+
+def parse_viewport(
+    min_lat: Optional[float],
+    max_lat: Optional[float],
+    min_lng: Optional[float],
+    max_lng: Optional[float],
+) -> Optional[BoundingBox]:
+    """Build a viewport from optional edges, rejecting inverted ones with a 400."""
+    edges = {"min_lat": min_lat, "max_lat": max_lat, "min_lng": min_lng, "max_lng": max_lng}
+    if all(edge is None for edge in edges.values()):
+        return None
+    
+    bbox = BoundingBox(**{name: edge for name, edge in edges.items() if edge is not None})
+    if bbox.min_lat > bbox.max_lat or bbox.min_lng > bbox.max_lng:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Viewport minimum bounds must not exceed maximum bounds",
+        )
+    return bbox
+
+
+def negotiate_request_format(
+    format: Optional[str],
+    accept: Optional[str],
+    supported: Tuple[str, ...] = POINT_FORMATS,
+) -> str:
+    """Pick the response format, rejecting unsupported ones with a 400."""
+    try:
+        return negotiate_format(format, accept, supported)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def query_nearby(
+    index: ComplaintIndex,
+    points: List[NearbyPoint],
+    radius: float,
+    k: int,
+    by_type: bool,
+) -> List[NearbyComplaintsResponse]:
+    """
+    Answer nearby complaint queries for many points with batched KD-tree lookups.
+    
+    Args:
+        index: Complaint index to query
+        points: Query points
+        radius: Radius in meters for the counts
+        k: Number of nearest complaints to include per point
+        by_type: Whether to include per-complaint_type counts
+    
+    Returns:
+        One NearbyComplaintsResponse per point
+    """
+    lats = [point.lat for point in points]
+    lngs = [point.lng for point in points]
+    
+    counts = index.count_within(lats, lngs, radius)
+    breakdowns = index.types_within(lats, lngs, radius) if by_type else [None] * len(points)
+    distances, indices = index.nearest(lats, lngs, k)
+    
+    results = []
+    for i, point in enumerate(points):
+        nearest = [
+            NearbyComplaint(
+                lat=float(index.latitudes[j]),
+                lng=float(index.longitudes[j]),
+                complaint_type=index.type_names[index.type_codes[j]],
+                distance_m=round(float(distance), 1),
+            )
+            for distance, j in zip(distances[i], indices[i])
+        ]
+        results.append(NearbyComplaintsResponse(
+            lat=point.lat,
+            lng=point.lng,
+            radius=radius,
+            count=int(counts[i]),
+            by_type=breakdowns[i],
+            nearest=nearest,
+        ))
+    return results
 
 
 @router.get("", response_model=List[NoiseComplaint])
 async def get_complaints(
-    limit: int = 1000,
-    has_location: bool = True
-) -> List[NoiseComplaint]:
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum complaints (default 1000; unlimited for ndjson)"),
+    has_location: bool = True,
+    cursor: Optional[str] = Query(None, description="unique_key to continue after (from X-Next-Cursor)"),
+    format: Optional[str] = Query(None, description="Response format: json (default), columnar or ndjson"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     """
-    Get noise complaints from the database.
+    Get noise complaints from the database, ordered by unique_key.
+    
+    Results are paged by keyset: when more complaints may follow, the
+    ``X-Next-Cursor`` header holds the unique_key to pass as ``cursor``
+    for the next page. The columnar format returns one array per field
+    (``{"unique_key": [...], "latitude": [...], ...}``) straight from the
+    database rows. The ndjson format streams one complaint per line as
+    pages arrive from the database, so full exports start quickly and
+    use constant memory.
     
     Args:
-        limit: Maximum number of complaints to return (default 1000)
+        limit: Maximum number of complaints to return
         has_location: If True, only return complaints with lat/lng coordinates
-        
+        cursor: Optional unique_key; only complaints after it are returned
+        format: Response format (json, columnar or ndjson)
+    
     Returns:
-        List of NoiseComplaint objects
+        List of NoiseComplaint objects, or the encoded/streamed rows
     """
+    response_format = negotiate_request_format(format, accept, supported=("json", "columnar", "ndjson"))
+    
+    if response_format == "ndjson":
+        return await stream_complaints(limit, has_location, cursor)
+    
+    limit = limit or 1000
     try:
-        complaints = supabase_service.get_all_complaints(
-            limit=limit,
-            has_location=has_location
+        if response_format == "json":
+            complaints = await supabase_service.run(
+                supabase_service.get_all_complaints,
+                limit=limit,
+                has_location=has_location,
+                after=cursor
+            )
+            if len(complaints) == limit:
+                response.headers["X-Next-Cursor"] = complaints[-1].unique_key
+            return complaints
+        
+        records = await supabase_service.run(
+            supabase_service.get_complaint_records, limit=limit, has_location=has_location, after=cursor
+        )
+        columns = {field: [record.get(field) for record in records] for field in NoiseComplaint.model_fields}
+        headers = {"X-Next-Cursor": records[-1]["unique_key"]} if len(records) == limit else {}
+        return encoded_response(
+            dump_json(columns),
+            FORMAT_MEDIA_TYPES[response_format],
+            accept_encoding,
+            headers,
         )
-        return complaints
     except Exception as e:
         logger.error(f"Error fetching complaints: {e}")
         raise HTTPException(
@@ -59,91 +284,184 @@ async def get_complaints(
         )
 
 
-@router.post("/refresh")
-async def refresh_complaints():
+async def stream_complaints(
+    limit: Optional[int],
+    has_location: bool,
+    cursor: Optional[str],
+) -> StreamingResponse:
     """
-    Fetch fresh complaints from NYC OpenData and store in database.
+    Stream complaints as NDJSON, one database page at a time.
+    
+    The first page is fetched before the response starts, so a failing
+    database still gets a 500. A failure mid-stream can only end the
+    stream early; clients resume from the last unique_key they received.
+    
+    Args:
+        limit: Maximum number of complaints (None for all)
+        has_location: If True, only return complaints with lat/lng coordinates
+        cursor: Optional unique_key to start after
     
     Returns:
-        Summary of the refresh operation
+        StreamingResponse of newline-delimited complaint objects
     """
+    fields = list(NoiseComplaint.model_fields)
+    pages = supabase_service.stream_complaint_pages(limit, has_location, after=cursor)
+    
     try:
-        # Fetch complaints from NYC OpenData
-        complaints = await nyc_opendata_client.fetch_all_past_week_complaints()
-        
-        # Store in Supabase
-        inserted_count = supabase_service.insert_complaints(complaints)
-        
-        return {
-            "status": "success",
-            "fetched": len(complaints),
-            "inserted": inserted_count
-        }
+        first = await anext(pages, [])
     except Exception as e:
-        logger.error(f"Error refreshing complaints: {e}")
+        await pages.aclose()
+        logger.error(f"Error fetching complaints: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to refresh complaints: {str(e)}"
+            detail=f"Failed to fetch complaints: {str(e)}"
+        )
+    
+    def encode(page: List[dict]) -> bytes:
+        return b"".join(dump_json({field: row.get(field) for field in fields}) + b"\n" for row in page)
+    
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            if first:
+                yield encode(first)
+            async for page in pages:
+                yield encode(page)
+        except Exception as e:
+            logger.error(f"Complaint stream ended early: {e}")
+        finally:
+            await pages.aclose()
+    
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post("/refresh", status_code=status.HTTP_202_ACCEPTED)
+async def refresh_complaints(
+    full: bool = Query(False, description="Re-fetch the whole past week instead of only new complaints"),
+):
+    """
+    Start a refresh of complaints from NYC OpenData in the background.
+    
+    Only complaints newer than the newest stored one are fetched unless
+    ``full`` is set. If a refresh is already queued or running, that job is
+    returned instead of starting another one.
+    
+    Returns:
+        The refresh job, whose progress is available from
+        ``GET /complaints/refresh/{job_id}`` using its ``id``
+    """
+    job = refresh_scheduler.submit(full=full)
+    return job.to_dict()
+
+
+@router.get("/refresh/status")
+async def get_refresh_status():
+    """
+    Get the background refresh schedule and its current and last jobs.
+    
+    Returns:
+        Interval, next scheduled run, and the current and last finished
+        jobs with their duration and row counts
+    """
+    return refresh_scheduler.status()
+
+
+@router.get("/refresh/{job_id}")
+async def get_refresh_job(job_id: str):
+    """
+    Get the progress or result of a refresh job.
+    
+    Args:
+        job_id: Id returned by ``POST /complaints/refresh``
+    
+    Returns:
+        The job's status, timings and sync summary
+    """
+    job = refresh_scheduler.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Refresh job not found: {job_id}",
         )
+    return job.to_dict()
 
 
 @router.get("/density", response_model=DensityResponse)
 async def get_complaint_density(
-    grid_size: float = Query(0.005, description="Grid cell size in degrees (default ~500m)"),
-    limit: int = Query(5000, description="Maximum complaints to process"),
+    grid_size: Optional[float] = Query(None, description="Grid cell size in degrees (default ~500m, or picked from zoom)"),
+    limit: Optional[int] = Query(None, description="Maximum complaints to process (default all)"),
+    min_lat: Optional[float] = Query(None, description="Southern edge of the viewport"),
+    max_lat: Optional[float] = Query(None, description="Northern edge of the viewport"),
+    min_lng: Optional[float] = Query(None, description="Western edge of the viewport"),
+    max_lng: Optional[float] = Query(None, description="Eastern edge of the viewport"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom level, used to pick grid_size when it is omitted"),
+    hour: Optional[int] = Query(None, ge=0, le=23, description="Only count complaints created in this hour of the day"),
+    dow: Optional[int] = Query(None, ge=0, le=6, description="Only count complaints created on this day of the week (0 = Sunday)"),
+    format: Optional[str] = Query(None, description="Response format: json (default), columnar or binary"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
 ) -> DensityResponse:
     """
     Get noise complaint density data for heatmap visualization.
     
     Returns aggregated complaint data grouped by geographic grid cells,
-    suitable for rendering as a heatmap overlay.
+    suitable for rendering as a heatmap overlay. Counts are served from
+    the in-memory complaint index, so no database call is made per request.
+    When viewport bounds are given, only the cells inside them are returned.
+    ``hour`` and ``dow`` (e.g. ``hour=22&dow=5`` for Friday nights) are
+    answered from the hour-of-week cube, binned per time bucket on first use.
+    
+    Compact formats can be picked with ``format`` or the Accept header:
+    columnar JSON (``{"lat": [...], "lng": [...], "w": [...]}``) or packed
+    little-endian float32 lat, lng and weight columns. Bodies are brotli or
+    gzip compressed when the client accepts it.
     
     Args:
         grid_size: Size of grid cells in degrees (0.001 ≈ 100m, 0.01 ≈ 1km)
-        limit: Maximum number of complaints to fetch and process
-        
+        limit: Maximum number of complaints to process
+        min_lat: Southern edge of the viewport
+        max_lat: Northern edge of the viewport
+        min_lng: Western edge of the viewport
+        max_lng: Eastern edge of the viewport
+        zoom: Map zoom level used to choose a grid size
+        hour: Hour of day (0-23, local time) to restrict complaints to
+        dow: Day of week (0 = Sunday) to restrict complaints to
+        format: Response format (json, columnar or binary)
+    
     Returns:
         Heatmap points with lat, lng, and weight (complaint count)
     """
-    try:
-        # Fetch complaints with location data
-        complaints = supabase_service.get_all_complaints(
-            limit=limit,
-            has_location=True
+    response_format = negotiate_request_format(format, accept)
+    
+    if grid_size is None:
+        grid_size = grid_size_for_zoom(zoom) if zoom is not None else 0.005
+    
+    if grid_size <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="grid_size must be positive",
         )
+    
+    bbox = parse_viewport(min_lat, max_lat, min_lng, max_lng)
+    
+    try:
+        index = await complaint_index_service.get_index()
+        grid = index.grid(grid_size, limit=limit, bbox=bbox, dow=dow, hour=hour)
         
-        if not complaints:
-            return DensityResponse(points=[], total_complaints=0, max_density=0)
-        
-        # Group complaints by grid cell
-        grid_counts: dict[tuple[float, float], int] = defaultdict(int)
-        
-        for complaint in complaints:
-            if complaint.latitude is not None and complaint.longitude is not None:
-                # Round to grid cell
-                grid_lat = round(complaint.latitude / grid_size) * grid_size
-                grid_lng = round(complaint.longitude / grid_size) * grid_size
-                grid_counts[(grid_lat, grid_lng)] += 1
-        
-        # Find max density for normalization
-        max_density = max(grid_counts.values()) if grid_counts else 0
-        
-        # Convert to heatmap points
-        points = []
-        for (lat, lng), count in grid_counts.items():
-            # Weight is the count - higher count = more weight = more red
-            points.append(HeatmapPoint(
-                lat=lat,
-                lng=lng,
-                weight=float(count),
-            ))
-        
-        return DensityResponse(
-            points=points,
-            total_complaints=len(complaints),
-            max_density=max_density,
+        # Weight is the count - higher count = more weight = more red
+        lats, lngs = grid.cell_centers()
+        body, headers = encode_points(
+            response_format,
+            lats,
+            lngs,
+            grid.counts,
+            {
+                "total_complaints": int(grid.counts.sum()),
+                "max_density": grid.max_density,
+                "grid_size": grid_size,
+            },
         )
-        
+        return encoded_response(body, FORMAT_MEDIA_TYPES[response_format], accept_encoding, headers)
+    
     except Exception as e:
         logger.error(f"Error calculating density: {e}")
         raise HTTPException(
@@ -151,3 +469,254 @@ async def get_complaint_density(
             detail=f"Failed to calculate complaint density: {str(e)}"
         )
 
+
+@router.get("/near", response_model=NearbyComplaintsResponse)
+async def get_complaints_near(
+    lat: float = Query(..., description="Latitude of the point"),
+    lng: float = Query(..., description="Longitude of the point"),
+    radius: float = Query(300, gt=0, le=MAX_NEAR_RADIUS_METERS, description="Radius in meters"),
+    k: int = Query(0, ge=0, le=MAX_NEAR_K, description="Number of nearest complaints to return"),
+    by_type: bool = Query(False, description="Include per-complaint_type counts"),
+) -> NearbyComplaintsResponse:
+    """
+    Get the complaints around a point.
+    
+    Served from a KD-tree in the in-memory complaint index, so each query
+    takes logarithmic time and makes no database call.
+    
+    Args:
+        lat: Latitude of the point
+        lng: Longitude of the point
+        radius: Radius in meters for the count
+        k: Number of nearest complaints to return
+        by_type: Whether to break the count down by complaint type
+    
+    Returns:
+        Complaint count within the radius, optional per-type counts and
+        the k nearest complaints
+    """
+    try:
+        index = await complaint_index_service.get_index()
+        return query_nearby(index, [NearbyPoint(lat=lat, lng=lng)], radius, k, by_type)[0]
+    except Exception as e:
+        logger.error(f"Error querying nearby complaints: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query nearby complaints: {str(e)}"
+        )
+
+
+@router.post("/near/batch", response_model=NearbyBatchResponse)
+async def get_complaints_near_batch(request: NearbyBatchRequest) -> NearbyBatchResponse:
+    """
+    Get the complaints around many points in one request.
+    
+    Args:
+        request: Points plus the radius, k and by_type options shared by all of them
+    
+    Returns:
+        One result per point, in request order
+    """
+    try:
+        index = await complaint_index_service.get_index()
+        results = query_nearby(index, request.points, request.radius, request.k, request.by_type)
+        return NearbyBatchResponse(results=results)
+    except Exception as e:
+        logger.error(f"Error querying nearby complaints: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query nearby complaints: {str(e)}"
+        )
+
+
+@router.get("/tiles/{z}/{x}/{y}")
+async def get_density_tile(
+    z: int = Path(..., ge=0, le=22, description="Zoom level"),
+    x: int = Path(..., ge=0, description="Tile column"),
+    y: int = Path(..., ge=0, description="Tile row"),
+    format: Optional[str] = Query(None, description="Response format: json (default), columnar or binary"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get the heatmap points of one z/x/y slippy-map tile.
+    
+    Tiles are binned from the in-memory complaint index when it is rebuilt,
+    and serialized tiles are kept in memory, compressed once per content
+    encoding. Every response carries a strong ETag tied to the index
+    contents, so unchanged tiles revalidate with a 304 Not Modified.
+    Formats and compression are as for ``/density``.
+    
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+        format: Response format (json, columnar or binary)
+        if_none_match: ETag the client already holds
+    
+    Returns:
+        The tile's heatmap points, total complaints and max density
+    """
+    response_format = negotiate_request_format(format, accept)
+    
+    try:
+        index = await complaint_index_service.get_index()
+    except Exception as e:
+        logger.error(f"Error loading complaint index: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load complaint tiles: {str(e)}"
+        )
+    
+    etag = f'"{index.version}-{z}-{x}-{y}-{response_format}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HEATMAP_TILE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    encoding = negotiate_encoding(accept_encoding)
+    
+    async def render() -> Tuple[bytes, Optional[str], Dict[str, str]]:
+        try:
+            bins = index.tiles.tile(z, x, y)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        body, format_headers = encode_points(
+            response_format,
+            bins.latitudes,
+            bins.longitudes,
+            bins.counts,
+            {
+                "z": z,
+                "x": x,
+                "y": y,
+                "total_complaints": int(bins.counts.sum()),
+                "max_density": int(bins.counts.max(initial=0)),
+            },
+        )
+        return (*compress_body(body, encoding), format_headers)
+    
+    # Cached compressed, so a hit is served without re-running brotli or gzip
+    body, applied, format_headers = await heatmap_tile_cache.get_or_fetch(
+        (index.version, z, x, y, response_format, encoding), render
+    )
+    return compressed_response(body, FORMAT_MEDIA_TYPES[response_format], applied, {**headers, **format_headers})
+
+
+@router.get("/history/density", response_model=DensityResponse)
+async def get_history_density(
+    start: date = Query(..., description="First day (YYYY-MM-DD)"),
+    end: date = Query(..., description="Last day (YYYY-MM-DD), inclusive"),
+    grid_size: float = Query(0.005, gt=0, description="Grid cell size in degrees"),
+    min_lat: Optional[float] = Query(None, description="Southern edge of the viewport"),
+    max_lat: Optional[float] = Query(None, description="Northern edge of the viewport"),
+    min_lng: Optional[float] = Query(None, description="Western edge of the viewport"),
+    max_lng: Optional[float] = Query(None, description="Eastern edge of the viewport"),
+    hour: Optional[int] = Query(None, ge=0, le=23, description="Only count complaints created in this hour of the day"),
+    dow: Optional[int] = Query(None, ge=0, le=6, description="Only count complaints created on this day of the week (0 = Sunday)"),
+    format: Optional[str] = Query(None, description="Response format: json (default), columnar or binary"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+) -> DensityResponse:
+    """
+    Get complaint density over a historical date range.
+    
+    Served from the local date-partitioned archive; only the partitions
+    inside the range are read. Filters and formats are as for ``/density``.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        grid_size: Size of grid cells in degrees
+        min_lat: Southern edge of the viewport
+        max_lat: Northern edge of the viewport
+        min_lng: Western edge of the viewport
+        max_lng: Eastern edge of the viewport
+        hour: Hour of day (0-23, local time) to restrict complaints to
+        dow: Day of week (0 = Sunday) to restrict complaints to
+        format: Response format (json, columnar or binary)
+    
+    Returns:
+        Heatmap points with lat, lng, and weight (complaint count)
+    """
+    response_format = negotiate_request_format(format, accept)
+    validate_date_range(start, end)
+    bbox = parse_viewport(min_lat, max_lat, min_lng, max_lng)
+    
+    try:
+        grid = await asyncio.to_thread(
+            complaint_archive.density, start, end, grid_size, bbox=bbox, dow=dow, hour=hour
+        )
+        
+        lats, lngs = grid.cell_centers()
+        body, headers = encode_points(
+            response_format,
+            lats,
+            lngs,
+            grid.counts,
+            {
+                "total_complaints": int(grid.counts.sum()),
+                "max_density": grid.max_density,
+                "grid_size": grid_size,
+            },
+        )
+        return encoded_response(body, FORMAT_MEDIA_TYPES[response_format], accept_encoding, headers)
+    
+    except Exception as e:
+        logger.error(f"Error calculating historical density: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate historical density: {str(e)}"
+        )
+
+
+@router.get("/history/trend", response_model=TrendResponse)
+async def get_history_trend(
+    start: date = Query(..., description="First day (YYYY-MM-DD)"),
+    end: date = Query(..., description="Last day (YYYY-MM-DD), inclusive"),
+    lat: Optional[float] = Query(None, description="Latitude of the point to count around"),
+    lng: Optional[float] = Query(None, description="Longitude of the point to count around"),
+    radius: float = Query(300, gt=0, le=MAX_NEAR_RADIUS_METERS, description="Radius in meters around the point"),
+) -> TrendResponse:
+    """
+    Get daily complaint counts over a historical date range.
+    
+    Counts cover the whole city, or only complaints within ``radius`` of
+    ``lat``/``lng`` when both are given. Days missing from the archive are
+    left out.
+    
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        lat: Latitude of the point
+        lng: Longitude of the point
+        radius: Radius in meters around the point
+    
+    Returns:
+        Complaint count per archived day and their total
+    """
+    validate_date_range(start, end)
+    if (lat is None) != (lng is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat and lng must be given together",
+        )
+    
+    try:
+        counts = await asyncio.to_thread(complaint_archive.daily_counts, start, end, lat, lng, radius)
+        return TrendResponse(
+            start=start,
+            end=end,
+            days=[DailyCount(date=day, count=count) for day, count in counts],
+            total=sum(count for _, count in counts),
+        )
+    except Exception as e:
+        logger.error(f"Error calculating complaint trend: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate complaint trend: {str(e)}"
+        )
@@ -7,6 +7,8 @@ from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
 
 from app.config import settings
+from app.services.supabase_service import supabase_service
+from app.utils.cache import cache_stats
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -50,3 +52,30 @@ async def readiness_check() -> JSONResponse:
     
     return JSONResponse(content=response_data, status_code=status_code)
 
+
+@router.get("/caches")
+async def cache_status() -> Dict[str, Any]:
+    """
+    Report size and hit/miss counters of the in-memory caches.
+    
+    Returns:
+        Dictionary of cache stats keyed by cache name
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "caches": cache_stats(),
+    }
+
+
+@router.get("/database")
+async def database_status() -> Dict[str, Any]:
+    """
+    Report the Supabase worker pool size and per-method call timings.
+    
+    Returns:
+        Dictionary with the pool size and call counts, errors and durations
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        **supabase_service.call_stats(),
+    }
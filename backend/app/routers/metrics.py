@@ -0,0 +1,120 @@
+"""Prometheus metrics endpoint."""
+
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Response
+
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.supabase_service import supabase_service
+from app.utils.cache import cache_stats
+from app.utils.metrics import PROMETHEUS_MEDIA_TYPE, MetricFamily, metrics
+
+router = APIRouter(tags=["metrics"])
+
+# Cache stats counted as lookups, and the result label each is exported under
+CACHE_RESULTS = {
+    "hits": "hit",
+    "stale_hits": "stale_hit",
+    "similar_hits": "similar_hit",
+    "coalesced": "coalesced",
+    "misses": "miss",
+}
+
+
+def collect_caches() -> List[MetricFamily]:
+    """Export the lookups, size and hit ratio of every registered cache."""
+    lookups = MetricFamily("cache_lookups_total", "counter", "Cache lookups by result", [])
+    evictions = MetricFamily("cache_evictions_total", "counter", "Entries evicted to stay within the cache bound", [])
+    entries = MetricFamily("cache_entries", "gauge", "Entries currently cached", [])
+    size = MetricFamily("cache_bytes", "gauge", "Bytes stored by disk caches", [])
+    hit_ratio = MetricFamily("cache_hit_ratio", "gauge", "Share of lookups served from the cache", [])
+    
+    for name, stats in cache_stats().items():
+        cache = {"cache": name}
+        for key, result in CACHE_RESULTS.items():
+            if key in stats:
+                lookups.samples.append(({**cache, "result": result}, stats[key]))
+        evictions.samples.append((cache, stats["evictions"]))
+        entries.samples.append((cache, stats["size"]))
+        if "bytes" in stats:
+            size.samples.append((cache, stats["bytes"]))
+        hit_ratio.samples.append((cache, stats["hit_ratio"]))
+    
+    return [lookups, evictions, entries, size, hit_ratio]
+
+
+def collect_database() -> List[MetricFamily]:
+    """Export the Supabase worker pool size (call timings are upstream metrics)."""
+    return [MetricFamily(
+        "supabase_max_workers",
+        "gauge",
+        "Size of the Supabase worker pool",
+        [({}, supabase_service.call_stats()["max_workers"])],
+    )]
+
+
+def collect_refresh() -> List[MetricFamily]:
+    """Export whether a refresh is running and how the last one went."""
+    status = refresh_scheduler.status()
+    families = [MetricFamily(
+        "refresh_job_running",
+        "gauge",
+        "Whether a complaint refresh is queued or running",
+        [({}, int(status["current_job"] is not None))],
+    )]
+    
+    last = refresh_scheduler.last_finished
+    if last is None:
+        return families
+    
+    rows = []
+    if last.summary is not None:
+        rows = [({"stage": "fetched"}, last.summary["fetched"]), ({"stage": "inserted"}, last.summary["inserted"])]
+    if last.indexed is not None:
+        rows.append(({"stage": "indexed"}, last.indexed))
+    
+    families.extend([
+        MetricFamily(
+            "refresh_last_job_success",
+            "gauge",
+            "Whether the last refresh stored every chunk and rebuilt the index",
+            [({}, int(last.status == "success"))],
+        ),
+        MetricFamily(
+            "refresh_last_job_finished_timestamp_seconds",
+            "gauge",
+            "Unix time the last refresh finished",
+            [({}, last.finished_at.timestamp())],
+        ),
+        MetricFamily(
+            "refresh_last_job_duration_seconds",
+            "gauge",
+            "Duration of the last refresh",
+            [({}, last.duration_seconds)],
+        ),
+        MetricFamily("refresh_last_job_rows", "gauge", "Complaint rows handled by the last refresh", rows),
+    ])
+    return families
+
+
+metrics.register_collector(collect_caches)
+metrics.register_collector(collect_database)
+metrics.register_collector(collect_refresh)
+
+
+@router.get("/metrics")
+async def get_metrics() -> Response:
+    """
+    Export the application's metrics in the Prometheus text format.
+    
+    Includes request latency histograms per route, upstream call latency
+    and errors per dependency, cache lookups and hit ratios, and refresh
+    job durations and row counts.
+    
+    Returns:
+        Response in the Prometheus text exposition format
+    """
+    # Disk cache stats query SQLite, so render off the event loop
+    body = await asyncio.to_thread(metrics.render)
+    return Response(content=body, media_type=PROMETHEUS_MEDIA_TYPE)
@@ -1,14 +1,23 @@
 """Places API endpoints - proxy to Google Places API."""
 
+import asyncio
 import logging
-from typing import List, Optional
+import math
+import time
+from typing import List, NamedTuple, Optional, Set, Tuple
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
 from app.config import settings
+from app.services.complaint_index import complaint_index_service
+from app.services.http_client import shared_http_client
+from app.services.image_proxy import PHOTO_MAX_WIDTH, STREETVIEW_MAX_SIZE, CachedImage, image_proxy
+from app.utils.cache import TTLCache
+from app.utils.disk_cache import DiskCache
+from app.utils.metrics import track_upstream
+from app.utils.wire_format import etag_matches
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +25,73 @@ router = APIRouter(prefix="/places", tags=["places"])
 
 # Google Places API endpoints
 PLACES_NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-PLACES_PHOTO_URL = "https://maps.googleapis.com/maps/api/place/photo"
 PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
-STREETVIEW_URL = "https://maps.googleapis.com/maps/api/streetview"
+
+# Google place types that can be searched, and those searched by default
+SUPPORTED_PLACE_TYPES = ("library", "park", "cafe")
+DEFAULT_PLACE_TYPES = ("library", "park")
+
+# Nearby Search returns at most 20 results per page and 3 pages per query
+NEARBY_PAGE_SIZE = 20
+NEARBY_MAX_PAGES = 3
+
+# How many times a follow-up page is requested before its token becomes valid
+PAGE_TOKEN_ATTEMPTS = 3
+
+# Google expires next_page_tokens after a few minutes, long before cached pages
+PAGE_TOKEN_TTL_SECONDS = 120
+
+# Key of a nearby search page: snapped (lat, lng, radius) tile, type and page number
+NearbyPageKey = Tuple[float, float, int, str, int]
+
+# Nearby search pages (places only, without page tokens)
+nearby_search_cache: TTLCache[NearbyPageKey, "NearbyPage"] = TTLCache(
+    name="places_nearby",
+    maxsize=settings.PLACES_CACHE_MAX_ENTRIES,
+    ttl=settings.PLACES_CACHE_TTL_SECONDS,
+)
+
+# Tokens of follow-up pages, keyed like the page they fetch
+page_token_cache: TTLCache[NearbyPageKey, "PageToken"] = TTLCache(
+    name="places_page_tokens",
+    maxsize=settings.PLACES_CACHE_MAX_ENTRIES,
+    ttl=PAGE_TOKEN_TTL_SECONDS,
+)
+
+# Fields requested from Google Place Details
+PLACE_DETAILS_FIELDS = (
+    "place_id",
+    "name",
+    "formatted_address",
+    "formatted_phone_number",
+    "website",
+    "url",
+    "rating",
+    "user_ratings_total",
+    "geometry",
+    "types",
+    "opening_hours",
+    "reviews",
+    "photos",
+)
+
+# Orderings accepted by /places
+PLACE_SORT_ORDERS = ("rating", "quietness")
+
+# Concurrent detail lookups made when prewarming the details cache
+PREWARM_CONCURRENCY = 4
+
+# Place details as JSON, kept on disk so they survive restarts
+place_details_cache = DiskCache(
+    name="place_details",
+    path=settings.CACHE_DIR / "places.sqlite3",
+    fresh_ttl=settings.PLACE_DETAILS_FRESH_SECONDS,
+    stale_ttl=settings.PLACE_DETAILS_STALE_SECONDS,
+    max_bytes=settings.PLACE_DETAILS_CACHE_MAX_BYTES,
+)
+
+# References to fire-and-forget tasks so they are not garbage collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
 
 
 class PlaceLocation(BaseModel):
@@ -45,6 +118,19 @@ class Place(BaseModel):
     types: List[str]
     photo: Optional[PlacePhoto] = None
     is_open: Optional[bool] = None
+    noise_score: Optional[float] = None  # Distance-weighted nearby complaints; lower is quieter
+
+
+class NearbyPage(NamedTuple):
+    """One page of Nearby Search results."""
+    places: List[Place]
+    has_more: bool  # Whether Google offered a follow-up page
+
+
+class PageToken(NamedTuple):
+    """A next_page_token and when it was issued (time.monotonic())."""
+    token: str
+    issued_at: float
 
 
 class PlacesResponse(BaseModel):
@@ -124,6 +210,177 @@ def parse_place(place_data: dict) -> Place:
     )
 
 
+def snap_search_area(lat: float, lng: float, radius: int) -> Tuple[float, float, int]:
+    """
+    Snap a search area to the cache tile grid.
+    
+    The center is rounded to PLACES_CACHE_SNAP_DEGREES and the radius is
+    rounded up to a multiple of PLACES_CACHE_RADIUS_STEP, so nearby
+    requests share one cache entry.
+    
+    Returns:
+        Tuple of (lat, lng, radius) for the snapped area
+    """
+    snap = settings.PLACES_CACHE_SNAP_DEGREES
+    step = settings.PLACES_CACHE_RADIUS_STEP
+    return (
+        round(round(lat / snap) * snap, 6),
+        round(round(lng / snap) * snap, 6),
+        min(math.ceil(radius / step) * step, 50000),
+    )
+
+
+async def fetch_nearby_page(
+    lat: float,
+    lng: float,
+    radius: int,
+    place_type: str,
+    client: httpx.AsyncClient,
+    page_token: Optional[PageToken] = None,
+) -> Tuple[NearbyPage, Optional[PageToken]]:
+    """
+    Call Google Nearby Search for one page of one place type.
+    
+    Google only accepts a next_page_token a short while after issuing it,
+    so follow-up pages wait until PLACES_PAGE_TOKEN_DELAY_SECONDS after the
+    token was issued and retry while the token is reported as invalid.
+    
+    Returns:
+        Tuple of (page, token of the next page or None)
+    
+    Raises:
+        httpx.HTTPError: If the request fails
+        ValueError: If Google returns an error status
+    """
+    if page_token:
+        params = {"pagetoken": page_token.token, "key": settings.GOOGLE_PLACES_API_KEY}
+        attempts = PAGE_TOKEN_ATTEMPTS
+    else:
+        params = {
+            "location": f"{lat},{lng}",
+            "radius": radius,
+            "type": place_type,
+            "key": settings.GOOGLE_PLACES_API_KEY,
+        }
+        attempts = 1
+    
+    for attempt in range(attempts):
+        if page_token:
+            if attempt == 0:
+                age = time.monotonic() - page_token.issued_at
+                await asyncio.sleep(max(settings.PLACES_PAGE_TOKEN_DELAY_SECONDS - age, 0))
+            else:
+                await asyncio.sleep(settings.PLACES_PAGE_TOKEN_DELAY_SECONDS)
+        
+        with track_upstream("google_places", "nearby_search"):
+            response = await client.get(PLACES_NEARBY_URL, params=params)
+            response.raise_for_status()
+        data = response.json()
+        
+        if data.get("status") != "INVALID_REQUEST" or not page_token:
+            break
+    
+    if data.get("status") not in ["OK", "ZERO_RESULTS"]:
+        raise ValueError(f"Google Places API error: {data.get('status')} - {data.get('error_message', '')}")
+    
+    next_token = data.get("next_page_token")
+    page = NearbyPage(
+        places=[parse_place(place_data) for place_data in data.get("results", [])],
+        has_more=bool(next_token),
+    )
+    return page, PageToken(next_token, time.monotonic()) if next_token else None
+
+
+async def fetch_page(
+    area: Tuple[float, float, int],
+    place_type: str,
+    page: int,
+    client: httpx.AsyncClient,
+) -> NearbyPage:
+    """
+    Fetch one page of nearby search results from Google, bypassing the page cache.
+    
+    The token for the page after it is kept in ``page_token_cache``.
+    """
+    lat, lng, radius = area
+    token = None
+    if page > 0:
+        token = await get_page_token(area, place_type, page, client)
+        if token is None:
+            return NearbyPage(places=[], has_more=False)
+    
+    result, next_token = await fetch_nearby_page(lat, lng, radius, place_type, client, page_token=token)
+    if next_token:
+        page_token_cache.set((lat, lng, radius, place_type, page + 1), next_token)
+    return result
+
+
+async def get_page_token(
+    area: Tuple[float, float, int],
+    place_type: str,
+    page: int,
+    client: httpx.AsyncClient,
+) -> Optional[PageToken]:
+    """
+    Get the token that fetches a follow-up page.
+    
+    Tokens are only kept for PAGE_TOKEN_TTL_SECONDS, while pages are cached
+    for hours. Once a token has expired, the page before is fetched again
+    (through its own fresh token, back to the first page) for a new one.
+    
+    Returns:
+        The token, or None if Google no longer offers the page
+    """
+    lat, lng, radius = area
+    key = (lat, lng, radius, place_type, page)
+    token = page_token_cache.get(key)
+    if token is None:
+        previous = await fetch_page(area, place_type, page - 1, client)
+        nearby_search_cache.set((lat, lng, radius, place_type, page - 1), previous)
+        token = page_token_cache.get(key)
+    return token
+
+
+async def get_nearby_page(
+    area: Tuple[float, float, int],
+    place_type: str,
+    page: int,
+    client: httpx.AsyncClient,
+) -> NearbyPage:
+    """
+    Get one page of nearby search results through the cache.
+    
+    Later pages are fetched with the token of the page before them, so
+    pages are filled in order and every page shares the same cache.
+    """
+    lat, lng, radius = area
+    return await nearby_search_cache.get_or_fetch(
+        (lat, lng, radius, place_type, page),
+        lambda: fetch_page(area, place_type, page, client),
+    )
+
+
+async def prefetch_nearby_pages(
+    area: Tuple[float, float, int],
+    place_type: str,
+    pages: int,
+    client: httpx.AsyncClient,
+) -> None:
+    """Fill the cache with the follow-up pages of a search in the background."""
+    try:
+        for page in range(1, pages):
+            result = await get_nearby_page(area, place_type, page, client)
+            if not result.has_more:
+                break
+    except Exception as e:
+        logger.warning(f"Error prefetching {place_type} results: {e}")
+
+
+def _pages_for(max_results: int) -> int:
+    """Number of nearby search pages needed for a result count."""
+    return max(1, min(math.ceil(max_results / NEARBY_PAGE_SIZE), NEARBY_MAX_PAGES))
+
+
 async def search_places_by_type(
     lat: float,
     lng: float,
@@ -131,36 +388,183 @@ async def search_places_by_type(
     place_type: str,
     min_rating: float,
     client: httpx.AsyncClient,
+    max_results: Optional[int] = None,
 ) -> List[Place]:
-    """Search for places of a specific type near a location."""
-    params = {
-        "location": f"{lat},{lng}",
-        "radius": radius,
-        "type": place_type,
-        "key": settings.GOOGLE_PLACES_API_KEY,
-    }
+    """
+    Search for places of a specific type near a location.
+    
+    Results are cached per snapped search tile and page; failed searches
+    are not cached. Pages beyond the first are followed until
+    ``max_results`` places have been read. If PLACES_PREFETCH_MAX_RESULTS
+    is set (it is off by default, since every page is a billed call), up
+    to that many are fetched into the cache in the background for later
+    requests.
+    """
+    area = snap_search_area(lat, lng, radius)
+    max_results = max_results or settings.PLACES_MAX_RESULTS
+    lat, lng, radius = area
     
     try:
-        response = await client.get(PLACES_NEARBY_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get("status") not in ["OK", "ZERO_RESULTS"]:
-            logger.error(f"Google Places API error: {data.get('status')} - {data.get('error_message', '')}")
-            return []
-        
-        places = []
-        for place_data in data.get("results", []):
-            place = parse_place(place_data)
-            # Filter by minimum rating
-            if place.rating is not None and place.rating >= min_rating:
-                places.append(place)
-        
-        return places
-        
+        page = await get_nearby_page(area, place_type, 0, client)
     except Exception as e:
         logger.error(f"Error searching for {place_type}: {e}")
         return []
+    
+    # Prefetching is opt-in, since every follow-up page is a billed call
+    prefetch_pages = _pages_for(settings.PLACES_PREFETCH_MAX_RESULTS)
+    if (settings.PLACES_PREFETCH_MAX_RESULTS > 0
+            and page.has_more
+            and prefetch_pages > _pages_for(max_results)
+            and nearby_search_cache.get((lat, lng, radius, place_type, 1)) is None):
+        task = asyncio.create_task(prefetch_nearby_pages(area, place_type, prefetch_pages, client))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
+    places = list(page.places)
+    try:
+        for page_number in range(1, _pages_for(max_results)):
+            if not page.has_more:
+                break
+            page = await get_nearby_page(area, place_type, page_number, client)
+            places.extend(page.places)
+    except Exception as e:
+        # Keep the pages that did arrive
+        logger.warning(f"Error fetching more {place_type} results: {e}")
+    
+    # Filter by minimum rating
+    return [
+        place for place in places[:max_results]
+        if place.rating is not None and place.rating >= min_rating
+    ]
+
+
+async def fetch_place_details(place_id: str, client: httpx.AsyncClient) -> PlaceDetails:
+    """
+    Call Google Place Details for a place.
+    
+    Raises:
+        httpx.HTTPError: If the request fails
+        HTTPException: 404 if Google does not return the place
+    """
+    params = {
+        "place_id": place_id,
+        "fields": ",".join(PLACE_DETAILS_FIELDS),
+        "key": settings.GOOGLE_PLACES_API_KEY,
+    }
+    
+    with track_upstream("google_places", "place_details"):
+        response = await client.get(PLACES_DETAILS_URL, params=params)
+        response.raise_for_status()
+    data = response.json()
+    
+    if data.get("status") != "OK":
+        logger.error(f"Google Places Details API error: {data.get('status')} - {data.get('error_message', '')}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Place not found: {data.get('status')}",
+        )
+    
+    result = data.get("result", {})
+    location = result.get("geometry", {}).get("location", {})
+    
+    # Parse reviews
+    reviews = []
+    for review_data in result.get("reviews", [])[:5]:  # Limit to 5 reviews
+        reviews.append(PlaceReview(
+            author_name=review_data.get("author_name", "Anonymous"),
+            rating=review_data.get("rating", 0),
+            text=review_data.get("text", ""),
+            time=review_data.get("time", 0),
+            relative_time_description=review_data.get("relative_time_description", ""),
+        ))
+    
+    # Parse photos
+    photos = []
+    for photo_data in result.get("photos", [])[:5]:  # Limit to 5 photos
+        photos.append(PlacePhoto(
+            photo_reference=photo_data.get("photo_reference", ""),
+            height=photo_data.get("height", 0),
+            width=photo_data.get("width", 0),
+        ))
+    
+    # Parse opening hours
+    opening_hours = None
+    is_open = None
+    hours_data = result.get("opening_hours", {})
+    if hours_data:
+        opening_hours = hours_data.get("weekday_text", [])
+        is_open = hours_data.get("open_now")
+    
+    return PlaceDetails(
+        place_id=result.get("place_id", place_id),
+        name=result.get("name", ""),
+        formatted_address=result.get("formatted_address"),
+        formatted_phone_number=result.get("formatted_phone_number"),
+        website=result.get("website"),
+        url=result.get("url"),
+        rating=result.get("rating"),
+        user_ratings_total=result.get("user_ratings_total"),
+        location=PlaceLocation(
+            lat=location.get("lat", 0),
+            lng=location.get("lng", 0),
+        ),
+        types=result.get("types", []),
+        opening_hours=opening_hours,
+        is_open=is_open,
+        reviews=reviews,
+        photos=photos,
+    )
+
+
+async def get_cached_place_details(place_id: str, client: httpx.AsyncClient) -> PlaceDetails:
+    """
+    Get a place's details through the disk cache.
+    
+    Failed lookups (including places Google does not return) are not cached.
+    """
+    async def fetch() -> bytes:
+        details = await fetch_place_details(place_id, client)
+        return details.model_dump_json().encode()
+    
+    data = await place_details_cache.get_or_fetch(place_id, fetch)
+    return PlaceDetails.model_validate_json(data)
+
+
+async def prewarm_place_details(place_ids: List[str], client: httpx.AsyncClient) -> None:
+    """Fill the details cache for places that are likely to be opened next."""
+    semaphore = asyncio.Semaphore(PREWARM_CONCURRENCY)
+    
+    async def prewarm(place_id: str) -> None:
+        async with semaphore:
+            try:
+                if not await asyncio.to_thread(place_details_cache.contains, place_id):
+                    await get_cached_place_details(place_id, client)
+            except Exception as e:
+                logger.warning(f"Error prewarming details for {place_id}: {e}")
+    
+    await asyncio.gather(*(prewarm(place_id) for place_id in place_ids))
+
+
+async def score_places(places: List[Place]) -> List[Place]:
+    """
+    Attach a quietness score to every place from the complaint index.
+    
+    All places are scored in one vectorized pass. Places are copied rather
+    than mutated, since the originals are shared through the search cache.
+    
+    Raises:
+        Exception: If the complaint index cannot be loaded
+    """
+    index = await complaint_index_service.get_index()
+    scores = index.noise_scores(
+        [place.location.lat for place in places],
+        [place.location.lng for place in places],
+        settings.QUIETNESS_RADIUS_METERS,
+    )
+    return [
+        place.model_copy(update={"noise_score": round(float(score), 2)})
+        for place, score in zip(places, scores)
+    ]
 
 
 @router.get("", response_model=PlacesResponse)
@@ -169,11 +573,30 @@ async def get_places(
     lng: float = Query(..., description="Longitude of the search center"),
     radius: int = Query(2000, description="Search radius in meters (max 50000)"),
     min_rating: float = Query(4.0, description="Minimum rating filter (1-5)"),
+    types: str = Query(
+        ",".join(DEFAULT_PLACE_TYPES),
+        description=f"Comma-separated place types to search ({', '.join(SUPPORTED_PLACE_TYPES)})",
+    ),
+    max_results: Optional[int] = Query(
+        None,
+        ge=1,
+        le=NEARBY_PAGE_SIZE * NEARBY_MAX_PAGES,
+        description="Maximum results per place type before rating filtering (default 20)",
+    ),
+    sort: str = Query("rating", description=f"Result order ({', '.join(PLACE_SORT_ORDERS)})"),
+    max_noise: Optional[float] = Query(
+        None,
+        ge=0,
+        description="Only return places whose noise score is at most this value",
+    ),
 ) -> PlacesResponse:
     """
-    Get quiet places (libraries, parks, POPS) near a location.
+    Get quiet places (libraries, parks, cafes) near a location.
     
     Returns places with good reviews that are suitable for quiet activities.
+    Each place type is searched concurrently over the shared HTTP client.
+    Every place carries a noise score from nearby complaints, which can be
+    used to sort by quietness and to filter out noisy places.
     """
     if not settings.google_places_configured:
         raise HTTPException(
@@ -181,34 +604,75 @@ async def get_places(
             detail="Google Places API not configured. Set GOOGLE_PLACES_API_KEY environment variable.",
         )
     
+    if sort not in PLACE_SORT_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported sort order: {sort}",
+        )
+    
     # Clamp radius to Google's limit
     radius = min(radius, 50000)
     
     # Place types to search for
-    place_types = ["library", "park"]
+    place_types = list(dict.fromkeys(t.strip() for t in types.split(",") if t.strip()))
+    unsupported = [t for t in place_types if t not in SUPPORTED_PLACE_TYPES]
+    if unsupported or not place_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported place types: {', '.join(unsupported) or '(none given)'}",
+        )
     
     all_places: List[Place] = []
     seen_place_ids = set()
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for place_type in place_types:
-            places = await search_places_by_type(
-                lat=lat,
-                lng=lng,
-                radius=radius,
-                place_type=place_type,
-                min_rating=min_rating,
-                client=client,
+    client = shared_http_client.client
+    results = await asyncio.gather(*(
+        search_places_by_type(
+            lat=lat,
+            lng=lng,
+            radius=radius,
+            place_type=place_type,
+            min_rating=min_rating,
+            client=client,
+            max_results=max_results,
+        )
+        for place_type in place_types
+    ))
+    
+    # Deduplicate by place_id
+    for places in results:
+        for place in places:
+            if place.place_id not in seen_place_ids:
+                seen_place_ids.add(place.place_id)
+                all_places.append(place)
+    
+    try:
+        all_places = await score_places(all_places)
+    except Exception as e:
+        # Scores are only required when sorting or filtering by them
+        logger.warning(f"Could not score places by noise: {e}")
+        if sort == "quietness" or max_noise is not None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Noise complaint data is not available.",
             )
-            
-            # Deduplicate by place_id
-            for place in places:
-                if place.place_id not in seen_place_ids:
-                    seen_place_ids.add(place.place_id)
-                    all_places.append(place)
     
-    # Sort by rating (highest first)
-    all_places.sort(key=lambda p: p.rating or 0, reverse=True)
+    if max_noise is not None:
+        all_places = [place for place in all_places if place.noise_score <= max_noise]
+    
+    if sort == "quietness":
+        # Quietest first, ties broken by rating
+        all_places.sort(key=lambda p: (p.noise_score, -(p.rating or 0)))
+    else:
+        # Sort by rating (highest first)
+        all_places.sort(key=lambda p: p.rating or 0, reverse=True)
+    
+    # Warm the details cache for the places most likely to be opened
+    prewarm_ids = [place.place_id for place in all_places[:settings.PLACE_DETAILS_PREWARM_COUNT]]
+    if prewarm_ids:
+        task = asyncio.create_task(prewarm_place_details(prewarm_ids, client))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
     
     return PlacesResponse(
         places=all_places,
@@ -216,15 +680,34 @@ async def get_places(
     )
 
 
+def image_response(image: CachedImage, if_none_match: Optional[str]) -> Response:
+    """Serve a proxied image with a long max-age and its ETag, or 304 if the client has it."""
+    headers = {
+        "ETag": image.etag,
+        "Cache-Control": f"public, max-age={settings.IMAGE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, image.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=image.body, media_type=image.media_type, headers=headers)
+
+
 @router.get("/photo")
 async def get_place_photo(
     photo_reference: str = Query(..., description="Photo reference from Google Places"),
-    max_width: int = Query(400, description="Maximum width of the photo"),
+    max_width: int = Query(400, ge=1, le=PHOTO_MAX_WIDTH, description="Maximum width of the photo"),
+    max_height: Optional[int] = Query(None, ge=1, description="Maximum height of the photo"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
-    Get a place photo URL.
+    Get a place photo.
     
-    Returns a redirect to the actual photo URL.
+    The photo is fetched from Google once, kept in the image disk cache and
+    served scaled to fit within max_width x max_height, so the API key
+    never reaches the browser.
+    
+    Raises:
+        HTTPException: 503 if Google Places is not configured, 500 if the
+            photo cannot be fetched
     """
     if not settings.google_places_configured:
         raise HTTPException(
@@ -232,22 +715,36 @@ async def get_place_photo(
             detail="Google Places API not configured.",
         )
     
-    photo_url = f"{PLACES_PHOTO_URL}?maxwidth={max_width}&photo_reference={photo_reference}&key={settings.GOOGLE_PLACES_API_KEY}"
+    try:
+        image = await image_proxy.photo(photo_reference, max_width, max_height, shared_http_client.client)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error(f"Error fetching place photo: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch place photo",
+        )
     
-    return {"photo_url": photo_url}
+    return image_response(image, if_none_match)
 
 
 @router.get("/streetview")
 async def get_streetview_image(
     lat: float = Query(..., description="Latitude of the location"),
     lng: float = Query(..., description="Longitude of the location"),
-    width: int = Query(400, description="Image width in pixels"),
-    height: int = Query(200, description="Image height in pixels"),
+    width: int = Query(400, ge=1, le=STREETVIEW_MAX_SIZE, description="Image width in pixels"),
+    height: int = Query(200, ge=1, le=STREETVIEW_MAX_SIZE, description="Image height in pixels"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get a Street View image for a location.
     
-    Redirects to the Google Street View Static API image.
+    The location is snapped to IMAGE_SNAP_DEGREES, and the image is fetched
+    from Google once, kept in the image disk cache and served at exactly
+    width x height.
+    
+    Raises:
+        HTTPException: 503 if Google Places is not configured, 500 if the
+            image cannot be fetched
     """
     if not settings.google_places_configured:
         raise HTTPException(
@@ -255,9 +752,16 @@ async def get_streetview_image(
             detail="Google Places API not configured.",
         )
     
-    streetview_url = f"{STREETVIEW_URL}?size={width}x{height}&location={lat},{lng}&key={settings.GOOGLE_PLACES_API_KEY}"
+    try:
+        image = await image_proxy.streetview(lat, lng, width, height, shared_http_client.client)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error(f"Error fetching Street View image: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch Street View image",
+        )
     
-    return RedirectResponse(url=streetview_url)
+    return image_response(image, if_none_match)
 
 
 @router.get("/{place_id}/details", response_model=PlaceDetails)
@@ -266,6 +770,8 @@ async def get_place_details(place_id: str):
     Get detailed information about a place.
     
     Returns extended info including phone, website, hours, and reviews.
+    Details are served from the disk cache; stale entries are returned
+    immediately and refreshed in the background.
     """
     if not settings.google_places_configured:
         raise HTTPException(
@@ -273,97 +779,11 @@ async def get_place_details(place_id: str):
             detail="Google Places API not configured.",
         )
     
-    # Fields to request from Google Places API
-    fields = [
-        "place_id",
-        "name",
-        "formatted_address",
-        "formatted_phone_number",
-        "website",
-        "url",
-        "rating",
-        "user_ratings_total",
-        "geometry",
-        "types",
-        "opening_hours",
-        "reviews",
-        "photos",
-    ]
-    
-    params = {
-        "place_id": place_id,
-        "fields": ",".join(fields),
-        "key": settings.GOOGLE_PLACES_API_KEY,
-    }
-    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(PLACES_DETAILS_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("status") != "OK":
-                logger.error(f"Google Places Details API error: {data.get('status')} - {data.get('error_message', '')}")
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Place not found: {data.get('status')}",
-                )
-            
-            result = data.get("result", {})
-            location = result.get("geometry", {}).get("location", {})
-            
-            # Parse reviews
-            reviews = []
-            for review_data in result.get("reviews", [])[:5]:  # Limit to 5 reviews
-                reviews.append(PlaceReview(
-                    author_name=review_data.get("author_name", "Anonymous"),
-                    rating=review_data.get("rating", 0),
-                    text=review_data.get("text", ""),
-                    time=review_data.get("time", 0),
-                    relative_time_description=review_data.get("relative_time_description", ""),
-                ))
-            
-            # Parse photos
-            photos = []
-            for photo_data in result.get("photos", [])[:5]:  # Limit to 5 photos
-                photos.append(PlacePhoto(
-                    photo_reference=photo_data.get("photo_reference", ""),
-                    height=photo_data.get("height", 0),
-                    width=photo_data.get("width", 0),
-                ))
-            
-            # Parse opening hours
-            opening_hours = None
-            is_open = None
-            hours_data = result.get("opening_hours", {})
-            if hours_data:
-                opening_hours = hours_data.get("weekday_text", [])
-                is_open = hours_data.get("open_now")
-            
-            return PlaceDetails(
-                place_id=result.get("place_id", place_id),
-                name=result.get("name", ""),
-                formatted_address=result.get("formatted_address"),
-                formatted_phone_number=result.get("formatted_phone_number"),
-                website=result.get("website"),
-                url=result.get("url"),
-                rating=result.get("rating"),
-                user_ratings_total=result.get("user_ratings_total"),
-                location=PlaceLocation(
-                    lat=location.get("lat", 0),
-                    lng=location.get("lng", 0),
-                ),
-                types=result.get("types", []),
-                opening_hours=opening_hours,
-                is_open=is_open,
-                reviews=reviews,
-                photos=photos,
-            )
-            
+        return await get_cached_place_details(place_id, shared_http_client.client)
     except httpx.HTTPError as e:
         logger.error(f"Error fetching place details: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch place details",
         )
-
@@ -0,0 +1,275 @@
+"""Date-partitioned local archive of historical noise complaints."""
+
+import json
+import shutil
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.noise_complaint import ComplaintRow
+from app.services.complaint_index import (
+    UNKNOWN_COMPLAINT_TYPE,
+    BoundingBox,
+    CellGrid,
+    hours_of_week,
+    local_timestamps,
+    time_mask,
+)
+
+# Column files stored in every partition
+_COLUMNS = ("latitude", "longitude", "created", "type_code")
+_TYPES_FILE = "types.json"
+
+# Meters per degree of latitude (and of longitude at the equator)
+_METERS_PER_DEGREE = 111_320.0
+
+
+class ArchiveSlice(NamedTuple):
+    """Complaint columns read from one or more partitions."""
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    created: np.ndarray  # datetime64[s], local wall-clock time
+    complaint_types: List[str]  # Complaint type names, indexed by type_codes
+    type_codes: np.ndarray
+
+
+class ComplaintArchive:
+    """
+    One directory of memory-mapped NumPy column files per day of complaints.
+    
+    Partitions are written whole, so re-archiving a day replaces it, and
+    queries only open the partitions inside their date range.
+    """
+    
+    def __init__(self, root: Path):
+        """
+        Initialize the archive.
+        
+        Args:
+            root: Directory holding the partitions (created on first write)
+        """
+        self.root = root
+    
+    def _partition_path(self, day: date) -> Path:
+        return self.root / day.isoformat()
+    
+    def has_partition(self, day: date) -> bool:
+        """Whether a day has been archived."""
+        return (self._partition_path(day) / _TYPES_FILE).exists()
+    
+    def partitions(self) -> List[date]:
+        """Get the archived days, oldest first."""
+        if not self.root.exists():
+            return []
+        days = []
+        for path in self.root.iterdir():
+            try:
+                day = date.fromisoformat(path.name)
+            except ValueError:
+                continue
+            if self.has_partition(day):
+                days.append(day)
+        return sorted(days)
+    
+    def write_partition(self, day: date, rows: Iterable[ComplaintRow]) -> int:
+        """
+        Write (or replace) the partition of one day.
+        
+        Rows without coordinates are skipped. The partition is written to a
+        temporary directory first, so readers never see a half-written day.
+        
+        Args:
+            day: Day the rows were created on
+            rows: Complaint rows of that day
+        
+        Returns:
+            Number of complaints archived
+        """
+        rows = [row for row in rows if row.latitude is not None and row.longitude is not None]
+        
+        names, codes = np.unique(
+            np.asarray([row.complaint_type or UNKNOWN_COMPLAINT_TYPE for row in rows], dtype=object),
+            return_inverse=True,
+        )
+        columns = {
+            "latitude": np.asarray([row.latitude for row in rows], dtype=np.float64),
+            "longitude": np.asarray([row.longitude for row in rows], dtype=np.float64),
+            "created": local_timestamps([row.created_date for row in rows]).astype(np.int64),
+            "type_code": codes.reshape(-1).astype(np.int16),
+        }
+        
+        final_path = self._partition_path(day)
+        tmp_path = self.root / f".tmp-{day.isoformat()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        
+        for name, values in columns.items():
+            np.save(tmp_path / f"{name}.npy", values)
+        (tmp_path / _TYPES_FILE).write_text(json.dumps([str(name) for name in names]))
+        
+        shutil.rmtree(final_path, ignore_errors=True)
+        tmp_path.rename(final_path)
+        return len(rows)
+    
+    def read_partition(self, day: date) -> ArchiveSlice:
+        """
+        Open one partition with its columns memory-mapped.
+        
+        Args:
+            day: Archived day
+        
+        Returns:
+            ArchiveSlice of the day's complaints
+        """
+        path = self._partition_path(day)
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _COLUMNS}
+        return ArchiveSlice(
+            latitudes=columns["latitude"],
+            longitudes=columns["longitude"],
+            created=columns["created"].astype("datetime64[s]"),
+            complaint_types=json.loads((path / _TYPES_FILE).read_text()),
+            type_codes=columns["type_code"],
+        )
+    
+    def days_in_range(self, start: date, end: date) -> List[date]:
+        """Get the archived days between ``start`` and ``end`` (inclusive)."""
+        days = []
+        day = start
+        while day <= end:
+            if self.has_partition(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+    
+    def read_range(self, start: date, end: date) -> ArchiveSlice:
+        """
+        Read every partition between ``start`` and ``end`` (inclusive).
+        
+        Complaint type codes are remapped onto one shared list of names.
+        
+        Args:
+            start: First day
+            end: Last day
+        
+        Returns:
+            ArchiveSlice concatenating the partitions in range
+        """
+        parts = [self.read_partition(day) for day in self.days_in_range(start, end)]
+        
+        type_names = sorted({name for part in parts for name in part.complaint_types})
+        positions = {name: i for i, name in enumerate(type_names)}
+        type_codes = [
+            np.asarray([positions[name] for name in part.complaint_types], dtype=np.int16)[part.type_codes]
+            if len(part.type_codes) else np.empty(0, dtype=np.int16)
+            for part in parts
+        ]
+        
+        def concat(arrays: List[np.ndarray], dtype: str) -> np.ndarray:
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+        
+        return ArchiveSlice(
+            latitudes=concat([part.latitudes for part in parts], "float64"),
+            longitudes=concat([part.longitudes for part in parts], "float64"),
+            created=concat([part.created for part in parts], "datetime64[s]"),
+            complaint_types=type_names,
+            type_codes=concat(type_codes, "int16"),
+        )
+    
+    def density(
+        self,
+        start: date,
+        end: date,
+        grid_size: float,
+        bbox: Optional[BoundingBox] = None,
+        dow: Optional[int] = None,
+        hour: Optional[int] = None,
+    ) -> CellGrid:
+        """
+        Bin the archived complaints of a date range into grid cells.
+        
+        Args:
+            start: First day
+            end: Last day
+            grid_size: Size of grid cells in degrees
+            bbox: Optional viewport; only overlapping cells are returned
+            dow: Optional day of week (0 = Sunday) to restrict complaints to
+            hour: Optional hour of day (0-23) to restrict complaints to
+        
+        Returns:
+            CellGrid with the complaint counts per cell
+        """
+        archived = self.read_range(start, end)
+        latitudes, longitudes = archived.latitudes, archived.longitudes
+        
+        mask = np.ones(len(latitudes), dtype=bool)
+        if dow is not None or hour is not None:
+            mask &= time_mask(hours_of_week(archived.created), dow, hour)
+        if bbox is not None:
+            # Widen by a cell so edge cells get their full counts before clipping
+            mask &= (latitudes >= bbox.min_lat - grid_size) & (latitudes <= bbox.max_lat + grid_size)
+            mask &= (longitudes >= bbox.min_lng - grid_size) & (longitudes <= bbox.max_lng + grid_size)
+        
+        grid = CellGrid(grid_size, latitudes[mask], longitudes[mask])
+        return grid.window(bbox) if bbox is not None else grid
+    
+    def daily_counts(
+        self,
+        start: date,
+        end: date,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius_m: Optional[float] = None,
+    ) -> List[Tuple[date, int]]:
+        """
+        Count the archived complaints of each day, optionally around a point.
+        
+        Each partition is read and counted on its own, so memory use does
+        not grow with the length of the range.
+        
+        Args:
+            start: First day
+            end: Last day
+            lat: Optional latitude of the point
+            lng: Optional longitude of the point
+            radius_m: Radius in meters around the point
+        
+        Returns:
+            (day, count) for every archived day in range, oldest first
+        """
+        counts = []
+        for day in self.days_in_range(start, end):
+            part = self.read_partition(day)
+            if lat is None or lng is None or radius_m is None:
+                counts.append((day, len(part.latitudes)))
+                continue
+            
+            dlat = np.asarray(part.latitudes) - lat
+            dlng = (np.asarray(part.longitudes) - lng) * np.cos(np.radians(lat))
+            within = np.hypot(dlat, dlng) * _METERS_PER_DEGREE <= radius_m
+            counts.append((day, int(within.sum())))
+        return counts
+
+
+def group_rows_by_day(rows: Iterable[ComplaintRow]) -> Dict[date, List[ComplaintRow]]:
+    """
+    Group complaint rows by the local day they were created on.
+    
+    Args:
+        rows: Complaint rows
+    
+    Returns:
+        Rows keyed by creation day; rows without a created_date are dropped
+    """
+    days: Dict[date, List[ComplaintRow]] = defaultdict(list)
+    for row in rows:
+        if row.created_date:
+            days[date.fromisoformat(row.created_date[:10])].append(row)
+    return days
+
+
+# Global archive instance
+complaint_archive = ComplaintArchive(settings.ARCHIVE_DIR)
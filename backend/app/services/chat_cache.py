@@ -0,0 +1,209 @@
+"""Cache of chatbot answers for repeated and near-duplicate questions."""
+
+import hashlib
+import json
+import re
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+# Cache key: (places fingerprint, normalized message)
+ChatCacheKey = Tuple[str, str]
+
+# Words of a message in order, and the content words (everything but STOP_WORDS)
+MessageWords = Tuple[FrozenSet[str], Tuple[str, ...]]
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Filler words a near-duplicate may add, drop or change: articles, pronouns,
+# auxiliaries and politeness. Negations ("not", "no", the "t" of "isn't"),
+# numbers, question words, prepositions and every other word are content
+# words and must match exactly, in order.
+STOP_WORDS = frozenset("""
+    a an the
+    i me my we us our you your it its this that these those there
+    is are was were be been being am do does did have has had
+    some any please just really very also
+""".split())
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a chat message so trivially different phrasings share a key.
+    
+    Lowercases and drops punctuation and repeated whitespace, so
+    "Where can I study?" and "where can i study" are the same question.
+    
+    Args:
+        message: Message as typed by the user
+    
+    Returns:
+        Normalized message
+    """
+    return _NON_WORD.sub(" ", message.lower()).strip()
+
+
+def places_fingerprint(places: Optional[Iterable[Dict[str, Any]]]) -> str:
+    """
+    Hash the places context of a chat request, ignoring the order of places.
+    
+    Args:
+        places: Place context dictionaries (name, address, type, rating)
+    
+    Returns:
+        Hex digest; the same for the same set of places
+    """
+    canonical = sorted(json.dumps(place, sort_keys=True) for place in places or [])
+    return hashlib.blake2b("\n".join(canonical).encode(), digest_size=16).hexdigest()
+
+
+def _message_words(message: str) -> MessageWords:
+    """Split a normalized message into its set of words and its content words."""
+    words = message.split()
+    return frozenset(words), tuple(word for word in words if word not in STOP_WORDS)
+
+
+class ChatResponseCache(TTLCache[ChatCacheKey, str]):
+    """
+    TTL/LRU cache of chat answers keyed by places fingerprint and normalized message.
+    
+    Besides exact matches, ``lookup`` can answer a question from a cached
+    near-duplicate asked with the same places. A near-duplicate must have
+    the same content words (including numbers and negations) in the same
+    order, so only function words may differ, and the Jaccard similarity of
+    the two messages' words must reach ``similarity``. Cached messages are
+    indexed by their content words, so finding candidates is one lookup.
+    """
+    
+    def __init__(self, name: str, maxsize: int, ttl: float, similarity: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            name: Name used when reporting stats
+            maxsize: Maximum number of answers kept
+            ttl: Seconds an answer stays fresh
+            similarity: Minimum word Jaccard similarity of a near-duplicate
+                (0 disables near-duplicate matching)
+        """
+        self.similarity = similarity
+        self.similar_hits = 0
+        
+        # Per places fingerprint: content words -> cached messages having them
+        self._postings: Dict[str, Dict[Tuple[str, ...], Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._message_words: Dict[ChatCacheKey, MessageWords] = {}
+        
+        super().__init__(name=name, maxsize=maxsize, ttl=ttl)
+    
+    @staticmethod
+    def key_for(message: str, places: Optional[Iterable[Dict[str, Any]]]) -> ChatCacheKey:
+        """Build the cache key of a message asked with a places context."""
+        return places_fingerprint(places), normalize_message(message)
+    
+    def lookup(self, key: ChatCacheKey, count_miss: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find a cached answer for the question or a near-duplicate of it.
+        
+        Args:
+            key: Key from ``key_for``
+            count_miss: Whether to count a miss when nothing is found
+        
+        Returns:
+            Tuple of (answer, match) where match is "exact", "similar" or None
+        """
+        answer = self.get(key)
+        if answer is not None:
+            self.hits += 1
+            return answer, "exact"
+        
+        if self.similarity > 0:
+            similar = self._most_similar(key)
+            if similar is not None:
+                answer = self.get(similar)
+                if answer is not None:
+                    self.similar_hits += 1
+                    return answer, "similar"
+        
+        if count_miss:
+            self.misses += 1
+        return None, None
+    
+    async def get_or_generate(
+        self,
+        key: ChatCacheKey,
+        generate: Callable[[], Awaitable[str]],
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Answer from the cache, or call ``generate`` and cache its answer.
+        
+        Concurrent identical questions share one ``generate`` call.
+        
+        Args:
+            key: Key from ``key_for``
+            generate: Coroutine factory producing the answer
+        
+        Returns:
+            Tuple of (answer, match) where match is "exact", "similar" or None
+        """
+        answer, match = self.lookup(key, count_miss=False)
+        if answer is not None:
+            return answer, match
+        return await self.get_or_fetch(key, generate), None
+    
+    def _most_similar(self, key: ChatCacheKey) -> Optional[ChatCacheKey]:
+        fingerprint, message = key
+        postings = self._postings.get(fingerprint)
+        if not postings:
+            return None
+        
+        words, content = _message_words(message)
+        best, best_score = None, self.similarity
+        for candidate in postings.get(content, ()):
+            candidate_words = self._message_words[(fingerprint, candidate)][0]
+            score = len(words & candidate_words) / len(words | candidate_words)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return (fingerprint, best) if best is not None else None
+    
+    def set(self, key: ChatCacheKey, value: str) -> None:
+        """Store an answer and index its message for near-duplicate lookups."""
+        if self.similarity > 0 and key not in self._message_words:
+            fingerprint, message = key
+            words = _message_words(message)
+            self._message_words[key] = words
+            self._postings[fingerprint][words[1]].add(message)
+        super().set(key, value)
+    
+    def _discarded(self, key: ChatCacheKey) -> None:
+        words = self._message_words.pop(key, None)
+        if words is None:
+            return
+        
+        fingerprint, message = key
+        postings = self._postings[fingerprint]
+        content = words[1]
+        postings[content].discard(message)
+        if not postings[content]:
+            del postings[content]
+        if not postings:
+            del self._postings[fingerprint]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's size and hit/miss counters, including near-duplicate hits."""
+        stats = super().stats()
+        lookups = self.hits + self.similar_hits + self.misses + self.coalesced
+        stats["similar_hits"] = self.similar_hits
+        stats["similarity"] = self.similarity
+        stats["hit_ratio"] = (self.hits + self.similar_hits + self.coalesced) / lookups if lookups else 0.0
+        return stats
+
+
+# Global chat answer cache instance
+chat_response_cache = ChatResponseCache(
+    name="chat_responses",
+    maxsize=settings.CHAT_CACHE_MAX_ENTRIES,
+    ttl=settings.CHAT_CACHE_TTL_SECONDS,
+    similarity=settings.CHAT_CACHE_SIMILARITY,
+)
@@ -0,0 +1,144 @@
+"""In-memory store of multi-turn chatbot conversations."""
+
+import asyncio
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Longest question or answer excerpt kept per compacted turn
+MAX_EXCERPT_CHARS = 200
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _excerpt(text: str) -> str:
+    """First sentence of a text, cut to MAX_EXCERPT_CHARS."""
+    text = " ".join(text.split())
+    first = _SENTENCE_END.split(text, maxsplit=1)[0]
+    return first if len(first) <= MAX_EXCERPT_CHARS else first[:MAX_EXCERPT_CHARS - 3] + "..."
+
+
+@dataclass
+class ChatSession:
+    """One conversation: recent turns verbatim, older turns as a summary."""
+    id: str
+    history: List[Dict] = field(default_factory=list)  # Gemini contents, alternating user/model
+    summary: str = ""
+    places_text: Optional[str] = None  # Latest places context, sent once as system instruction
+    turns: int = 0
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    
+    def add_turn(self, message: str, answer: str, max_turns: int, summary_max_chars: int) -> None:
+        """
+        Record a question and its answer, compacting the oldest turns if needed.
+        
+        Turns beyond the ``max_turns`` most recent are folded into the
+        summary as one-sentence excerpts, and the summary keeps only its
+        newest ``summary_max_chars`` characters, so the history sent with
+        each message stays bounded however long the conversation gets.
+        
+        Args:
+            message: User's message
+            answer: Model's answer
+            max_turns: Recent turns kept verbatim
+            summary_max_chars: Maximum length of the summary
+        """
+        self.history.append({"role": "user", "parts": [message]})
+        self.history.append({"role": "model", "parts": [answer]})
+        self.turns += 1
+        self.updated_at = datetime.now()
+        
+        excess = len(self.history) // 2 - max_turns
+        if excess <= 0:
+            return
+        
+        compacted, self.history = self.history[:2 * excess], self.history[2 * excess:]
+        lines = [line for line in self.summary.split("\n") if line]
+        for question, reply in zip(compacted[::2], compacted[1::2]):
+            lines.append(f"- User asked: {_excerpt(question['parts'][0])} You answered: {_excerpt(reply['parts'][0])}")
+        
+        while lines and len("\n".join(lines)) > summary_max_chars:
+            lines.pop(0)
+        self.summary = "\n".join(lines)
+
+
+class ChatSessionStore:
+    """
+    Chat sessions by id, evicted when idle for the TTL or least recently used.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, max_turns: int, summary_max_chars: int):
+        """
+        Initialize the store.
+        
+        Args:
+            maxsize: Maximum number of sessions kept
+            ttl: Seconds a session is kept after its last use
+            max_turns: Recent turns kept verbatim per session
+            summary_max_chars: Maximum length of a session's summary of older turns
+        """
+        self.max_turns = max_turns
+        self.summary_max_chars = summary_max_chars
+        self._sessions: TTLCache[str, ChatSession] = TTLCache(name="chat_sessions", maxsize=maxsize, ttl=ttl)
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def get_or_create(self, session_id: Optional[str] = None) -> ChatSession:
+        """
+        Get a live session, or start a new one.
+        
+        Args:
+            session_id: Id returned by an earlier chat response, if any
+        
+        Returns:
+            The session; a new one (with a new id) if the id is unknown or expired
+        """
+        if session_id:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.hits += 1
+                # Re-store to restart the idle timeout
+                self._sessions.set(session_id, session)
+                return session
+            self._sessions.misses += 1
+            logger.info(f"Chat session {session_id} expired or unknown, starting a new one")
+        
+        session = ChatSession(id=uuid.uuid4().hex)
+        self._sessions.set(session.id, session)
+        return session
+    
+    def record_turn(self, session: ChatSession, message: str, answer: str) -> None:
+        """Record a completed turn in a session (see ``ChatSession.add_turn``)."""
+        session.add_turn(message, answer, self.max_turns, self.summary_max_chars)
+    
+    def delete(self, session_id: str) -> bool:
+        """
+        End a session.
+        
+        Args:
+            session_id: Session id
+        
+        Returns:
+            True if the session existed
+        """
+        return self._sessions.pop(session_id) is not None
+
+
+# Global session store instance
+chat_session_store = ChatSessionStore(
+    maxsize=settings.CHAT_SESSION_MAX_ENTRIES,
+    ttl=settings.CHAT_SESSION_TTL_SECONDS,
+    max_turns=settings.CHAT_SESSION_MAX_TURNS,
+    summary_max_chars=settings.CHAT_SESSION_SUMMARY_MAX_CHARS,
+)
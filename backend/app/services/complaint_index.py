@@ -0,0 +1,563 @@
+"""In-memory spatial index of noise complaints for heatmap density queries."""
+
+import asyncio
+import hashlib
+import logging
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.config import settings
+from app.services.heatmap_tiles import TilePyramid
+from app.services.supabase_service import supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Grid sizes (in degrees) whose per-cell counts are precomputed on every rebuild
+GRID_LEVELS: Tuple[float, ...] = (0.001, 0.002, 0.003, 0.005, 0.01, 0.02)
+
+# Multiplier used to pack a (row, col) cell pair into a single int64 key
+_ROW_STRIDE = 1 << 32
+
+# Meters per degree of latitude (and of longitude at the equator)
+_METERS_PER_DEGREE = 111_320.0
+
+# Hour-of-week buckets of the time cube: 7 days x 24 hours, Sunday 00:00 first
+HOURS_PER_WEEK = 7 * 24
+
+# Type recorded for complaints stored without a complaint_type
+UNKNOWN_COMPLAINT_TYPE = "Unknown"
+
+# Approximate on-screen size (in pixels) of a heatmap cell when picking a level by zoom
+_CELL_PIXELS = 24
+
+
+class BoundingBox(NamedTuple):
+    """A lat/lng viewport; missing edges are unbounded."""
+    min_lat: float = -math.inf
+    max_lat: float = math.inf
+    min_lng: float = -math.inf
+    max_lng: float = math.inf
+
+
+def grid_size_for_zoom(zoom: int) -> float:
+    """
+    Pick the precomputed grid level that best matches a web map zoom level.
+    
+    Args:
+        zoom: Slippy-map zoom level (0 = whole world)
+    
+    Returns:
+        Grid size in degrees from GRID_LEVELS
+    """
+    target = 360.0 / (256 * 2 ** zoom) * _CELL_PIXELS
+    return min(GRID_LEVELS, key=lambda level: abs(math.log(level / target)))
+
+
+def local_timestamps(created_dates: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Parse complaint timestamps into seconds since the epoch, in local time.
+    
+    NYC OpenData timestamps are local wall-clock times, so any UTC offset
+    suffix added by the database is ignored rather than converted.
+    
+    Args:
+        created_dates: ISO timestamps, None when unknown
+    
+    Returns:
+        datetime64[s] array, NaT where the timestamp is unknown
+    """
+    return np.array([d[:19] if d else "NaT" for d in created_dates], dtype="datetime64[s]")
+
+
+def hours_of_week(stamps: np.ndarray) -> np.ndarray:
+    """
+    Get the hour-of-week bucket of each complaint timestamp.
+    
+    Args:
+        stamps: datetime64[s] array from ``local_timestamps``
+    
+    Returns:
+        Array of buckets (dow * 24 + hour, with Sunday as dow 0), -1 when unknown
+    """
+    seconds = stamps.astype(np.int64)
+    
+    # 1970-01-01 was a Thursday (dow 4)
+    days = seconds // 86400
+    buckets = ((days + 4) % 7) * 24 + (seconds // 3600) % 24
+    return np.where(np.isnat(stamps), -1, buckets).astype(np.int16)
+
+
+def time_mask(buckets: np.ndarray, dow: Optional[int], hour: Optional[int]) -> np.ndarray:
+    """
+    Select the hour-of-week buckets on a day of week and/or hour of day.
+    
+    Args:
+        buckets: Buckets from ``hours_of_week``
+        dow: Optional day of week (0 = Sunday)
+        hour: Optional hour of day (0-23)
+    
+    Returns:
+        Boolean mask; unknown timestamps never match
+    """
+    mask = buckets >= 0
+    if dow is not None:
+        mask &= buckets // 24 == dow
+    if hour is not None:
+        mask &= buckets % 24 == hour
+    return mask
+
+
+def _concat_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the half-open ranges [starts[i], ends[i]) into one index array."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+class CellGrid:
+    """Complaint counts binned into square cells of a single grid size."""
+    
+    def __init__(self, grid_size: float, latitudes: np.ndarray, longitudes: np.ndarray):
+        """
+        Bin complaint coordinates into grid cells.
+        
+        Args:
+            grid_size: Size of grid cells in degrees
+            latitudes: Complaint latitudes
+            longitudes: Complaint longitudes
+        """
+        self.grid_size = grid_size
+        
+        rows = np.rint(latitudes / grid_size).astype(np.int64)
+        cols = np.rint(longitudes / grid_size).astype(np.int64)
+        
+        # Keys come back sorted by (row, col), which the range queries rely on
+        keys, counts = np.unique(rows * _ROW_STRIDE + cols, return_counts=True)
+        
+        self.keys = keys
+        self.rows = (keys + _ROW_STRIDE // 2) // _ROW_STRIDE
+        self.cols = keys - self.rows * _ROW_STRIDE
+        self.counts = counts
+    
+    def __len__(self) -> int:
+        return len(self.counts)
+    
+    @property
+    def max_density(self) -> int:
+        """Highest complaint count of any cell."""
+        return int(self.counts.max()) if len(self.counts) else 0
+    
+    def cell_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (lat, lng) center of every cell."""
+        return self.rows * self.grid_size, self.cols * self.grid_size
+    
+    def window(self, bbox: BoundingBox) -> "CellGrid":
+        """
+        Get the cells that overlap a bounding box.
+        
+        Runs one binary search per grid row inside the box instead of
+        scanning every cell.
+        
+        Args:
+            bbox: Viewport to select
+        
+        Returns:
+            CellGrid holding only the overlapping cells
+        """
+        if not len(self):
+            return self
+        
+        row_lo = max(self._cell_index(bbox.min_lat, int(self.rows[0])), int(self.rows[0]))
+        row_hi = min(self._cell_index(bbox.max_lat, int(self.rows[-1])), int(self.rows[-1]))
+        col_lo = self._cell_index(bbox.min_lng, -_ROW_STRIDE // 2 + 1)
+        col_hi = self._cell_index(bbox.max_lng, _ROW_STRIDE // 2 - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return self._subset(np.empty(0, dtype=np.int64))
+        
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * _ROW_STRIDE
+        starts = np.searchsorted(self.keys, rows + col_lo, side="left")
+        ends = np.searchsorted(self.keys, rows + col_hi, side="right")
+        return self._subset(_concat_ranges(starts, ends))
+    
+    def _cell_index(self, coordinate: float, default: int) -> int:
+        if math.isinf(coordinate):
+            return default
+        return int(np.rint(coordinate / self.grid_size))
+    
+    def _subset(self, selection: np.ndarray) -> "CellGrid":
+        subset = object.__new__(CellGrid)
+        subset.grid_size = self.grid_size
+        subset.keys = self.keys[selection]
+        subset.rows = self.rows[selection]
+        subset.cols = self.cols[selection]
+        subset.counts = self.counts[selection]
+        return subset
+
+
+class ComplaintIndex:
+    """Immutable, array-backed snapshot of complaint locations."""
+    
+    def __init__(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        grid_levels: Sequence[float] = GRID_LEVELS,
+        complaint_types: Optional[Sequence[str]] = None,
+        created_dates: Optional[Sequence[Optional[str]]] = None,
+    ):
+        """
+        Build the index and precompute the per-cell counts of every grid level.
+        
+        Points are stored sorted by latitude so ad-hoc queries can slice
+        a latitude band with a binary search. A KD-tree over the points,
+        projected to meters, answers radius and nearest-neighbour queries,
+        and the heatmap tile pyramid is binned up front. Grids filtered by
+        hour-of-week, hour of day or day of week are binned the first time
+        they are requested and kept, so a rebuild does not pay for time
+        buckets nobody looks at.
+        
+        Args:
+            latitudes: Complaint latitudes
+            longitudes: Complaint longitudes
+            grid_levels: Grid sizes (in degrees) to precompute
+            complaint_types: Optional complaint type of every point
+            created_dates: Optional ISO creation timestamp of every point
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        order = np.argsort(latitudes, kind="stable")
+        
+        self.latitudes = latitudes[order]
+        self.longitudes = longitudes[order]
+        self.grids: Dict[float, CellGrid] = {
+            level: CellGrid(level, self.latitudes, self.longitudes)
+            for level in grid_levels
+        }
+        self.tiles = TilePyramid(
+            self.latitudes,
+            self.longitudes,
+            min_zoom=settings.HEATMAP_TILE_MIN_ZOOM,
+            max_zoom=settings.HEATMAP_TILE_MAX_ZOOM,
+            bins_per_tile=settings.HEATMAP_TILE_BINS,
+        )
+        
+        # Content hash, so anything derived from the index can be tagged with it
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(self.latitudes.tobytes())
+        digest.update(self.longitudes.tobytes())
+        self.version = digest.hexdigest()
+        
+        # Complaint types as small integer codes into type_names
+        if complaint_types is None:
+            complaint_types = [UNKNOWN_COMPLAINT_TYPE] * len(latitudes)
+        names, codes = np.unique(
+            np.asarray([t or UNKNOWN_COMPLAINT_TYPE for t in complaint_types], dtype=object),
+            return_inverse=True,
+        )
+        self.type_names: List[str] = [str(name) for name in names]
+        self.type_codes = codes.reshape(-1)[order].astype(np.int32)
+        
+        # Hour-of-week cube: complaint totals per time bucket now, cell grids on first use
+        if created_dates is None:
+            self.hours_of_week = np.full(len(self), -1, dtype=np.int16)
+        else:
+            self.hours_of_week = hours_of_week(local_timestamps(created_dates))[order]
+        week = np.bincount(self.hours_of_week[self.hours_of_week >= 0], minlength=HOURS_PER_WEEK).reshape(7, 24)
+        self._time_totals: Dict[Tuple[Optional[int], Optional[int]], int] = {
+            **{(dow, hour): int(week[dow, hour]) for dow in range(7) for hour in range(24)},
+            **{(None, hour): int(total) for hour, total in enumerate(week.sum(axis=0))},
+            **{(dow, None): int(total) for dow, total in enumerate(week.sum(axis=1))},
+        }
+        self.time_grids: Dict[Tuple[float, Optional[int], Optional[int]], CellGrid] = {}
+        self._time_order: Optional[np.ndarray] = None
+        self._time_bounds: Optional[np.ndarray] = None
+        
+        # Equirectangular projection around the data's mean latitude
+        self._lng_scale = math.cos(math.radians(float(self.latitudes.mean()))) if len(self) else 1.0
+        self._tree = cKDTree(self._project(self.latitudes, self.longitudes))
+    
+    @classmethod
+    def empty(cls) -> "ComplaintIndex":
+        """Create an index holding no complaints."""
+        return cls([], [])
+    
+    def __len__(self) -> int:
+        return len(self.latitudes)
+    
+    def _time_selection(self, dow: Optional[int], hour: Optional[int]) -> np.ndarray:
+        """Get the indices of the points created in a time bucket (see ``time_mask``)."""
+        if self._time_order is None:
+            # Points grouped by hour-of-week, so every bucket is a few ranges
+            known = np.flatnonzero(self.hours_of_week >= 0)
+            order = known[np.argsort(self.hours_of_week[known], kind="stable")]
+            self._time_bounds = np.searchsorted(self.hours_of_week[order], np.arange(HOURS_PER_WEEK + 1))
+            self._time_order = order
+        
+        if dow is not None and hour is not None:
+            buckets = np.array([dow * 24 + hour])
+        elif dow is not None:
+            buckets = np.arange(dow * 24, dow * 24 + 24)
+        else:
+            buckets = np.arange(hour, HOURS_PER_WEEK, 24)
+        return self._time_order[_concat_ranges(self._time_bounds[buckets], self._time_bounds[buckets + 1])]
+    
+    def _time_grid(self, level: float, dow: Optional[int], hour: Optional[int]) -> CellGrid:
+        """Get the cell grid of a time bucket, binning it on first use."""
+        key = (level, dow, hour)
+        grid = self.time_grids.get(key)
+        if grid is None:
+            selection = self._time_selection(dow, hour)
+            grid = CellGrid(level, self.latitudes[selection], self.longitudes[selection])
+            self.time_grids[key] = grid
+        return grid
+    
+    def grid(
+        self,
+        grid_size: float,
+        limit: Optional[int] = None,
+        bbox: Optional[BoundingBox] = None,
+        dow: Optional[int] = None,
+        hour: Optional[int] = None,
+    ) -> CellGrid:
+        """
+        Get the cell grid for a grid size, optionally limited to a viewport.
+        
+        Precomputed levels are answered with a range query over their sorted
+        cells, from the hour-of-week cube when ``dow`` or ``hour`` is given
+        (binned on the first request for that level and time bucket).
+        Other grid sizes, or a ``limit`` below the number of matching
+        complaints, are binned on the fly from the points in the viewport.
+        
+        Args:
+            grid_size: Size of grid cells in degrees
+            limit: Optional maximum number of complaints to process
+            bbox: Optional viewport; only overlapping cells are returned
+            dow: Optional day of week (0 = Sunday) the complaints were created on
+            hour: Optional hour of day (0-23) the complaints were created in
+        
+        Returns:
+            CellGrid with the complaint counts per cell
+        """
+        timed = dow is not None or hour is not None
+        total = self._time_totals.get((dow, hour), 0) if timed else len(self)
+        
+        if limit is None or limit >= total:
+            for level, grid in self.grids.items():
+                if math.isclose(level, grid_size):
+                    if timed:
+                        grid = self._time_grid(level, dow, hour)
+                    return grid.window(bbox) if bbox is not None else grid
+        
+        latitudes, longitudes = self.latitudes, self.longitudes
+        if timed:
+            selected = time_mask(self.hours_of_week, dow, hour)
+            latitudes, longitudes = latitudes[selected], longitudes[selected]
+        
+        if limit is not None and limit < len(latitudes):
+            # Evenly spaced subsample so a limit does not favour any one area
+            sample = np.linspace(0, len(latitudes) - 1, num=max(limit, 0), dtype=np.int64)
+            latitudes, longitudes = latitudes[sample], longitudes[sample]
+        
+        if bbox is not None:
+            # Widen by a cell so edge cells get their full counts before clipping
+            lo = np.searchsorted(latitudes, bbox.min_lat - grid_size, side="left")
+            hi = np.searchsorted(latitudes, bbox.max_lat + grid_size, side="right")
+            latitudes, longitudes = latitudes[lo:hi], longitudes[lo:hi]
+            
+            in_band = (longitudes >= bbox.min_lng - grid_size) & (longitudes <= bbox.max_lng + grid_size)
+            latitudes, longitudes = latitudes[in_band], longitudes[in_band]
+        
+        grid = CellGrid(grid_size, latitudes, longitudes)
+        return grid.window(bbox) if bbox is not None else grid
+    
+    def _project(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Project coordinates to planar (x, y) meters for the KD-tree."""
+        return np.column_stack((
+            np.asarray(longitudes, dtype=np.float64) * self._lng_scale * _METERS_PER_DEGREE,
+            np.asarray(latitudes, dtype=np.float64) * _METERS_PER_DEGREE,
+        ))
+    
+    def count_within(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        radius_m: float,
+    ) -> np.ndarray:
+        """
+        Count the complaints within a radius of each location.
+        
+        Args:
+            latitudes: Latitudes of the query locations
+            longitudes: Longitudes of the query locations
+            radius_m: Radius in meters
+        
+        Returns:
+            Array with one count per location
+        """
+        if not len(self):
+            return np.zeros(len(latitudes), dtype=np.int64)
+        points = self._project(latitudes, longitudes)
+        return np.asarray(self._tree.query_ball_point(points, radius_m, return_length=True), dtype=np.int64)
+    
+    def types_within(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        radius_m: float,
+    ) -> List[Dict[str, int]]:
+        """
+        Count the complaints within a radius of each location by complaint type.
+        
+        Args:
+            latitudes: Latitudes of the query locations
+            longitudes: Longitudes of the query locations
+            radius_m: Radius in meters
+        
+        Returns:
+            One {complaint_type: count} mapping per location, without zero counts
+        """
+        if not len(self):
+            return [{} for _ in range(len(latitudes))]
+        
+        points = self._project(latitudes, longitudes)
+        breakdowns = []
+        for neighbours in self._tree.query_ball_point(points, radius_m):
+            counts = np.bincount(self.type_codes[neighbours], minlength=len(self.type_names))
+            breakdowns.append({
+                self.type_names[code]: int(counts[code])
+                for code in np.flatnonzero(counts)
+            })
+        return breakdowns
+    
+    def nearest(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k complaints closest to each location.
+        
+        Args:
+            latitudes: Latitudes of the query locations
+            longitudes: Longitudes of the query locations
+            k: Number of neighbours; capped at the number of indexed complaints
+        
+        Returns:
+            Tuple of (distances in meters, point indices), each shaped
+            (locations, k) and ordered nearest first
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            empty = np.empty((len(latitudes), 0))
+            return empty, empty.astype(np.int64)
+        
+        distances, indices = self._tree.query(self._project(latitudes, longitudes), k=k)
+        return distances.reshape(len(latitudes), k), indices.reshape(len(latitudes), k)
+    
+    def noise_scores(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        radius_m: float,
+    ) -> np.ndarray:
+        """
+        Score many locations by the complaints around them, all at once.
+        
+        Each complaint within ``radius_m`` of a location adds a weight that
+        falls linearly from 1 at the location to 0 at the radius, so the
+        score is a distance-weighted complaint count (lower is quieter).
+        Candidates are found with one latitude-band binary search per
+        location over the lat-sorted points; distances use an
+        equirectangular approximation, which is accurate at city scale.
+        
+        Args:
+            latitudes: Latitudes of the locations to score
+            longitudes: Longitudes of the locations to score
+            radius_m: Radius in meters around each location
+        
+        Returns:
+            Array with one score per location
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if not len(latitudes) or not len(self) or radius_m <= 0:
+            return np.zeros(len(latitudes))
+        
+        lat_radius = radius_m / _METERS_PER_DEGREE
+        starts = np.searchsorted(self.latitudes, latitudes - lat_radius, side="left")
+        ends = np.searchsorted(self.latitudes, latitudes + lat_radius, side="right")
+        
+        # Pair every location with every complaint in its latitude band
+        candidates = _concat_ranges(starts, ends)
+        owners = np.repeat(np.arange(len(latitudes)), ends - starts)
+        
+        lng_scale = np.cos(np.radians(latitudes))[owners]
+        dlat = self.latitudes[candidates] - latitudes[owners]
+        dlng = (self.longitudes[candidates] - longitudes[owners]) * lng_scale
+        distances = np.hypot(dlat, dlng) * _METERS_PER_DEGREE
+        
+        weights = np.clip(1.0 - distances / radius_m, 0.0, None)
+        return np.bincount(owners, weights=weights, minlength=len(latitudes))
+
+
+class ComplaintIndexService:
+    """Holds the resident complaint index and rebuilds it from Supabase."""
+    
+    def __init__(self):
+        """Initialize the service with no index loaded."""
+        self._index: Optional[ComplaintIndex] = None
+        self._lock = asyncio.Lock()
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether an index has been built."""
+        return self._index is not None
+    
+    async def get_index(self) -> ComplaintIndex:
+        """
+        Get the current index, building it on first use.
+        
+        Returns:
+            The resident ComplaintIndex
+        """
+        if self._index is None:
+            async with self._lock:
+                if self._index is None:
+                    await self._rebuild_locked()
+        return self._index
+    
+    async def rebuild(self) -> ComplaintIndex:
+        """
+        Reload complaint locations from Supabase and swap in a new index.
+        
+        Returns:
+            The newly built ComplaintIndex
+        """
+        async with self._lock:
+            return await self._rebuild_locked()
+    
+    async def _rebuild_locked(self) -> ComplaintIndex:
+        rows = await supabase_service.run(supabase_service.get_complaint_locations)
+        index = await asyncio.to_thread(
+            ComplaintIndex,
+            [row["latitude"] for row in rows],
+            [row["longitude"] for row in rows],
+            complaint_types=[row.get("complaint_type") for row in rows],
+            created_dates=[row.get("created_date") for row in rows],
+        )
+        
+        # Readers keep whichever snapshot they already hold
+        self._index = index
+        logger.info(f"Built complaint index with {len(index)} complaints")
+        return index
+
+
+# Global index service instance
+complaint_index_service = ComplaintIndexService()
@@ -0,0 +1,81 @@
+"""Synchronization of NYC OpenData noise complaints into Supabase."""
+
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from app.config import settings
+from app.models.noise_complaint import ComplaintRow
+from app.services.nyc_opendata import NYCOpenDataClient
+from app.services.supabase_service import SupabaseService
+from app.utils.date_utils import get_incremental_timestamp_range
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_complaints(
+    opendata_client: NYCOpenDataClient,
+    supabase_service: SupabaseService,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fetch new complaints from NYC OpenData and upsert them into Supabase.
+    
+    By default only complaints newer than the newest stored created_date
+    (minus INCREMENTAL_OVERLAP_MINUTES) are fetched. A full sync, or an
+    empty table, re-fetches the whole past week.
+    
+    Complaints stream from the download straight into the chunked upsert,
+    so later pages keep downloading while earlier chunks are written and
+    memory use does not grow with the size of the window.
+    
+    Complaints arrive oldest first and the sync stops at the first chunk
+    that fails after retries, so nothing newer than the missing rows is
+    stored and the high-water mark stays below them; the next incremental
+    sync fetches them again.
+    
+    Args:
+        opendata_client: Client used to fetch complaints
+        supabase_service: Service used to store complaints
+        full: Whether to ignore the high-water mark and fetch the past week
+    
+    Returns:
+        Summary with the sync mode, window start, fetched and inserted
+        counts, the number of upsert chunks, any chunks that failed and
+        whether the sync stopped before the end of the window
+    """
+    since = None if full else await supabase_service.run(supabase_service.get_latest_created_date)
+    mode = "incremental" if since is not None else "full"
+    
+    logger.info(f"Starting {mode} complaint sync" + (f" from {since.isoformat()}" if since else ""))
+    
+    start_date, end_date = get_incremental_timestamp_range(
+        since,
+        overlap_minutes=settings.INCREMENTAL_OVERLAP_MINUTES,
+    )
+    
+    fetched = 0
+    
+    async def counted_rows() -> AsyncIterator[ComplaintRow]:
+        nonlocal fetched
+        async for row in opendata_client.iter_complaints(start_date, end_date):
+            fetched += 1
+            yield row
+    
+    results = await supabase_service.insert_complaint_stream(counted_rows(), stop_on_failure=True)
+    
+    failed = [result for result in results if not result.ok]
+    if failed:
+        logger.warning(
+            f"Upsert chunk {failed[0].index} failed after retries; stopped after "
+            f"{len(results)} chunks, the next sync resumes from the last stored complaint"
+        )
+    
+    return {
+        "mode": mode,
+        "since": since.isoformat() if since else None,
+        "fetched": fetched,
+        "inserted": sum(result.upserted for result in results),
+        "chunks": len(results),
+        "failed_chunks": [result.to_dict() for result in failed],
+        "stopped": bool(failed),
+    }
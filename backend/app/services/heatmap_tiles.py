@@ -0,0 +1,165 @@
+"""Slippy-map (z/x/y) tile pyramid of complaint counts for the heatmap."""
+
+import math
+from typing import Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+# Web Mercator cannot represent the poles; clamp latitudes to its valid range
+_MAX_MERCATOR_LAT = 85.05112878
+
+
+class TileBins(NamedTuple):
+    """Complaint counts of the bins inside one tile."""
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    counts: np.ndarray
+
+
+def _mercator(latitudes: np.ndarray, longitudes: np.ndarray, scale: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Project coordinates to Web Mercator pixel space of width ``scale``."""
+    lat = np.radians(np.clip(latitudes, -_MAX_MERCATOR_LAT, _MAX_MERCATOR_LAT))
+    x = (longitudes + 180.0) / 360.0 * scale
+    y = (1.0 - np.arcsinh(np.tan(lat)) / math.pi) / 2.0 * scale
+    return x, y
+
+
+def _inverse_mercator(x: np.ndarray, y: np.ndarray, scale: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert Web Mercator pixel coordinates back to (lat, lng)."""
+    lng = x / scale * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(math.pi * (1.0 - 2.0 * y / scale))))
+    return lat, lng
+
+
+class TileLevel:
+    """Binned complaint counts of every non-empty tile at one zoom level."""
+    
+    def __init__(self, zoom: int, bins_per_tile: int, latitudes: np.ndarray, longitudes: np.ndarray):
+        """
+        Bin complaint coordinates into the tiles of a zoom level.
+        
+        Args:
+            zoom: Zoom level
+            bins_per_tile: Bins along each side of a tile
+            latitudes: Complaint latitudes
+            longitudes: Complaint longitudes
+        """
+        self.zoom = zoom
+        self.bins_per_tile = bins_per_tile
+        self.scale = bins_per_tile << zoom
+        
+        x, y = _mercator(latitudes, longitudes, self.scale)
+        bin_x = np.clip(x.astype(np.int64), 0, self.scale - 1)
+        bin_y = np.clip(y.astype(np.int64), 0, self.scale - 1)
+        
+        bins, counts = np.unique(bin_x * self.scale + bin_y, return_counts=True)
+        bin_x, bin_y = bins // self.scale, bins % self.scale
+        
+        # Ordering by tile keeps every tile's bins contiguous
+        tile_keys = (bin_x // bins_per_tile) * (1 << zoom) + bin_y // bins_per_tile
+        order = np.argsort(tile_keys, kind="stable")
+        
+        self.tile_keys = tile_keys[order]
+        self.bin_x = bin_x[order]
+        self.bin_y = bin_y[order]
+        self.counts = counts[order]
+    
+    def tile(self, x: int, y: int) -> TileBins:
+        """
+        Get the bins of one tile at this level.
+        
+        Args:
+            x: Tile column
+            y: Tile row
+        
+        Returns:
+            Bin centers and complaint counts of the tile
+        """
+        key = x * (1 << self.zoom) + y
+        start = np.searchsorted(self.tile_keys, key, side="left")
+        end = np.searchsorted(self.tile_keys, key, side="right")
+        return self._bins(slice(start, end))
+    
+    def descendant(self, zoom: int, x: int, y: int) -> TileBins:
+        """
+        Get the bins of a tile deeper than this level, clipped from its ancestor.
+        
+        Args:
+            zoom: Zoom level of the requested tile (greater than this level's)
+            x: Tile column at ``zoom``
+            y: Tile row at ``zoom``
+        
+        Returns:
+            The ancestor's bins that fall inside the requested tile
+        """
+        shift = zoom - self.zoom
+        key = (x >> shift) * (1 << self.zoom) + (y >> shift)
+        start = np.searchsorted(self.tile_keys, key, side="left")
+        end = np.searchsorted(self.tile_keys, key, side="right")
+        
+        # Place each bin by its center, measured in bins of the requested zoom
+        half = (1 << shift) // 2
+        center_x = (self.bin_x[start:end] << shift) + half
+        center_y = (self.bin_y[start:end] << shift) + half
+        inside = (center_x // self.bins_per_tile == x) & (center_y // self.bins_per_tile == y)
+        return self._bins(np.arange(start, end)[inside])
+    
+    def _bins(self, selection) -> TileBins:
+        lat, lng = _inverse_mercator(self.bin_x[selection] + 0.5, self.bin_y[selection] + 0.5, self.scale)
+        return TileBins(latitudes=lat, longitudes=lng, counts=self.counts[selection])
+
+
+class TilePyramid:
+    """Complaint count tiles precomputed for a range of zoom levels."""
+    
+    def __init__(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        min_zoom: int,
+        max_zoom: int,
+        bins_per_tile: int,
+    ):
+        """
+        Precompute every zoom level between ``min_zoom`` and ``max_zoom``.
+        
+        Args:
+            latitudes: Complaint latitudes
+            longitudes: Complaint longitudes
+            min_zoom: Lowest zoom level served
+            max_zoom: Highest precomputed zoom level; deeper tiles are clipped from it
+            bins_per_tile: Bins along each side of a tile
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.levels: Dict[int, TileLevel] = {
+            zoom: TileLevel(zoom, bins_per_tile, latitudes, longitudes)
+            for zoom in range(min_zoom, max_zoom + 1)
+        }
+    
+    def tile(self, zoom: int, x: int, y: int) -> TileBins:
+        """
+        Get the complaint counts of a tile.
+        
+        Args:
+            zoom: Zoom level, at least ``min_zoom``
+            x: Tile column
+            y: Tile row
+        
+        Returns:
+            Bin centers and complaint counts of the tile
+        
+        Raises:
+            ValueError: If the zoom level or tile coordinates are out of range
+        """
+        if zoom < self.min_zoom:
+            raise ValueError(f"Zoom level must be at least {self.min_zoom}")
+        if not (0 <= x < 1 << zoom and 0 <= y < 1 << zoom):
+            raise ValueError(f"Tile {x}/{y} is outside zoom level {zoom}")
+        
+        if zoom <= self.max_zoom:
+            return self.levels[zoom].tile(x, y)
+        return self.levels[self.max_zoom].descendant(zoom, x, y)
@@ -0,0 +1,45 @@
+"""Shared, pooled HTTP client for upstream API calls."""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SharedHTTPClient:
+    """Application-lifetime httpx client with HTTP/2 and keep-alive pooling."""
+    
+    def __init__(self):
+        """Initialize without opening a client; it is created on first use."""
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the pooled client, creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=settings.HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            logger.info("Opened shared HTTP client")
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the pooled client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Closed shared HTTP client")
+
+
+# Global client instance
+shared_http_client = SharedHTTPClient()
@@ -0,0 +1,254 @@
+"""Caching proxy for Google Street View and place photo images."""
+
+import asyncio
+import hashlib
+import io
+import logging
+from typing import Awaitable, Callable, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+
+from app.config import settings
+from app.utils.disk_cache import DiskCache
+from app.utils.metrics import track_upstream
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    # Pillow is optional; images are served at the size fetched from Google
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Google image endpoints
+PLACES_PHOTO_URL = "https://maps.googleapis.com/maps/api/place/photo"
+STREETVIEW_URL = "https://maps.googleapis.com/maps/api/streetview"
+
+# Largest sizes Google serves
+STREETVIEW_MAX_SIZE = 640
+PHOTO_MAX_WIDTH = 1600
+
+# Widths fetched from Google; a request is cut from the smallest one covering it
+STREETVIEW_WIDTHS = (320, 640)
+PHOTO_WIDTHS = (400, 800, 1600)
+
+# Quality of downscaled JPEGs
+JPEG_QUALITY = 82
+
+
+class CachedImage(NamedTuple):
+    """An image as served to the browser."""
+    body: bytes
+    media_type: str
+    etag: str
+
+
+def _bucket(size: int, widths: Sequence[int]) -> int:
+    """Smallest of ``widths`` at least ``size``, or the largest one."""
+    return next((width for width in widths if width >= size), widths[-1])
+
+
+def snap_coordinate(value: float) -> float:
+    """Round a coordinate to IMAGE_SNAP_DEGREES, so nearby requests share one image."""
+    snap = settings.IMAGE_SNAP_DEGREES
+    return round(round(value / snap) * snap, 6)
+
+
+def _pack(media_type: str, body: bytes) -> bytes:
+    return media_type.encode() + b"\n" + body
+
+
+def _unpack(value: bytes) -> CachedImage:
+    media_type, body = value.split(b"\n", 1)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return CachedImage(body=body, media_type=media_type.decode(), etag=etag)
+
+
+def downscale(image: CachedImage, width: int, height: Optional[int], crop: bool) -> bytes:
+    """
+    Shrink an image and re-encode it as JPEG.
+    
+    Args:
+        image: Image fetched from Google
+        width: Target width
+        height: Target height (None to scale by width only)
+        crop: Fill exactly width x height, cropping the center, instead of
+            fitting inside it
+    
+    Returns:
+        Packed cache value of the downscaled JPEG
+    """
+    picture = Image.open(io.BytesIO(image.body))
+    if crop:
+        picture = ImageOps.fit(picture, (width, height), Image.Resampling.LANCZOS)
+    else:
+        picture.thumbnail((width, height or picture.height), Image.Resampling.LANCZOS)
+    
+    if picture.mode not in ("RGB", "L"):
+        picture = picture.convert("RGB")
+    
+    output = io.BytesIO()
+    picture.save(output, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return _pack("image/jpeg", output.getvalue())
+
+
+class ImageProxy:
+    """
+    Fetches Google images once and serves them from a size-bounded disk cache.
+    
+    Each image is fetched from Google at a bucketed width (STREETVIEW_WIDTHS
+    or PHOTO_WIDTHS) and stored; requested sizes are downscaled from it with
+    Pillow and stored under their own keys. Without Pillow, the bucketed
+    image is served as-is and the browser scales it.
+    """
+    
+    def __init__(self, cache: DiskCache):
+        """
+        Initialize the proxy.
+        
+        Args:
+            cache: Disk cache of packed images
+        """
+        self.cache = cache
+    
+    async def _fetch(self, client: httpx.AsyncClient, operation: str, url: str, params: dict) -> bytes:
+        """
+        Fetch an image from Google, following its redirect to the image host.
+        
+        Raises:
+            httpx.HTTPError: If the request fails
+            ValueError: If Google does not answer with an image
+        """
+        with track_upstream("google_places", operation):
+            response = await client.get(url, params=params, follow_redirects=True)
+            response.raise_for_status()
+        
+        media_type = response.headers.get("content-type", "").split(";")[0].strip()
+        if not media_type.startswith("image/"):
+            raise ValueError(f"Google returned {media_type or 'no content type'} instead of an image")
+        return _pack(media_type, response.content)
+    
+    async def _get(
+        self,
+        key: str,
+        source_key: str,
+        fetch_source: Callable[[], Awaitable[bytes]],
+        size: Tuple[int, Optional[int]],
+        crop: bool,
+    ) -> CachedImage:
+        """Get a downscaled image, fetching its source image first if needed."""
+        if Image is None or key == source_key:
+            return _unpack(await self.cache.get_or_fetch(source_key, fetch_source))
+        
+        async def render() -> bytes:
+            source = await self.cache.get_or_fetch(source_key, fetch_source)
+            try:
+                return await asyncio.to_thread(downscale, _unpack(source), size[0], size[1], crop)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to downscale {source_key}, serving it unscaled: {e}")
+                return source
+        
+        return _unpack(await self.cache.get_or_fetch(key, render))
+    
+    async def streetview(self, lat: float, lng: float, width: int, height: int, client: httpx.AsyncClient) -> CachedImage:
+        """
+        Get a Street View image of a location.
+        
+        The location is snapped to IMAGE_SNAP_DEGREES, and the image is
+        fetched at the smallest of STREETVIEW_WIDTHS covering the requested
+        width with the same aspect ratio, then cropped to exactly
+        width x height.
+        
+        Args:
+            lat: Latitude
+            lng: Longitude
+            width: Image width in pixels (at most STREETVIEW_MAX_SIZE)
+            height: Image height in pixels (at most STREETVIEW_MAX_SIZE)
+            client: HTTP client for Google
+        
+        Returns:
+            The image
+        
+        Raises:
+            httpx.HTTPError: If Google cannot be reached
+            ValueError: If Google does not answer with an image
+        """
+        lat, lng = snap_coordinate(lat), snap_coordinate(lng)
+        
+        source_width = _bucket(width, STREETVIEW_WIDTHS)
+        scale = min(source_width / width, STREETVIEW_MAX_SIZE / height)
+        source_width, source_height = round(width * scale), round(height * scale)
+        
+        location = f"{lat:.6f},{lng:.6f}"
+        
+        async def fetch_source() -> bytes:
+            return await self._fetch(client, "streetview", STREETVIEW_URL, {
+                "size": f"{source_width}x{source_height}",
+                "location": location,
+                "key": settings.GOOGLE_PLACES_API_KEY,
+            })
+        
+        return await self._get(
+            f"streetview:{location}:{width}x{height}",
+            f"streetview:{location}:{source_width}x{source_height}",
+            fetch_source,
+            (width, height),
+            crop=True,
+        )
+    
+    async def photo(
+        self,
+        photo_reference: str,
+        max_width: int,
+        max_height: Optional[int],
+        client: httpx.AsyncClient,
+    ) -> CachedImage:
+        """
+        Get a place photo scaled to fit within max_width x max_height.
+        
+        The photo is fetched at the smallest of PHOTO_WIDTHS covering
+        max_width, then scaled down keeping its aspect ratio.
+        
+        Args:
+            photo_reference: Photo reference from Google Places
+            max_width: Maximum width in pixels (at most PHOTO_MAX_WIDTH)
+            max_height: Optional maximum height in pixels
+            client: HTTP client for Google
+        
+        Returns:
+            The image
+        
+        Raises:
+            httpx.HTTPError: If Google cannot be reached
+            ValueError: If Google does not answer with an image
+        """
+        source_width = _bucket(max_width, PHOTO_WIDTHS)
+        
+        async def fetch_source() -> bytes:
+            return await self._fetch(client, "photo", PLACES_PHOTO_URL, {
+                "maxwidth": source_width,
+                "photo_reference": photo_reference,
+                "key": settings.GOOGLE_PLACES_API_KEY,
+            })
+        
+        source_key = f"photo:{photo_reference}:{source_width}"
+        if max_width == source_width and max_height is None:
+            key = source_key
+        else:
+            key = f"photo:{photo_reference}:{max_width}x{max_height or 0}"
+        return await self._get(key, source_key, fetch_source, (max_width, max_height), crop=False)
+    
+    def close(self) -> None:
+        """Close the image cache."""
+        self.cache.close()
+
+
+# Global image proxy instance
+image_proxy = ImageProxy(DiskCache(
+    name="images",
+    path=settings.CACHE_DIR / "images.sqlite3",
+    fresh_ttl=settings.IMAGE_CACHE_FRESH_SECONDS,
+    stale_ttl=settings.IMAGE_CACHE_STALE_SECONDS,
+    max_bytes=settings.IMAGE_CACHE_MAX_BYTES,
+))
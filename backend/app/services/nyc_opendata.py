@@ -1,16 +1,31 @@
 """NYC OpenData API client for fetching 311 Noise Complaints."""
 
+import asyncio
 import logging
-from typing import List, Optional
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, List, Optional
 
 import httpx
 
 from app.config import settings
-from app.models.noise_complaint import NoiseComplaint
-from app.utils.date_utils import get_past_week_timestamp_range
+from app.models.noise_complaint import ComplaintRow, NoiseComplaint
+from app.utils.date_utils import (
+    get_incremental_timestamp_range,
+    get_past_week_timestamp_range,
+)
+from app.utils.json_stream import iter_json_array
+from app.utils.metrics import track_upstream
 
 logger = logging.getLogger(__name__)
 
+# HTTP status codes worth retrying a page request for
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Columns requested from Socrata; everything else in the dataset is skipped
+COMPLAINT_FIELDS = ("unique_key", "latitude", "longitude", "complaint_type", "created_date")
+
 
 class NYCOpenDataClient:
     """Client for interacting with NYC OpenData Socrata API."""
@@ -19,124 +34,403 @@ class NYCOpenDataClient:
         """Initialize the NYC OpenData client."""
         self.base_url = settings.NYC_OPENDATA_BASE_URL
         self.app_token = settings.NYC_OPENDATA_APP_TOKEN
+        self.page_size = settings.NYC_OPENDATA_PAGE_SIZE
+        self.max_concurrency = settings.NYC_OPENDATA_MAX_CONCURRENCY
+        self.max_retries = settings.NYC_OPENDATA_MAX_RETRIES
+        self.retry_backoff = settings.NYC_OPENDATA_RETRY_BACKOFF
         self.client = httpx.AsyncClient(timeout=30.0)
     
-    def _get_headers(self) -> dict:
+    def _get_headers(self, use_token: bool = True) -> dict:
         """Get HTTP headers for API requests."""
         headers = {"Accept": "application/json"}
-        if self.app_token:
+        if use_token and self.app_token:
             headers["X-App-Token"] = self.app_token
         return headers
     
-    async def fetch_past_week_complaints(
+    @staticmethod
+    def _where_clause(start_date: str, end_date: str) -> str:
+        """Build the SoQL filter for a half-open created_date window, [start_date, end_date)."""
+        return f"created_date >= '{start_date}' AND created_date < '{end_date}'"
+    
+    async def _get(self, params: dict, use_token: bool = True) -> httpx.Response:
+        """
+        Send a query to the Socrata API.
+        
+        Args:
+            params: SoQL query parameters
+            use_token: Whether to use the app token (for retry without token)
+        
+        Returns:
+            The successful HTTP response
+        """
+        try:
+            with track_upstream("socrata", "query"):
+                response = await self.client.get(
+                    self.base_url,
+                    headers=self._get_headers(use_token),
+                    params=params
+                )
+                response.raise_for_status()
+            return response
+        
+        except httpx.HTTPStatusError as e:
+            # If we get a 403 with invalid token error and we're using a token, retry without it
+            if (e.response.status_code == 403 and
+                use_token and
+                self.app_token and
+                "Invalid app_token" in e.response.text):
+                logger.warning("Invalid app token detected, retrying without token...")
+                return await self._get(params, use_token=False)
+            
+            logger.error(f"HTTP error querying NYC OpenData: {e.response.status_code} - {e.response.text}")
+            raise
+    
+    async def count_past_week_complaints(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> int:
+        """
+        Count noise complaints from the past 7 days with a count(*) query.
+        
+        Args:
+            start_date: Start of the window (defaults to 7 days ago)
+            end_date: End of the window, exclusive (defaults to now)
+        
+        Returns:
+            Number of complaints in the window
+        """
+        if start_date is None or end_date is None:
+            start_date, end_date = get_past_week_timestamp_range()
+        
+        params = {
+            "$select": "count(*) AS total",
+            "$where": self._where_clause(start_date, end_date),
+        }
+        
+        response = await self._get(params)
+        data = response.json()
+        return int(data[0]["total"]) if data else 0
+    
+    async def _stream(self, params: dict, use_token: bool = True) -> AsyncIterator[Any]:
+        """
+        Send a query to the Socrata API and yield the records as they arrive.
+        
+        Args:
+            params: SoQL query parameters
+            use_token: Whether to use the app token (for retry without token)
+        
+        Yields:
+            Each record of the JSON array response
+        """
+        try:
+            # Timed until the whole response has been read
+            with track_upstream("socrata", "stream"):
+                async with self.client.stream(
+                    "GET",
+                    self.base_url,
+                    headers=self._get_headers(use_token),
+                    params=params
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    
+                    async for item in iter_json_array(response.aiter_bytes()):
+                        yield item
+        
+        except httpx.HTTPStatusError as e:
+            # If we get a 403 with invalid token error and we're using a token, retry without it
+            if (e.response.status_code == 403 and
+                use_token and
+                self.app_token and
+                "Invalid app_token" in e.response.text):
+                logger.warning("Invalid app token detected, retrying without token...")
+                async for item in self._stream(params, use_token=False):
+                    yield item
+                return
+            
+            logger.error(f"HTTP error querying NYC OpenData: {e.response.status_code} - {e.response.text}")
+            raise
+    
+    async def fetch_complaint_rows(
         self,
         limit: int = 5000,
         offset: int = 0,
-        use_token: bool = True
-    ) -> List[NoiseComplaint]:
+        use_token: bool = True,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[ComplaintRow]:
         """
-        Fetch noise complaints from the past 7 days.
+        Fetch one page of noise complaints as compact rows.
+        
+        Only the columns in COMPLAINT_FIELDS are requested, and the response
+        body is parsed incrementally, so the wide Socrata records are never
+        materialised.
         
         Args:
             limit: Maximum number of records to fetch per request
             offset: Offset for pagination
             use_token: Whether to use the app token (for retry without token)
-            
+            start_date: Start of the window (defaults to 7 days ago)
+            end_date: End of the window, exclusive (defaults to now)
+        
         Returns:
-            List of NoiseComplaint objects
+            List of ComplaintRow tuples
         """
-        start_date, end_date = get_past_week_timestamp_range()
+        if start_date is None or end_date is None:
+            start_date, end_date = get_past_week_timestamp_range()
         
-        # Socrata API query parameters
+        # Socrata API query parameters; unique_key breaks created_date ties
+        # so that offset pages never overlap or skip rows. Oldest first, so
+        # rows created during a download land on the last page, and a sync
+        # that stops at a failed chunk has stored everything older than it.
         params = {
-            "$where": f"created_date >= '{start_date}' AND created_date <= '{end_date}'",
+            "$select": ",".join(COMPLAINT_FIELDS),
+            "$where": self._where_clause(start_date, end_date),
             "$limit": limit,
             "$offset": offset,
-            "$order": "created_date DESC"
+            "$order": "created_date, unique_key"
         }
         
-        # Get headers - optionally skip token if retrying
-        headers = {"Accept": "application/json"}
-        if use_token and self.app_token:
-            headers["X-App-Token"] = self.app_token
-        
         try:
-            response = await self.client.get(
-                self.base_url,
-                headers=headers,
-                params=params
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Parse and validate data - extract only the fields we need
-            complaints = []
-            for item in data:
+            rows = []
+            async for item in self._stream(params, use_token=use_token):
                 try:
-                    # Extract only the fields we care about
-                    filtered_item = {
-                        "unique_key": item.get("unique_key"),
-                        "latitude": item.get("latitude"),
-                        "longitude": item.get("longitude"),
-                        "complaint_type": item.get("complaint_type")
-                    }
-                    
-                    # Skip if unique_key is missing (required field)
-                    if not filtered_item["unique_key"]:
-                        continue
-                    
-                    complaint = NoiseComplaint(**filtered_item)
-                    complaints.append(complaint)
-                except Exception as e:
+                    rows.append(ComplaintRow.from_socrata(item))
+                except (ValueError, TypeError) as e:
                     logger.warning(f"Failed to parse complaint record: {e}")
                     continue
             
-            logger.info(f"Fetched {len(complaints)} noise complaints (offset: {offset})")
-            return complaints
-            
-        except httpx.HTTPStatusError as e:
-            # If we get a 403 with invalid token error and we're using a token, retry without it
-            if (e.response.status_code == 403 and 
-                use_token and 
-                self.app_token and
-                "Invalid app_token" in e.response.text):
-                logger.warning("Invalid app token detected, retrying without token...")
-                return await self.fetch_past_week_complaints(limit=limit, offset=offset, use_token=False)
-            
-            logger.error(f"HTTP error fetching complaints: {e.response.status_code} - {e.response.text}")
-            raise
+            logger.info(f"Fetched {len(rows)} noise complaints (offset: {offset})")
+            return rows
+        
         except Exception as e:
             logger.error(f"Error fetching complaints: {e}")
             raise
     
-    async def fetch_all_past_week_complaints(self) -> List[NoiseComplaint]:
+    async def fetch_past_week_complaints(
+        self,
+        limit: int = 5000,
+        offset: int = 0,
+        use_token: bool = True,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[NoiseComplaint]:
+        """
+        Fetch noise complaints from the past 7 days.
+        
+        Args:
+            limit: Maximum number of records to fetch per request
+            offset: Offset for pagination
+            use_token: Whether to use the app token (for retry without token)
+            start_date: Start of the window (defaults to 7 days ago)
+            end_date: End of the window, exclusive (defaults to now)
+        
+        Returns:
+            List of NoiseComplaint objects
+        """
+        rows = await self.fetch_complaint_rows(
+            limit=limit,
+            offset=offset,
+            use_token=use_token,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return [row.to_model() for row in rows]
+    
+    async def _fetch_page_with_retry(
+        self,
+        offset: int,
+        start_date: str,
+        end_date: str,
+    ) -> List[ComplaintRow]:
+        """
+        Fetch one page, retrying transient failures with exponential backoff.
+        
+        Args:
+            offset: Offset of the page
+            start_date: Start of the window
+            end_date: End of the window, exclusive
+        
+        Returns:
+            List of ComplaintRow tuples on the page
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self.fetch_complaint_rows(
+                    limit=self.page_size,
+                    offset=offset,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code in RETRYABLE_STATUS_CODES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                logger.warning(
+                    f"Retrying page at offset {offset} in {delay:.1f}s "
+                    f"(attempt {attempt}/{self.max_retries}): {e}"
+                )
+                await asyncio.sleep(delay)
+    
+    async def fetch_all_past_week_complaints(self, concurrent: bool = True) -> List[NoiseComplaint]:
         """
         Fetch all noise complaints from the past 7 days with pagination.
         
+        Args:
+            concurrent: Whether to fetch pages in parallel
+        
         Returns:
             List of all NoiseComplaint objects from the past week
         """
-        all_complaints = []
-        limit = 5000
+        # Pin the window so every page queries the same rows
+        start_date, end_date = get_past_week_timestamp_range()
+        return await self.fetch_all_complaints(start_date, end_date, concurrent=concurrent)
+    
+    async def fetch_complaints_since(
+        self,
+        since: Optional[datetime],
+        overlap_minutes: int = 0,
+        concurrent: bool = True,
+    ) -> List[NoiseComplaint]:
+        """
+        Fetch noise complaints created after an already-ingested high-water mark.
+        
+        Args:
+            since: Newest created_date already ingested, or None for the full week
+            overlap_minutes: Minutes to re-fetch before ``since`` to catch late edits
+            concurrent: Whether to fetch pages in parallel
+        
+        Returns:
+            List of NoiseComplaint objects in the incremental window
+        """
+        start_date, end_date = get_incremental_timestamp_range(since, overlap_minutes)
+        return await self.fetch_all_complaints(start_date, end_date, concurrent=concurrent)
+    
+    async def fetch_all_complaints(
+        self,
+        start_date: str,
+        end_date: str,
+        concurrent: bool = True,
+    ) -> List[NoiseComplaint]:
+        """
+        Fetch all noise complaints in a created_date window with pagination.
+        
+        Args:
+            start_date: Start of the window
+            end_date: End of the window, exclusive
+            concurrent: Whether to fetch pages in parallel
+        
+        Returns:
+            List of all NoiseComplaint objects in the window
+        """
+        all_complaints = [
+            row.to_model()
+            async for row in self.iter_complaints(start_date, end_date, concurrent=concurrent)
+        ]
+        
+        logger.info(f"Total complaints fetched: {len(all_complaints)}")
+        return all_complaints
+    
+    async def iter_complaint_pages(
+        self,
+        start_date: str,
+        end_date: str,
+        concurrent: bool = True,
+    ) -> AsyncIterator[List[ComplaintRow]]:
+        """
+        Yield the pages of noise complaints in a created_date window, in offset order.
+        
+        In concurrent mode the total row count is requested first and up to
+        NYC_OPENDATA_MAX_CONCURRENCY pages are kept downloading ahead of the
+        consumer, so the caller can process page N while later pages arrive.
+        Pages are still yielded in offset order, so the result is the same as
+        a serial fetch.
+        
+        Args:
+            start_date: Start of the window
+            end_date: End of the window, exclusive
+            concurrent: Whether to prefetch pages in parallel
+        
+        Yields:
+            Lists of ComplaintRow tuples, one per page
+        """
         offset = 0
         
+        if concurrent:
+            total = await self.count_past_week_complaints(start_date, end_date)
+            offsets = iter(range(0, total, self.page_size))
+            pending: Deque[asyncio.Task] = deque()
+            page_count = 0
+            last_page_size = 0
+            
+            def schedule(count: int) -> None:
+                for page_offset in islice(offsets, count):
+                    pending.append(asyncio.create_task(
+                        self._fetch_page_with_retry(page_offset, start_date, end_date)
+                    ))
+            
+            try:
+                schedule(self.max_concurrency)
+                while pending:
+                    page = await pending.popleft()
+                    schedule(1)
+                    page_count += 1
+                    last_page_size = len(page)
+                    yield page
+            finally:
+                for task in pending:
+                    task.cancel()
+            
+            logger.info(f"Fetched {page_count} pages concurrently ({total} rows counted)")
+            
+            # Continue serially only if rows appeared after the count
+            offset = page_count * self.page_size
+            if page_count and last_page_size < self.page_size:
+                return
+        
         while True:
-            complaints = await self.fetch_past_week_complaints(limit=limit, offset=offset)
+            complaints = await self._fetch_page_with_retry(offset, start_date, end_date)
             
             if not complaints:
                 break
             
-            all_complaints.extend(complaints)
+            yield complaints
             
             # If we got fewer than the limit, we've reached the end
-            if len(complaints) < limit:
+            if len(complaints) < self.page_size:
                 break
             
-            offset += limit
+            offset += self.page_size
+    
+    async def iter_complaints(
+        self,
+        start_date: str,
+        end_date: str,
+        concurrent: bool = True,
+    ) -> AsyncIterator[ComplaintRow]:
+        """
+        Yield the noise complaints in a created_date window one row at a time.
         
-        logger.info(f"Total complaints fetched: {len(all_complaints)}")
-        return all_complaints
+        Args:
+            start_date: Start of the window
+            end_date: End of the window, exclusive
+            concurrent: Whether to prefetch pages in parallel
+        
+        Yields:
+            ComplaintRow tuples in offset order
+        """
+        async for page in self.iter_complaint_pages(start_date, end_date, concurrent=concurrent):
+            for row in page:
+                yield row
     
     async def close(self):
         """Close the HTTP client."""
@@ -145,4 +439,3 @@ class NYCOpenDataClient:
 
 # Global client instance
 nyc_opendata_client = NYCOpenDataClient()
-
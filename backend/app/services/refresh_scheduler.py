@@ -0,0 +1,238 @@
+"""In-process scheduler for background complaint refreshes."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.services.complaint_index import ComplaintIndexService, complaint_index_service
+from app.services.complaint_sync import sync_complaints
+from app.services.nyc_opendata import NYCOpenDataClient, nyc_opendata_client
+from app.services.supabase_service import SupabaseService, supabase_service
+from app.utils.metrics import JOB_BUCKETS, metrics
+
+logger = logging.getLogger(__name__)
+
+# Number of finished jobs kept for status lookups
+MAX_JOB_HISTORY = 50
+
+# Refresh job durations by trigger and outcome, and the complaint rows they handled
+refresh_job_duration = metrics.histogram(
+    "refresh_job_duration_seconds",
+    "Duration of complaint refresh jobs",
+    ("trigger", "status"),
+    buckets=JOB_BUCKETS,
+)
+refresh_rows = metrics.counter(
+    "refresh_rows_total",
+    "Complaint rows fetched from NYC OpenData and upserted by refresh jobs",
+    ("stage",),
+)
+
+
+@dataclass
+class RefreshJob:
+    """One run of the refresh pipeline: sync, then index rebuild."""
+    id: str
+    full: bool
+    trigger: str  # "manual" or "schedule"
+    status: str = "queued"  # queued, running, success, partial or failed
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    summary: Optional[Dict[str, Any]] = None
+    indexed: Optional[int] = None
+    error: Optional[str] = None
+    
+    @property
+    def active(self) -> bool:
+        """Whether the job has not finished yet."""
+        return self.status in ("queued", "running")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-safe dictionary for API responses."""
+        result = asdict(self)
+        for key in ("created_at", "started_at", "finished_at"):
+            if result[key] is not None:
+                result[key] = result[key].isoformat()
+        return result
+
+
+class RefreshScheduler:
+    """
+    Runs complaint refreshes in the background, on an interval and on demand.
+    
+    Only one refresh runs at a time: requests made while one is queued or
+    running are handed that job instead of starting another. Each refresh
+    upserts new complaints and then rebuilds the complaint index, which
+    readers pick up with a single reference swap. After a refresh that
+    stored only part of its rows, refreshes are full syncs until one
+    succeeds, so the missing rows are fetched again.
+    """
+    
+    def __init__(
+        self,
+        opendata_client: NYCOpenDataClient,
+        supabase_service: SupabaseService,
+        index_service: ComplaintIndexService,
+        interval_seconds: float,
+    ):
+        """
+        Initialize the scheduler without starting it.
+        
+        Args:
+            opendata_client: Client used to fetch complaints
+            supabase_service: Service used to store complaints
+            index_service: Index rebuilt after every refresh
+            interval_seconds: Seconds between scheduled refreshes (0 disables them)
+        """
+        self.opendata_client = opendata_client
+        self.supabase_service = supabase_service
+        self.index_service = index_service
+        self.interval_seconds = interval_seconds
+        
+        self._lock = asyncio.Lock()
+        self._jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._current: Optional[RefreshJob] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._backfill_pending = False
+        self.next_run_at: Optional[datetime] = None
+    
+    def start(self) -> None:
+        """Start the interval loop, if scheduled refreshes are enabled."""
+        if self.interval_seconds > 0 and self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run_forever())
+            logger.info(f"Refresh scheduler started (every {self.interval_seconds:.0f}s)")
+    
+    async def stop(self) -> None:
+        """Stop the interval loop and cancel any refresh in progress."""
+        tasks = list(self._tasks.values())
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.next_run_at = None
+    
+    def submit(self, full: bool = False, trigger: str = "manual") -> RefreshJob:
+        """
+        Queue a refresh, or return the one already queued or running.
+        
+        Args:
+            full: Whether to re-fetch the whole past week (always the case
+                after a partial refresh, until a full one succeeds)
+            trigger: What requested the refresh, for status reporting
+        
+        Returns:
+            The job that will carry out the refresh
+        """
+        if self._current is not None and self._current.active:
+            return self._current
+        
+        job = RefreshJob(id=uuid.uuid4().hex, full=full or self._backfill_pending, trigger=trigger)
+        self._current = job
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_JOB_HISTORY:
+            self._jobs.popitem(last=False)
+        
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[RefreshJob]:
+        """Get a recent job by id."""
+        return self._jobs.get(job_id)
+    
+    @property
+    def last_finished(self) -> Optional[RefreshJob]:
+        """The most recently finished job, if any."""
+        for job in reversed(self._jobs.values()):
+            if not job.active:
+                return job
+        return None
+    
+    def status(self) -> Dict[str, Any]:
+        """Get the scheduler's configuration and its current and last jobs."""
+        current = self._current if self._current is not None and self._current.active else None
+        last = self.last_finished
+        return {
+            "interval_seconds": self.interval_seconds,
+            "scheduled": self._loop_task is not None,
+            "backfill_pending": self._backfill_pending,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "current_job": current.to_dict() if current else None,
+            "last_job": last.to_dict() if last else None,
+        }
+    
+    async def _run(self, job: RefreshJob) -> None:
+        async with self._lock:
+            job.status = "running"
+            job.started_at = datetime.now()
+            started = time.perf_counter()
+            
+            try:
+                job.summary = await sync_complaints(
+                    self.opendata_client, self.supabase_service, full=job.full
+                )
+                
+                # Swap in an index that reflects the new data
+                index = await self.index_service.rebuild()
+                job.indexed = len(index)
+                job.status = "partial" if job.summary["failed_chunks"] else "success"
+                if job.status == "partial":
+                    logger.warning(
+                        f"Refresh job {job.id} stored only part of its rows; the next refresh is a full sync"
+                    )
+                    self._backfill_pending = True
+                elif job.full:
+                    self._backfill_pending = False
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "Cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Refresh job {job.id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = datetime.now()
+                job.duration_seconds = round(time.perf_counter() - started, 3)
+                refresh_job_duration.observe(job.duration_seconds, job.trigger, job.status)
+                if job.summary is not None:
+                    refresh_rows.inc("fetched", amount=job.summary["fetched"])
+                    refresh_rows.inc("inserted", amount=job.summary["inserted"])
+            
+            logger.info(
+                f"Refresh job {job.id} ({job.trigger}) finished with status {job.status} "
+                f"in {job.duration_seconds}s"
+            )
+    
+    async def _run_forever(self) -> None:
+        while True:
+            self.next_run_at = datetime.fromtimestamp(time.time() + self.interval_seconds)
+            await asyncio.sleep(self.interval_seconds)
+            
+            job = self.submit(trigger="schedule")
+            task = self._tasks.get(job.id)
+            if task is not None:
+                # Shield so a failed refresh does not end the loop
+                await asyncio.gather(asyncio.shield(task), return_exceptions=True)
+
+
+# Global scheduler instance
+refresh_scheduler = RefreshScheduler(
+    opendata_client=nyc_opendata_client,
+    supabase_service=supabase_service,
+    index_service=complaint_index_service,
+    interval_seconds=settings.REFRESH_INTERVAL_SECONDS,
+)
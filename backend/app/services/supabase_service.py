@@ -1,15 +1,88 @@
 """Supabase service for database operations."""
 
+import asyncio
 import logging
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
+from dateutil.parser import isoparse
 from supabase import Client
 
+from app.config import settings
 from app.database import get_supabase_client
-from app.models.noise_complaint import NoiseComplaint
+from app.models.noise_complaint import ComplaintRow, NoiseComplaint
+from app.utils.metrics import metrics, upstream_errors, upstream_request_duration
 
 logger = logging.getLogger(__name__)
 
+# Either representation of a complaint can be written
+Complaint = Union[NoiseComplaint, ComplaintRow]
+
+T = TypeVar("T")
+
+# Time calls wait for a free worker in the bounded pool
+queue_wait_duration = metrics.histogram(
+    "supabase_queue_wait_seconds",
+    "Time Supabase calls wait for a free worker",
+)
+
+
+def _to_record(complaint: Complaint) -> dict:
+    """Convert a complaint to a JSON-safe dictionary for upserting."""
+    if isinstance(complaint, ComplaintRow):
+        return complaint.to_record()
+    return complaint.model_dump(mode="json", exclude_none=True)
+
+
+@dataclass
+class UpsertChunkResult:
+    """Outcome of upserting one chunk of complaints."""
+    index: int
+    size: int
+    upserted: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the chunk was eventually written."""
+        return self.error is None
+    
+    def to_dict(self) -> dict:
+        """Serialize the result for API responses."""
+        return asdict(self)
+
+
+@dataclass
+class CallTiming:
+    """Running totals of the calls made to one service method."""
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    
+    def record(self, seconds: float, ok: bool) -> None:
+        """Add one call to the totals."""
+        self.calls += 1
+        self.errors += 0 if ok else 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+    
+    def to_dict(self) -> dict:
+        """Serialize the totals, with the mean call duration, for API responses."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 4),
+            "mean_seconds": round(self.total_seconds / self.calls, 4) if self.calls else 0.0,
+            "max_seconds": round(self.max_seconds, 4),
+        }
+
 
 class SupabaseService:
     """Service for interacting with Supabase database."""
@@ -23,6 +96,82 @@ class SupabaseService:
         """
         self.client = client or get_supabase_client()
         self.table_name = "noise_complaints"
+        
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._timings: Dict[str, CallTiming] = {}
+        self._timings_lock = threading.Lock()
+    
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call in the bounded Supabase worker pool.
+        
+        The supabase client is synchronous, so async code awaits its calls
+        through here instead of blocking the event loop. At most
+        SUPABASE_MAX_WORKERS calls run at once; further calls queue for a
+        free worker. Every worker shares the one client and its pooled
+        connections, and each call's duration is recorded under the
+        function's name.
+        
+        Args:
+            func: Blocking function, usually a method of this service
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+        
+        Returns:
+            The value returned by ``func``
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.SUPABASE_MAX_WORKERS,
+                thread_name_prefix="supabase",
+            )
+        
+        loop = asyncio.get_running_loop()
+        name = getattr(func, "__name__", repr(func))
+        queued = time.perf_counter()
+        started = queued
+        
+        def timed() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args, **kwargs)
+        
+        ok = False
+        try:
+            result = await loop.run_in_executor(self._executor, timed)
+            ok = True
+            return result
+        finally:
+            finished = time.perf_counter()
+            seconds = finished - started
+            with self._timings_lock:
+                self._timings.setdefault(name, CallTiming()).record(seconds, ok)
+            queue_wait_duration.observe(started - queued)
+            upstream_request_duration.observe(seconds, "supabase", name)
+            if not ok:
+                upstream_errors.inc("supabase", name)
+            if seconds >= settings.SUPABASE_SLOW_CALL_SECONDS:
+                logger.warning(
+                    f"Slow Supabase call {name}: {seconds:.3f}s "
+                    f"(queued {started - queued:.3f}s)"
+                )
+    
+    def call_stats(self) -> Dict[str, Any]:
+        """
+        Get the worker pool size and per-method call timings.
+        
+        Returns:
+            Dictionary with max_workers and CallTiming totals keyed by method name
+        """
+        with self._timings_lock:
+            calls = {name: timing.to_dict() for name, timing in sorted(self._timings.items())}
+        return {"max_workers": settings.SUPABASE_MAX_WORKERS, "calls": calls}
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool, waiting for calls in progress to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
     
     def ensure_table_exists(self) -> None:
         """
@@ -34,36 +183,155 @@ class SupabaseService:
         # For now, we assume the table exists or will be created manually
         logger.info(f"Using table: {self.table_name}")
     
-    def insert_complaints(self, complaints: List[NoiseComplaint]) -> int:
+    def insert_complaints(
+        self,
+        complaints: Iterable[Complaint],
+        chunk_size: Optional[int] = None
+    ) -> int:
         """
         Insert noise complaints into Supabase.
         
         Args:
-            complaints: List of NoiseComplaint objects to insert
-            
+            complaints: NoiseComplaint objects or ComplaintRow tuples to insert
+            chunk_size: Records per upsert request (defaults to SUPABASE_UPSERT_CHUNK_SIZE)
+        
         Returns:
             Number of successfully inserted records
+        
+        Raises:
+            RuntimeError: If a chunk still fails after its retries
         """
-        if not complaints:
-            return 0
+        results = [
+            self.upsert_chunk(chunk, index)
+            for index, chunk in enumerate(self._chunk_records(complaints, chunk_size))
+        ]
+        return self._summarize_chunks(results)
+    
+    async def insert_complaint_stream(
+        self,
+        complaints: AsyncIterator[Complaint],
+        chunk_size: Optional[int] = None,
+        stop_on_failure: bool = False,
+    ) -> List[UpsertChunkResult]:
+        """
+        Insert a stream of noise complaints in chunks without blocking the event loop.
+        
+        Complaints are consumed as they arrive and each full chunk is upserted
+        in the worker pool while the next chunk is collected, so at most two
+        chunks are held in memory. Failed chunks are retried and reported in
+        the results rather than raised.
+        
+        Args:
+            complaints: Async iterator of NoiseComplaint objects or ComplaintRow tuples
+            chunk_size: Records per upsert request (defaults to SUPABASE_UPSERT_CHUNK_SIZE)
+            stop_on_failure: Whether to stop reading the stream once a chunk
+                has failed, so no later rows are stored after it
+        
+        Returns:
+            One UpsertChunkResult per chunk
+        """
+        chunk_size = chunk_size or settings.SUPABASE_UPSERT_CHUNK_SIZE
+        results: List[UpsertChunkResult] = []
+        upload: Optional[asyncio.Task] = None
+        chunk: List[dict] = []
         
-        # Convert Pydantic models to dictionaries
-        records = [complaint.model_dump(exclude_none=True) for complaint in complaints]
+        async def flush(records: Optional[List[dict]]) -> bool:
+            nonlocal upload
+            # Wait for the previous chunk before queueing this one
+            index = len(results)
+            if upload is not None:
+                results.append(await upload)
+                upload = None
+                index += 1
+                if stop_on_failure and not results[-1].ok:
+                    return False
+            if records:
+                upload = asyncio.create_task(self.run(self.upsert_chunk, records, index))
+            return True
         
         try:
-            # Use upsert to handle duplicates based on unique_key
-            response = self.client.table(self.table_name).upsert(
-                records,
-                on_conflict="unique_key"
-            ).execute()
-            
-            inserted_count = len(response.data) if response.data else 0
-            logger.info(f"Inserted/updated {inserted_count} noise complaints")
-            return inserted_count
+            async for complaint in complaints:
+                chunk.append(_to_record(complaint))
+                if len(chunk) >= chunk_size:
+                    if not await flush(chunk):
+                        logger.warning("Stopped inserting complaints after a failed chunk")
+                        break
+                    chunk = []
+            else:
+                await flush(chunk)
+                await flush(None)
+        finally:
+            if upload is not None:
+                upload.cancel()
+            aclose = getattr(complaints, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        
+        return results
+    
+    def upsert_chunk(self, records: List[dict], index: int = 0) -> UpsertChunkResult:
+        """
+        Upsert one chunk of records, retrying failures with exponential backoff.
+        
+        Args:
+            records: JSON-safe complaint dictionaries
+            index: Position of the chunk, for reporting
+        
+        Returns:
+            UpsertChunkResult describing the outcome
+        """
+        result = UpsertChunkResult(index=index, size=len(records))
+        max_attempts = settings.SUPABASE_UPSERT_MAX_RETRIES + 1
+        
+        while result.attempts < max_attempts:
+            result.attempts += 1
+            try:
+                # Use upsert to handle duplicates based on unique_key
+                response = self.client.table(self.table_name).upsert(
+                    records,
+                    on_conflict="unique_key"
+                ).execute()
+                
+                result.upserted = len(response.data) if response.data else 0
+                result.error = None
+                logger.info(f"Inserted/updated {result.upserted} noise complaints (chunk {index})")
+                return result
             
-        except Exception as e:
-            logger.error(f"Error inserting complaints: {e}")
-            raise
+            except Exception as e:
+                result.error = str(e)
+                logger.warning(
+                    f"Error upserting chunk {index} "
+                    f"(attempt {result.attempts}/{max_attempts}): {e}"
+                )
+                if result.attempts < max_attempts:
+                    time.sleep(settings.SUPABASE_UPSERT_RETRY_BACKOFF * 2 ** (result.attempts - 1))
+        
+        logger.error(f"Giving up on chunk {index} of {len(records)} noise complaints")
+        return result
+    
+    @staticmethod
+    def _chunk_records(
+        complaints: Iterable[Complaint],
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[dict]]:
+        """Convert complaints to JSON-safe dictionaries, one chunk at a time."""
+        chunk_size = chunk_size or settings.SUPABASE_UPSERT_CHUNK_SIZE
+        complaints = iter(complaints)
+        while True:
+            chunk = [_to_record(complaint) for complaint in islice(complaints, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+    
+    @staticmethod
+    def _summarize_chunks(results: List[UpsertChunkResult]) -> int:
+        """Total the upserted rows, raising if any chunk failed."""
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(results)} upsert chunks failed: {failed[0].error}"
+            )
+        return sum(result.upserted for result in results)
     
     def get_complaint_by_key(self, unique_key: str) -> Optional[NoiseComplaint]:
         """
@@ -71,7 +339,7 @@ class SupabaseService:
         
         Args:
             unique_key: Unique identifier for the complaint
-            
+        
         Returns:
             NoiseComplaint object if found, None otherwise
         """
@@ -83,7 +351,7 @@ class SupabaseService:
             if response.data and len(response.data) > 0:
                 return NoiseComplaint(**response.data[0])
             return None
-            
+        
         except Exception as e:
             logger.error(f"Error fetching complaint: {e}")
             raise
@@ -101,15 +369,41 @@ class SupabaseService:
             ).execute()
             
             return response.count if response.count is not None else 0
-            
+        
         except Exception as e:
             logger.error(f"Error counting complaints: {e}")
             raise
     
+    def get_latest_created_date(self) -> Optional[datetime]:
+        """
+        Get the newest created_date stored, used as the incremental sync high-water mark.
+        
+        Returns:
+            Newest created_date, or None if no complaint has one
+        """
+        try:
+            response = (
+                self.client.table(self.table_name)
+                .select("created_date")
+                .not_.is_("created_date", "null")
+                .order("created_date", desc=True)
+                .limit(1)
+                .execute()
+            )
+            
+            if response.data:
+                return isoparse(response.data[0]["created_date"])
+            return None
+        
+        except Exception as e:
+            logger.error(f"Error fetching latest created_date: {e}")
+            raise
+    
     def get_all_complaints(
         self,
         limit: int = 1000,
-        has_location: bool = True
+        has_location: bool = True,
+        after: Optional[str] = None
     ) -> List[NoiseComplaint]:
         """
         Get all noise complaints from the database.
@@ -117,27 +411,180 @@ class SupabaseService:
         Args:
             limit: Maximum number of complaints to return
             has_location: If True, only return complaints with lat/lng coordinates
-            
+            after: Optional unique_key cursor; only complaints after it are returned
+        
+        Returns:
+            List of NoiseComplaint objects ordered by unique_key
+        """
+        return [
+            NoiseComplaint(**item)
+            for item in self.get_complaint_records(limit=limit, has_location=has_location, after=after)
+        ]
+    
+    def get_complaint_records(
+        self,
+        limit: int = 1000,
+        has_location: bool = True,
+        after: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Get noise complaints as raw rows, without building a model per row.
+        
+        Args:
+            limit: Maximum number of complaints to return
+            has_location: If True, only return complaints with lat/lng coordinates
+            after: Optional unique_key cursor; only complaints after it are returned
+        
         Returns:
-            List of NoiseComplaint objects
+            List of row dictionaries ordered by unique_key
         """
         try:
-            query = self.client.table(self.table_name).select("*")
-            
-            # Filter for complaints that have location data
-            if has_location:
-                query = query.not_.is_("latitude", "null").not_.is_("longitude", "null")
-            
-            query = query.limit(limit)
-            response = query.execute()
-            
-            if response.data:
-                return [NoiseComplaint(**item) for item in response.data]
-            return []
-            
+            return [
+                row
+                for page in self.iter_complaint_pages(limit=limit, has_location=has_location, after=after)
+                for row in page
+            ]
+        
         except Exception as e:
             logger.error(f"Error fetching all complaints: {e}")
             raise
+    
+    def get_complaint_page(
+        self,
+        after: Optional[str] = None,
+        page_size: Optional[int] = None,
+        has_location: bool = True,
+        columns: str = "*"
+    ) -> List[dict]:
+        """
+        Get one keyset page of complaints ordered by unique_key.
+        
+        Seeking past the cursor keeps every page as cheap as the first,
+        unlike offset paging, which rescans the rows it skips.
+        
+        Args:
+            after: unique_key of the last row of the previous page, if any
+            page_size: Number of rows to request (defaults to SUPABASE_PAGE_SIZE)
+            has_location: If True, only return complaints with lat/lng coordinates
+            columns: Columns to select; must include unique_key to continue paging
+        
+        Returns:
+            List of row dictionaries
+        """
+        query = self.client.table(self.table_name).select(columns)
+        
+        # Filter for complaints that have location data
+        if has_location:
+            query = query.not_.is_("latitude", "null").not_.is_("longitude", "null")
+        if after is not None:
+            query = query.gt("unique_key", after)
+        
+        response = query.order("unique_key").limit(page_size or settings.SUPABASE_PAGE_SIZE).execute()
+        return response.data or []
+    
+    def iter_complaint_pages(
+        self,
+        limit: Optional[int] = None,
+        has_location: bool = True,
+        after: Optional[str] = None,
+        columns: str = "*"
+    ) -> Iterator[List[dict]]:
+        """
+        Page through complaints by unique_key until ``limit`` rows are returned.
+        
+        Args:
+            limit: Maximum number of rows in total (None for all)
+            has_location: If True, only return complaints with lat/lng coordinates
+            after: Optional unique_key cursor to start after
+            columns: Columns to select; must include unique_key
+        
+        Yields:
+            Non-empty pages of row dictionaries
+        """
+        page_size = settings.SUPABASE_PAGE_SIZE
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = self.get_complaint_page(after, size, has_location, columns)
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            
+            after = page[-1]["unique_key"]
+            if remaining is not None:
+                remaining -= len(page)
+    
+    async def stream_complaint_pages(
+        self,
+        limit: Optional[int] = None,
+        has_location: bool = True,
+        after: Optional[str] = None,
+        columns: str = "*"
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Page through complaints in the worker pool, fetching one page ahead.
+        
+        The next page is requested as soon as the current one is yielded,
+        so the database round trip overlaps with the caller's processing.
+        
+        Args:
+            limit: Maximum number of rows in total (None for all)
+            has_location: If True, only return complaints with lat/lng coordinates
+            after: Optional unique_key cursor to start after
+            columns: Columns to select; must include unique_key
+        
+        Yields:
+            Non-empty pages of row dictionaries
+        """
+        page_size = settings.SUPABASE_PAGE_SIZE
+        remaining = limit
+        
+        def request(cursor: Optional[str]) -> Tuple[int, asyncio.Future]:
+            size = page_size if remaining is None else min(page_size, remaining)
+            return size, asyncio.ensure_future(
+                self.run(self.get_complaint_page, cursor, size, has_location, columns)
+            )
+        
+        size, fetch = request(after)
+        try:
+            while fetch is not None:
+                page = await fetch
+                fetch = None
+                if remaining is not None:
+                    remaining -= len(page)
+                if len(page) == size and (remaining is None or remaining > 0):
+                    size, fetch = request(page[-1]["unique_key"])
+                if page:
+                    yield page
+        finally:
+            if fetch is not None:
+                fetch.cancel()
+                await asyncio.gather(fetch, return_exceptions=True)
+    
+    def get_complaint_locations(self) -> List[dict]:
+        """
+        Get the coordinates, type and creation time of every complaint that has location data.
+        
+        Pages through the table so the Supabase per-request row cap
+        does not truncate the result.
+        
+        Returns:
+            List of dictionaries with latitude, longitude, complaint_type and created_date keys
+        """
+        try:
+            return [
+                row
+                for page in self.iter_complaint_pages(
+                    columns="unique_key,latitude,longitude,complaint_type,created_date"
+                )
+                for row in page
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error fetching complaint locations: {e}")
+            raise
 
 
 # Global service instance
@@ -0,0 +1,177 @@
+"""In-memory caching utilities."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Every cache created, so their counters can be reported together
+_registry: List[Any] = []
+
+
+def register_cache(cache: Any) -> None:
+    """
+    Include a cache in ``cache_stats``.
+    
+    Args:
+        cache: Object with a ``name`` attribute and a ``stats()`` method
+    """
+    _registry.append(cache)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-memory cache with per-entry TTL and LRU eviction.
+    
+    ``get_or_fetch`` coalesces concurrent misses for the same key so that
+    only one upstream call is made for them.
+    """
+    
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            name: Name used when reporting stats
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays fresh
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._inflight: Dict[K, "asyncio.Task[V]"] = {}
+        
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        
+        register_cache(self)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: K) -> Optional[V]:
+        """
+        Get a fresh entry, marking it as recently used.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._discarded(key)
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: K, value: V) -> None:
+        """
+        Store an entry, evicting the least recently used ones if full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            self._discarded(evicted)
+    
+    def pop(self, key: K) -> Optional[V]:
+        """
+        Remove an entry.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The removed value, or None if there was no fresh entry
+        """
+        value = self.get(key)
+        if key in self._entries:
+            del self._entries[key]
+            self._discarded(key)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        for key in list(self._entries):
+            del self._entries[key]
+            self._discarded(key)
+    
+    def _discarded(self, key: K) -> None:
+        """Called after an entry expires or is evicted; subclasses may clean up here."""
+    
+    async def get_or_fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        """
+        Get an entry, calling ``fetch`` to fill it on a miss.
+        
+        Concurrent callers missing the same key share a single ``fetch``.
+        Exceptions are propagated and nothing is cached for them.
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine factory producing the value
+        
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(key, fetch))
+            self._inflight[key] = task
+        
+        # Shield so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(task)
+    
+    async def _fill(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await fetch()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's size and hit/miss counters."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the stats of every cache, keyed by cache name."""
+    return {cache.name: cache.stats() for cache in _registry}
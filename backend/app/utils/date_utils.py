@@ -1,7 +1,7 @@
 """Date utility functions for filtering data by date ranges."""
 
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 def get_past_week_range() -> Tuple[str, str]:
@@ -29,3 +29,32 @@ def get_past_week_timestamp_range() -> Tuple[str, str]:
     
     return start_date.isoformat(), end_date.isoformat()
 
+
+def get_incremental_timestamp_range(
+    since: Optional[datetime],
+    overlap_minutes: int = 0
+) -> Tuple[str, str]:
+    """
+    Get the timestamp range for an incremental sync in Socrata API format.
+    
+    The range starts ``overlap_minutes`` before ``since`` so that records
+    edited shortly after they were ingested are picked up again. It never
+    reaches further back than the past 7 days.
+    
+    Args:
+        since: Newest created_date already ingested, or None for a full sync
+        overlap_minutes: Minutes to re-fetch before ``since``
+    
+    Returns:
+        Tuple of (start_timestamp, end_timestamp) as ISO format strings
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=7)
+    
+    if since is not None:
+        # Socrata timestamps are floating (no timezone), so compare naively
+        since = since.replace(tzinfo=None)
+        start_date = max(start_date, since - timedelta(minutes=overlap_minutes))
+    
+    return start_date.isoformat(), end_date.isoformat()
+
@@ -0,0 +1,247 @@
+"""Persistent, SQLite-backed caching utilities."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.utils.cache import register_cache
+
+logger = logging.getLogger(__name__)
+
+# Entries evicted per query while shrinking the cache below max_bytes
+_EVICTION_BATCH = 64
+
+
+class DiskCache:
+    """
+    Byte-value cache stored in a local SQLite file, so it survives restarts.
+    
+    Entries younger than ``fresh_ttl`` are served as-is. Entries up to
+    ``stale_ttl`` old are served immediately while a background task
+    refreshes them (stale-while-revalidate). Older entries are refetched
+    before being served. When ``max_bytes`` is set, the least recently used
+    entries are evicted to keep the stored values under it. Reads record
+    their access time at most once per ``access_resolution`` seconds per
+    entry, so cache hits rarely write to the database.
+    
+    The database is opened on first use rather than on construction, so
+    creating a cache at import time does not touch the filesystem.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        fresh_ttl: float,
+        stale_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        access_resolution: float = 60.0,
+    ):
+        """
+        Initialize the cache; the file is created when first used.
+        
+        Args:
+            name: Name used for the table and when reporting stats
+            path: SQLite database file
+            fresh_ttl: Seconds an entry is served without revalidation
+            stale_ttl: Seconds a stale entry may still be served (defaults to fresh_ttl)
+            max_bytes: Optional bound on the total size of stored values
+            access_resolution: Seconds within which repeated reads of an entry
+                do not update its access time (the precision of LRU eviction)
+        """
+        self.name = name
+        self.path = path
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl or fresh_ttl, fresh_ttl)
+        self.max_bytes = max_bytes
+        self.access_resolution = access_resolution
+        
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Total size of stored values, kept up to date by set and eviction
+        self._bytes = 0
+        self._inflight: Dict[str, "asyncio.Task[bytes]"] = {}
+        self._revalidating: Set[asyncio.Task] = set()
+        
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        
+        register_cache(self)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get the database connection, opening (and creating) it if needed; call with the lock held."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.name} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_accessed ON {self.name} (accessed_at)")
+            conn.commit()
+            self._bytes = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.name}").fetchone()[0]
+            self._conn = conn
+        return self._conn
+    
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Read an entry regardless of its age.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Tuple of (value, age in seconds), or None if missing
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value, stored_at, accessed_at FROM {self.name} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] >= self.access_resolution:
+                conn.execute(f"UPDATE {self.name} SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+        return row[0], now - row[1]
+    
+    def contains(self, key: str) -> bool:
+        """Whether an entry exists that is still within its stale window."""
+        with self._lock:
+            row = self._connection().execute(
+                f"SELECT stored_at FROM {self.name} WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.stale_ttl
+    
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store an entry, evicting least recently used ones if over ``max_bytes``.
+        
+        Args:
+            key: Cache key
+            value: Bytes to store
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            replaced = conn.execute(f"SELECT size FROM {self.name} WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.name} (key, value, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._bytes += len(value) - (replaced[0] if replaced else 0)
+            if self.max_bytes is not None:
+                self._evict_locked(conn)
+            conn.commit()
+    
+    def _evict_locked(self, conn: sqlite3.Connection) -> None:
+        while self._bytes > self.max_bytes:
+            rows = conn.execute(
+                f"SELECT key, size FROM {self.name} ORDER BY accessed_at LIMIT ?", (_EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    return
+                conn.execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+                self._bytes -= size
+                self.evictions += 1
+    
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Get an entry, serving stale values while they are refreshed.
+        
+        Concurrent fetches of the same key are coalesced. Fetch errors are
+        propagated on a miss and only logged during background revalidation.
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine factory producing the value
+        
+        Returns:
+            The cached or freshly fetched bytes
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            value, age = cached
+            if age < self.fresh_ttl:
+                self.hits += 1
+                return value
+            if age < self.stale_ttl:
+                self.stale_hits += 1
+                self._revalidate(key, fetch)
+                return value
+        
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return await asyncio.shield(self._fetch(key, fetch))
+    
+    def _fetch(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> "asyncio.Task[bytes]":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, fetch))
+            self._inflight[key] = task
+        return task
+    
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        try:
+            value = await fetch()
+            await asyncio.to_thread(self.set, key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+    
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> None:
+        if key in self._inflight:
+            return
+        
+        async def refresh() -> None:
+            try:
+                await self._fetch(key, fetch)
+            except Exception as e:
+                logger.warning(f"Failed to revalidate {self.name} entry {key}: {e}")
+        
+        task = asyncio.create_task(refresh())
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidating.discard)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's size and hit/miss counters."""
+        with self._lock:
+            count = self._connection().execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+            total = self._bytes
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "fresh_ttl": self.fresh_ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.stale_hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+    
+    def close(self) -> None:
+        """Close the database connection; it is reopened if the cache is used again."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
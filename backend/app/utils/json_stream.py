@@ -0,0 +1,72 @@
+"""Incremental parsing of JSON array response bodies."""
+
+import codecs
+import json
+from typing import Any, AsyncIterator
+
+# Characters that may appear between the elements of a JSON array
+_WHITESPACE = " \t\r\n"
+_SEPARATORS = _WHITESPACE + ","
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a JSON array as its bytes arrive.
+    
+    Only the element currently being decoded is buffered, so memory use
+    does not grow with the length of the array.
+    
+    Args:
+        chunks: Raw UTF-8 body chunks, e.g. ``response.aiter_bytes()``
+    
+    Yields:
+        Each decoded array element, in order
+    
+    Raises:
+        ValueError: If the body is not a complete JSON array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    
+    async for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        
+        while True:
+            while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            
+            if buffer[pos] == "]":
+                return
+            
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                break
+            
+            # A bare number may be cut off anywhere ("2", "2." or "2.5e"), so
+            # scalars are only complete once the next "," or "]" has arrived
+            if not isinstance(value, (dict, list, str)):
+                after = end
+                while after < len(buffer) and buffer[after] in _WHITESPACE:
+                    after += 1
+                if after == len(buffer) or buffer[after] not in ",]":
+                    break
+            
+            pos = end
+            yield value
+    
+    raise ValueError("Truncated JSON array")
@@ -0,0 +1,310 @@
+"""In-process metrics, exported in the Prometheus text format."""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram buckets (upper bounds in seconds) for request and upstream latencies
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Histogram buckets for background jobs, which take seconds to minutes
+JOB_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class MetricFamily(NamedTuple):
+    """Samples of one metric, as produced by collectors at scrape time."""
+    name: str
+    type: str  # counter or gauge
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _header(name: str, type: str, help: str) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {type}"]
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the counter.
+        
+        Args:
+            name: Metric name
+            help: Description shown in the export
+            labelnames: Names of the labels each increment is given values for
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Add to the counter.
+        
+        Args:
+            *labels: Label values, in the order of ``labelnames``
+            amount: Amount to add
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        """Get the counter's lines in the text format."""
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = _header(self.name, "counter", self.help)
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {_value(value)}" for labels, value in values)
+        return lines
+
+
+class Histogram:
+    """
+    Histogram of observed values with fixed buckets and optional labels.
+    
+    Each observation is a bisect into the bucket bounds and two additions,
+    so it is cheap enough for every request.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """
+        Initialize the histogram.
+        
+        Args:
+            name: Metric name
+            help: Description shown in the export
+            labelnames: Names of the labels each observation is given values for
+            buckets: Sorted bucket upper bounds (+Inf is added)
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label values: [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record one value.
+        
+        Args:
+            value: Observed value, in seconds for latencies
+            *labels: Label values, in the order of ``labelnames``
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+    
+    def render(self) -> List[str]:
+        """Get the histogram's lines in the text format."""
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        
+        lines = _header(self.name, "histogram", self.help)
+        bucket_names = self.labelnames + ("le",)
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(bucket_names, labels + (_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_value(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The application's metrics: counters and histograms updated as things
+    happen, plus collectors that read other components' stats at scrape time.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+    
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        counter = Counter(name, help, labelnames)
+        self._metrics.append(counter)
+        return counter
+    
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        histogram = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(histogram)
+        return histogram
+    
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """
+        Add a function called on every export to produce gauges or counters.
+        
+        Args:
+            collector: Function returning metric families
+        """
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """
+        Export every metric in the Prometheus text format.
+        
+        Returns:
+            The exposition text
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        
+        for collector in self._collectors:
+            for family in collector():
+                lines.extend(_header(family.name, family.type, family.help))
+                for labels, value in family.samples:
+                    lines.append(f"{family.name}{_labels(tuple(labels), tuple(labels.values()))} {_value(value)}")
+        
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+# Request latency by method, route template and status code
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to serve HTTP requests, until the last body byte is sent",
+    ("method", "route", "status"),
+)
+
+# Calls to Socrata, Supabase, Google Places and Gemini
+upstream_request_duration = metrics.histogram(
+    "upstream_request_duration_seconds",
+    "Duration of calls to upstream services",
+    ("upstream", "operation"),
+)
+upstream_errors = metrics.counter(
+    "upstream_errors_total",
+    "Calls to upstream services that raised an error",
+    ("upstream", "operation"),
+)
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str) -> Iterator[None]:
+    """
+    Time a call to an upstream service, counting it as an error if it raises.
+    
+    Args:
+        upstream: Service name (socrata, supabase, google_places or gemini)
+        operation: What was called
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        upstream_errors.inc(upstream, operation)
+        raise
+    finally:
+        upstream_request_duration.observe(time.perf_counter() - started, upstream, operation)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request in ``http_request_duration``.
+    
+    Requests are labelled with the matched route's path template (such as
+    ``/complaints/tiles/{z}/{x}/{y}``) so that label values stay bounded;
+    requests that match no route are labelled ``unmatched``. Streaming
+    responses are timed until their last chunk is sent.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        """
+        Wrap an ASGI app.
+        
+        Args:
+            app: The app to time
+        """
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
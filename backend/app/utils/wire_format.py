@@ -0,0 +1,260 @@
+"""Compact response encodings for point-heavy payloads."""
+
+import gzip
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional; responses fall back to gzip
+    brotli = None
+
+# Media types of the supported formats
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.serenifi.columnar+json"
+BINARY_MEDIA_TYPE = "application/vnd.serenifi.float32"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+FORMAT_MEDIA_TYPES: Dict[str, str] = {
+    "json": JSON_MEDIA_TYPE,
+    "columnar": COLUMNAR_MEDIA_TYPE,
+    "binary": BINARY_MEDIA_TYPE,
+    "ndjson": NDJSON_MEDIA_TYPE,
+}
+
+# Formats of heatmap point payloads (see encode_points)
+POINT_FORMATS = ("json", "columnar", "binary")
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Content encodings in order of preference
+_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_format(
+    format: Optional[str],
+    accept: Optional[str],
+    supported: Sequence[str] = POINT_FORMATS,
+) -> str:
+    """
+    Pick the response format from an explicit ``format=`` or the Accept header.
+    
+    Args:
+        format: Format name from the query string, which takes precedence
+        accept: Accept request header
+        supported: Format names the endpoint can produce
+    
+    Returns:
+        Format name; "json" unless a compact format was asked for
+    
+    Raises:
+        ValueError: If ``format`` names an unsupported format
+    """
+    if format is not None:
+        if format not in supported:
+            raise ValueError(f"Unsupported format: {format} (expected one of {', '.join(supported)})")
+        return format
+    
+    if accept:
+        for name in supported:
+            if name != "json" and FORMAT_MEDIA_TYPES[name] in accept:
+                return name
+    return "json"
+
+
+def pack_float32(*columns: Sequence[float]) -> bytes:
+    """
+    Pack equal-length columns as consecutive little-endian float32 arrays.
+    
+    Args:
+        columns: Columns of numbers, e.g. lat, lng and weight
+    
+    Returns:
+        Bytes of column 0, then column 1, and so on
+    """
+    return b"".join(np.asarray(column, dtype="<f4").tobytes() for column in columns)
+
+
+def encode_points(
+    format: str,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    weights: Sequence[float],
+    metadata: Dict[str, Any],
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize heatmap points without building a model per point.
+    
+    - json: ``{"points": [{"lat", "lng", "weight"}, ...], **metadata}``
+    - columnar: ``{"lat": [...], "lng": [...], "w": [...], **metadata}``
+    - binary: float32 columns lat, lng, weight; the point count and
+      metadata are sent as ``X-`` headers (``grid_size`` -> ``X-Grid-Size``)
+    
+    Args:
+        format: Format name from ``negotiate_format``
+        latitudes: Point latitudes
+        longitudes: Point longitudes
+        weights: Point weights
+        metadata: Extra top-level fields, e.g. total_complaints
+    
+    Returns:
+        Tuple of (body, extra response headers)
+    """
+    lats = np.asarray(latitudes, dtype=np.float64).tolist()
+    lngs = np.asarray(longitudes, dtype=np.float64).tolist()
+    ws = np.asarray(weights, dtype=np.float64).tolist()
+    
+    if format == "binary":
+        headers = {"X-Point-Count": str(len(lats))}
+        for key, value in metadata.items():
+            headers["X-" + key.replace("_", "-").title()] = str(value)
+        return pack_float32(lats, lngs, ws), headers
+    
+    if format == "columnar":
+        return dump_json({"lat": lats, "lng": lngs, "w": ws, **metadata}), {}
+    
+    points = [{"lat": lat, "lng": lng, "weight": w} for lat, lng, w in zip(lats, lngs, ws)]
+    return dump_json({"points": points, **metadata}), {}
+
+
+def dump_json(payload: Any) -> bytes:
+    """Serialize a payload of plain Python values to compact JSON bytes."""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, ignoring encoding suffixes.
+    
+    Args:
+        if_none_match: If-None-Match request header
+        etag: Quoted ETag of the uncompressed representation
+    
+    Returns:
+        True if the client already holds this representation
+    """
+    if not if_none_match:
+        return False
+    
+    base = etag.strip('"')
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag == base or any(tag == f"{base}-{encoding}" for encoding in _ENCODINGS):
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content encoding to compress a response with.
+    
+    The supported encoding with the highest q-value wins, with brotli
+    preferred on ties; ``q=0`` refuses an encoding, and ``*`` sets the
+    q-value of encodings the header does not name.
+    
+    Args:
+        accept_encoding: Accept-Encoding request header
+    
+    Returns:
+        "br" or "gzip", or None to send the body uncompressed
+    """
+    weights: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, *params = [token.strip() for token in part.split(";")]
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.lower()] = weight
+    
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for name in _ENCODINGS:
+        weight = weights.get(name, default)
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def compress_body(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress a response body, unless it is too small to be worth it.
+    
+    Args:
+        body: Serialized response body
+        encoding: Encoding from ``negotiate_encoding``
+    
+    Returns:
+        Tuple of (body, encoding applied or None)
+    """
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=5), encoding
+    return gzip.compress(body, compresslevel=6), encoding
+
+
+def compressed_response(
+    body: bytes,
+    media_type: str,
+    encoding: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build a response from a body already compressed by ``compress_body``.
+    
+    A compressed response's ETag (if any) gets the encoding appended, since
+    its bytes differ from the uncompressed representation.
+    
+    Args:
+        body: Response body, compressed with ``encoding``
+        media_type: Content type of the uncompressed body
+        encoding: Encoding applied to the body, or None
+        headers: Extra response headers
+    
+    Returns:
+        Response with Content-Encoding and Vary set as appropriate
+    """
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept, Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        if "ETag" in headers:
+            headers["ETag"] = f'{headers["ETag"][:-1]}-{encoding}"'
+    
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def encoded_response(
+    body: bytes,
+    media_type: str,
+    accept_encoding: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build a response, compressing the body with brotli or gzip when accepted.
+    
+    Args:
+        body: Serialized response body
+        media_type: Content type of the body
+        accept_encoding: Accept-Encoding request header
+        headers: Extra response headers
+    
+    Returns:
+        Response with Content-Encoding and Vary set as appropriate
+    """
+    body, encoding = compress_body(body, negotiate_encoding(accept_encoding))
+    return compressed_response(body, media_type, encoding, headers)
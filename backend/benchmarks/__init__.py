@@ -0,0 +1 @@
+"""Offline benchmarks and load tests for the API hot paths."""
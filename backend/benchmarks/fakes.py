@@ -0,0 +1,361 @@
+"""Synthetic data and local stand-ins for Supabase, Socrata and Google Places."""
+
+import asyncio
+import bisect
+import json
+import os
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+# Complaint hotspots (lat, lng, spread in degrees, share of complaints)
+_HOTSPOTS = [
+    (40.7580, -73.9855, 0.010, 0.20),  # Midtown
+    (40.7265, -73.9815, 0.012, 0.15),  # East Village
+    (40.7081, -73.9571, 0.015, 0.15),  # Williamsburg
+    (40.8116, -73.9465, 0.015, 0.10),  # Harlem
+    (40.6782, -73.9442, 0.030, 0.15),  # Central Brooklyn
+    (40.7282, -73.7949, 0.040, 0.10),  # Queens
+    (40.8448, -73.8648, 0.040, 0.10),  # Bronx
+    (40.5795, -74.1502, 0.050, 0.05),  # Staten Island
+]
+
+COMPLAINT_TYPES = [
+    "Noise - Residential",
+    "Noise - Street/Sidewalk",
+    "Noise - Commercial",
+    "Noise - Vehicle",
+    "Noise - Helicopter",
+    "Noise - Park",
+    "Noise",
+]
+
+# Dataset sizes the benchmarks are usually run at
+DATASET_SIZES = (10_000, 100_000, 1_000_000)
+
+# Bounds of the NYC area used for random query points
+NYC_BOUNDS = (40.55, 40.90, -74.15, -73.75)
+
+
+def configure_offline_env(root: Optional[Path] = None) -> Path:
+    """
+    Point the app at dummy credentials and throwaway directories.
+    
+    Must be called before anything under ``app`` is imported, since the
+    settings are read at import time. Variables already set are kept.
+    
+    Args:
+        root: Directory for caches and the archive (a new temp dir by default)
+    
+    Returns:
+        The directory used
+    """
+    root = root or Path(tempfile.mkdtemp(prefix="serenifi-bench-"))
+    defaults = {
+        "SUPABASE_URL": "http://supabase.invalid",
+        "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark",
+        "GOOGLE_PLACES_API_KEY": "benchmark",
+        "REFRESH_INTERVAL_SECONDS": "0",
+        "PLACES_PAGE_TOKEN_DELAY_SECONDS": "0",
+        "CACHE_DIR": str(root / "cache"),
+        "ARCHIVE_DIR": str(root / "archive"),
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    return root
+
+
+def synthetic_complaints(count: int, seed: int = 0, days: int = 7) -> List[dict]:
+    """
+    Generate complaint rows clustered around NYC noise hotspots.
+    
+    Args:
+        count: Number of rows
+        seed: Random seed, so runs are reproducible
+        days: Rows are spread over this many days before now
+    
+    Returns:
+        Row dictionaries shaped like the noise_complaints table, sorted by unique_key
+    """
+    rng = np.random.default_rng(seed)
+    shares = np.array([spot[3] for spot in _HOTSPOTS])
+    spots = rng.choice(len(_HOTSPOTS), size=count, p=shares / shares.sum())
+    centers = np.array([spot[:3] for spot in _HOTSPOTS])[spots]
+    
+    latitudes = np.round(centers[:, 0] + rng.normal(0, 1, count) * centers[:, 2], 6)
+    longitudes = np.round(centers[:, 1] + rng.normal(0, 1, count) * centers[:, 2], 6)
+    types = rng.choice(len(COMPLAINT_TYPES), size=count)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=days)
+    offsets = rng.integers(0, days * 24 * 3600, size=count)
+    
+    return [
+        {
+            "unique_key": f"{60_000_000 + i}",
+            "latitude": float(latitudes[i]),
+            "longitude": float(longitudes[i]),
+            "complaint_type": COMPLAINT_TYPES[types[i]],
+            "created_date": (start + timedelta(seconds=int(offsets[i]))).isoformat() + ".000",
+        }
+        for i in range(count)
+    ]
+
+
+def socrata_records(rows: List[dict]) -> List[dict]:
+    """Convert rows to the Socrata wire shape, where coordinates are strings."""
+    return [
+        {**row, "latitude": str(row["latitude"]), "longitude": str(row["longitude"])}
+        for row in rows
+    ]
+
+
+class FakeSupabaseQuery:
+    """In-memory stand-in for the postgrest query builder used by SupabaseService."""
+    
+    def __init__(self, table: "FakeSupabaseTable"):
+        self.table = table
+        self.columns: Optional[List[str]] = None
+        self.count: Optional[str] = None
+        self.filters: List[Any] = []
+        self.after: Optional[str] = None
+        self.descending = False
+        self.order_column: Optional[str] = None
+        self.row_limit: Optional[int] = None
+        self.row_range: Optional[tuple] = None
+        self.upsert_records: Optional[List[dict]] = None
+        self._negate = False
+    
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "FakeSupabaseQuery":
+        self.columns = None if columns == "*" else [column.strip() for column in columns.split(",")]
+        self.count = count
+        return self
+    
+    @property
+    def not_(self) -> "FakeSupabaseQuery":
+        self._negate = True
+        return self
+    
+    def is_(self, column: str, value: str) -> "FakeSupabaseQuery":
+        negate, self._negate = self._negate, False
+        self.filters.append(lambda row: (row.get(column) is None) != negate)
+        return self
+    
+    def eq(self, column: str, value: Any) -> "FakeSupabaseQuery":
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+    
+    def gt(self, column: str, value: Any) -> "FakeSupabaseQuery":
+        if column == "unique_key":
+            self.after = value
+        else:
+            self.filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+    
+    def order(self, column: str, desc: bool = False) -> "FakeSupabaseQuery":
+        self.order_column, self.descending = column, desc
+        return self
+    
+    def limit(self, count: int) -> "FakeSupabaseQuery":
+        self.row_limit = count
+        return self
+    
+    def range(self, start: int, end: int) -> "FakeSupabaseQuery":
+        self.row_range = (start, end + 1)
+        return self
+    
+    def upsert(self, records: List[dict], on_conflict: str = "unique_key") -> "FakeSupabaseQuery":
+        self.upsert_records = records
+        return self
+    
+    def execute(self) -> SimpleNamespace:
+        table = self.table
+        if table.latency:
+            # Stands in for the network round trip of the blocking client
+            time.sleep(table.latency)
+        
+        if self.upsert_records is not None:
+            return SimpleNamespace(data=table.upsert(self.upsert_records), count=None)
+        
+        # Rows are kept sorted by unique_key, so keyset seeks are a bisect
+        start = bisect.bisect_right(table.keys, self.after) if self.after is not None else 0
+        rows = (
+            table.rows[i] for i in range(start, len(table.rows))
+            if all(check(table.rows[i]) for check in self.filters)
+        )
+        if self.order_column not in (None, "unique_key") or self.descending:
+            rows = sorted(
+                (row for row in rows if row.get(self.order_column) is not None),
+                key=lambda row: row[self.order_column],
+                reverse=self.descending,
+            )
+        
+        rows = list(rows) if self.count else rows
+        total = len(rows) if self.count else None
+        
+        selected: List[dict] = []
+        skip, stop = self.row_range or (0, None)
+        cap = self.row_limit if self.row_limit is not None else table.max_rows
+        for i, row in enumerate(rows):
+            if stop is not None and i >= stop:
+                break
+            if i < skip:
+                continue
+            selected.append(row if self.columns is None else {column: row.get(column) for column in self.columns})
+            if len(selected) >= min(cap, table.max_rows):
+                break
+        return SimpleNamespace(data=selected, count=total)
+
+
+class FakeSupabaseTable:
+    """Rows of one table, sorted by unique_key."""
+    
+    def __init__(self, rows: List[dict], latency: float = 0.0, max_rows: int = 1000):
+        self.rows = sorted(rows, key=lambda row: row["unique_key"])
+        self.keys = [row["unique_key"] for row in self.rows]
+        self.latency = latency
+        self.max_rows = max_rows
+    
+    def upsert(self, records: List[dict]) -> List[dict]:
+        by_key = {row["unique_key"]: row for row in self.rows}
+        for record in records:
+            by_key[record["unique_key"]] = {**by_key.get(record["unique_key"], {}), **record}
+        self.rows = sorted(by_key.values(), key=lambda row: row["unique_key"])
+        self.keys = [row["unique_key"] for row in self.rows]
+        return records
+
+
+class FakeSupabaseClient:
+    """
+    Stand-in for the synchronous supabase client.
+    
+    Supports the query builder calls SupabaseService makes, including the
+    1000-row response cap and an optional per-request latency.
+    """
+    
+    def __init__(self, rows: List[dict], latency: float = 0.0, max_rows: int = 1000):
+        """
+        Initialize the client.
+        
+        Args:
+            rows: Contents of the noise_complaints table
+            latency: Seconds every request blocks for
+            max_rows: Rows returned at most per request, like PostgREST's max-rows
+        """
+        self._table = FakeSupabaseTable(rows, latency, max_rows)
+    
+    def table(self, name: str) -> FakeSupabaseQuery:
+        return FakeSupabaseQuery(self._table)
+
+
+def socrata_transport(records: List[dict], latency: float = 0.0) -> httpx.MockTransport:
+    """
+    Serve SoQL page and count(*) queries from in-memory Socrata records.
+    
+    The created_date window in ``$where`` is ignored; every record is in range.
+    
+    Args:
+        records: Records in the Socrata wire shape (see socrata_records)
+        latency: Seconds every response is delayed by
+    
+    Returns:
+        Transport for an httpx.AsyncClient
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        params = request.url.params
+        if params.get("$select", "").startswith("count("):
+            return httpx.Response(200, json=[{"total": str(len(records))}])
+        
+        offset = int(params.get("$offset", 0))
+        limit = int(params.get("$limit", 1000))
+        return httpx.Response(200, json=records[offset:offset + limit])
+    
+    return httpx.MockTransport(handler)
+
+
+def _place_results(lat: float, lng: float, place_type: str, page: int, seed: int) -> List[dict]:
+    """Deterministic nearby search results for one page."""
+    rng = np.random.default_rng(zlib.crc32(f"{lat:.4f},{lng:.4f},{place_type},{page},{seed}".encode()))
+    return [
+        {
+            "place_id": f"bench-{place_type}-{page}-{i}-{lat:.4f}-{lng:.4f}",
+            "name": f"Benchmark {place_type.replace('_', ' ').title()} {page * 20 + i}",
+            "rating": round(float(rng.uniform(3.0, 5.0)), 1),
+            "user_ratings_total": int(rng.integers(5, 3000)),
+            "vicinity": f"{int(rng.integers(1, 999))} Broadway, New York",
+            "geometry": {"location": {
+                "lat": lat + float(rng.normal(0, 0.006)),
+                "lng": lng + float(rng.normal(0, 0.006)),
+            }},
+            "types": [place_type, "point_of_interest", "establishment"],
+            "photos": [{"photo_reference": f"photo-{page}-{i}", "height": 800, "width": 1200}],
+            "opening_hours": {"open_now": bool(rng.integers(0, 2))},
+        }
+        for i in range(20)
+    ]
+
+
+def places_transport(latency: float = 0.0, pages: int = 3, seed: int = 0) -> httpx.MockTransport:
+    """
+    Serve Google Places nearby search and details requests with synthetic places.
+    
+    Args:
+        latency: Seconds every response is delayed by
+        pages: Nearby search pages of 20 results per query
+        seed: Random seed mixed into the generated places
+    
+    Returns:
+        Transport for an httpx.AsyncClient
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        params = request.url.params
+        
+        if request.url.path.endswith("/nearbysearch/json"):
+            if "pagetoken" in params:
+                state = json.loads(params["pagetoken"])
+                lat, lng, place_type, page = state["lat"], state["lng"], state["type"], state["page"]
+            else:
+                lat, lng = (float(value) for value in params["location"].split(","))
+                place_type, page = params.get("type", "library"), 0
+            
+            body: Dict[str, Any] = {"status": "OK", "results": _place_results(lat, lng, place_type, page, seed)}
+            if page + 1 < pages:
+                body["next_page_token"] = json.dumps({"lat": lat, "lng": lng, "type": place_type, "page": page + 1})
+            return httpx.Response(200, json=body)
+        
+        if request.url.path.endswith("/details/json"):
+            place_id = params["place_id"]
+            return httpx.Response(200, json={"status": "OK", "result": {
+                "place_id": place_id,
+                "name": f"Benchmark place {place_id}",
+                "formatted_address": "1 Benchmark Plaza, New York, NY",
+                "rating": 4.5,
+                "user_ratings_total": 120,
+                "geometry": {"location": {"lat": 40.75, "lng": -73.98}},
+                "types": ["library"],
+                "reviews": [
+                    {"author_name": "Reviewer", "rating": 5, "text": "Quiet. " * 40, "time": 1_700_000_000}
+                    for _ in range(5)
+                ],
+                "opening_hours": {"open_now": True, "weekday_text": ["Monday: 9:00 AM – 5:00 PM"] * 7},
+            }})
+        
+        return httpx.Response(404, json={"status": "NOT_FOUND"})
+    
+    return httpx.MockTransport(handler)
+
+
+def random_points(count: int, seed: int = 0) -> np.ndarray:
+    """Random (lat, lng) query points inside NYC, shape (count, 2)."""
+    rng = np.random.default_rng(seed)
+    min_lat, max_lat, min_lng, max_lng = NYC_BOUNDS
+    return np.column_stack([rng.uniform(min_lat, max_lat, count), rng.uniform(min_lng, max_lng, count)])
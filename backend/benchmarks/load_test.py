@@ -0,0 +1,225 @@
+"""End-to-end load test of the API endpoints, reporting latency percentiles and RPS."""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+# Add parent directory to path to import app and benchmark modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fakes import (
+    NYC_BOUNDS,
+    FakeSupabaseClient,
+    configure_offline_env,
+    places_transport,
+    socrata_records,
+    socrata_transport,
+    synthetic_complaints,
+)
+
+# A request to send: (method, path with query string, optional JSON body)
+Request = Tuple[str, str, Optional[dict]]
+
+
+def _point(rng: random.Random) -> Tuple[float, float]:
+    min_lat, max_lat, min_lng, max_lng = NYC_BOUNDS
+    return rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+
+
+def _viewport(rng: random.Random, zoom: int) -> str:
+    lat, lng = _point(rng)
+    half_lat = 180.0 / 2 ** zoom
+    half_lng = 360.0 / 2 ** zoom
+    return (
+        f"zoom={zoom}&min_lat={lat - half_lat:.5f}&max_lat={lat + half_lat:.5f}"
+        f"&min_lng={lng - half_lng:.5f}&max_lng={lng + half_lng:.5f}"
+    )
+
+
+def _tile(rng: random.Random) -> str:
+    zoom = rng.randint(11, 15)
+    lat, lng = _point(rng)
+    scale = 2 ** zoom
+    x = int((lng + 180.0) / 360.0 * scale)
+    y = int((1.0 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2.0 * scale)
+    return f"/complaints/tiles/{zoom}/{x}/{y}"
+
+
+# Endpoint scenarios: each builds one randomized request
+SCENARIOS: Dict[str, Callable[[random.Random], Request]] = {
+    "health": lambda rng: ("GET", "/health", None),
+    "density": lambda rng: ("GET", f"/complaints/density?{_viewport(rng, rng.randint(11, 15))}", None),
+    "density_all": lambda rng: ("GET", "/complaints/density", None),
+    "density_binary": lambda rng: ("GET", f"/complaints/density?{_viewport(rng, 13)}&format=binary", None),
+    "density_hour": lambda rng: (
+        "GET", f"/complaints/density?{_viewport(rng, 13)}&dow={rng.randint(0, 6)}&hour={rng.randint(0, 23)}", None
+    ),
+    "tiles": lambda rng: ("GET", _tile(rng), None),
+    "near": lambda rng: ("GET", "/complaints/near?lat={:.5f}&lng={:.5f}&radius=300&k=5".format(*_point(rng)), None),
+    "near_batch": lambda rng: ("POST", "/complaints/near/batch", {
+        "points": [dict(zip(("lat", "lng"), _point(rng))) for _ in range(60)],
+        "radius": 250,
+    }),
+    "complaints": lambda rng: ("GET", "/complaints?limit=1000", None),
+    "places": lambda rng: ("GET", "/places?lat={:.5f}&lng={:.5f}&radius=1500".format(*_point(rng)), None),
+    "places_quiet": lambda rng: (
+        "GET", "/places?lat={:.5f}&lng={:.5f}&radius=1500&sort=quietness".format(*_point(rng)), None
+    ),
+}
+
+DEFAULT_SCENARIOS = ["health", "density", "density_binary", "tiles", "near", "near_batch", "complaints", "places"]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    requests: int,
+    concurrency: int,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Send ``requests`` requests of one scenario from ``concurrency`` workers.
+    
+    Args:
+        client: Client for the app (in-process or over the network)
+        name: Scenario name from SCENARIOS
+        requests: Total number of requests
+        concurrency: Number of requests in flight at once
+        seed: Random seed for the generated requests
+    
+    Returns:
+        Result with latency percentiles in milliseconds, RPS and error count
+    """
+    rng = random.Random(seed)
+    planned = [SCENARIOS[name](rng) for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+    queue = iter(planned)
+    
+    async def worker() -> None:
+        nonlocal errors
+        for method, path, body in queue:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                await response.aread()
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """Print one scenario result as a table row."""
+    print(
+        f"{result['scenario']:<16} {result['rps']:>9.1f} rps  "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  max {result['max_ms']:>8.2f} ms  "
+        f"errors {result['errors']}",
+        flush=True,
+    )
+
+
+async def run_load_test(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Run the selected scenarios against a live server or the in-process app.
+    
+    In-process runs install the fakes: the Supabase client is replaced by
+    FakeSupabaseClient over ``args.rows`` synthetic complaints, and the
+    Socrata and Google Places clients by local mock transports, each with
+    the configured latency. The app's lifespan runs as it would in
+    production, so the complaint index is built from the fake table.
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        One result per scenario
+    """
+    results = []
+    
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60.0) as client:
+            for name in args.scenarios:
+                results.append(await run_scenario(client, name, args.requests, args.concurrency, args.seed))
+                print_result(results[-1])
+        return results
+    
+    configure_offline_env()
+    
+    from app.main import app
+    from app.services.http_client import shared_http_client
+    from app.services.nyc_opendata import nyc_opendata_client
+    from app.services.supabase_service import supabase_service
+    
+    print(f"Generating {args.rows:,} synthetic complaints...", flush=True)
+    rows = synthetic_complaints(args.rows, seed=args.seed)
+    supabase_service.client = FakeSupabaseClient(rows, latency=args.db_latency)
+    shared_http_client._client = httpx.AsyncClient(transport=places_transport(latency=args.upstream_latency))
+    nyc_opendata_client.client = httpx.AsyncClient(
+        transport=socrata_transport(socrata_records(rows[:10_000]), latency=args.upstream_latency)
+    )
+    
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        print(f"Started app in {time.perf_counter() - started:.2f}s", flush=True)
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+            for name in args.scenarios:
+                results.append(await run_scenario(client, name, args.requests, args.concurrency, args.seed))
+                print_result(results[-1])
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=DEFAULT_SCENARIOS,
+        help="Endpoint scenarios to run",
+    )
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic complaints in the fake database")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at once")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Seconds each fake Supabase request takes")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="Seconds each fake Socrata/Places response takes")
+    parser.add_argument("--url", help="Load test a running server at this URL instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and requests")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+    
+    load_results = asyncio.run(run_load_test(args))
+    
+    if args.output:
+        args.output.write_text(json.dumps(load_results, indent=2))
+        print(f"Wrote {len(load_results)} results to {args.output}")
@@ -0,0 +1,162 @@
+"""Micro-benchmarks for complaint parsing, binning and serialization."""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add parent directory to path to import app and benchmark modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fakes import DATASET_SIZES, configure_offline_env, random_points, socrata_records, synthetic_complaints
+
+configure_offline_env()
+
+from app.models.noise_complaint import ComplaintRow
+from app.services.complaint_index import BoundingBox, ComplaintIndex, grid_size_for_zoom
+from app.utils.json_stream import iter_json_array
+from app.utils.wire_format import encode_points, encoded_response
+
+# Viewport of lower Manhattan and north Brooklyn, a typical map view
+VIEWPORT = BoundingBox(min_lat=40.68, max_lat=40.76, min_lng=-74.02, max_lng=-73.93)
+
+
+def measure(name: str, rows: int, func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a function over several runs after one warm-up call.
+    
+    Args:
+        name: Benchmark name
+        rows: Dataset size the function works on
+        func: Function to time
+        repeat: Number of timed runs
+    
+    Returns:
+        Result with the best and median run in milliseconds and rows per second
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    
+    best = min(timings)
+    return {
+        "name": name,
+        "rows": rows,
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "rows_per_second": round(rows / best) if best > 0 else None,
+    }
+
+
+def tile_for(lat: float, lng: float, zoom: int) -> tuple:
+    """Get the slippy-map tile (x, y) containing a point."""
+    scale = 2 ** zoom
+    x = int((lng + 180.0) / 360.0 * scale)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * scale)
+    return x, y
+
+
+def run_benchmarks(size: int, repeat: int, only: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Run every micro-benchmark against one synthetic dataset.
+    
+    Args:
+        size: Number of synthetic complaints
+        repeat: Timed runs per benchmark
+        only: Optional benchmark name prefixes to restrict the run to
+    
+    Returns:
+        One result per benchmark
+    """
+    rows = synthetic_complaints(size)
+    latitudes = [row["latitude"] for row in rows]
+    longitudes = [row["longitude"] for row in rows]
+    types = [row["complaint_type"] for row in rows]
+    created = [row["created_date"] for row in rows]
+    
+    # Parsing works on a page-sized Socrata response, as fetched on ingest
+    page = socrata_records(rows[:50_000])
+    page_body = json.dumps(page).encode()
+    
+    async def stream_page() -> int:
+        async def chunks():
+            for start in range(0, len(page_body), 65_536):
+                yield page_body[start:start + 65_536]
+        return sum([1 async for _ in iter_json_array(chunks())])
+    
+    index = ComplaintIndex(latitudes, longitudes, complaint_types=types, created_dates=created)
+    coarse = index.grid(grid_size_for_zoom(12))
+    coarse_lats, coarse_lngs = coarse.cell_centers()
+    metadata = {"total_complaints": int(coarse.counts.sum()), "max_density": coarse.max_density, "grid_size": coarse.grid_size}
+    json_body, _ = encode_points("json", coarse_lats, coarse_lngs, coarse.counts, metadata)
+    tile_x, tile_y = tile_for(40.72, -73.98, 14)
+    
+    def cold_time_grid():
+        # Drop the built bucket grids so each run bins the bucket again
+        index.time_grids.clear()
+        return index.grid(grid_size_for_zoom(14), dow=5, hour=23)
+    places = random_points(60)
+    
+    benchmarks = [
+        ("parse.from_socrata", len(page), lambda: [ComplaintRow.from_socrata(item) for item in page]),
+        ("parse.iter_json_array", len(page), lambda: asyncio.run(stream_page())),
+        ("index.build", size, lambda: ComplaintIndex(latitudes, longitudes, complaint_types=types, created_dates=created)),
+        ("bin.grid_zoom12", size, lambda: index.grid(grid_size_for_zoom(12))),
+        ("bin.grid_zoom16_viewport", size, lambda: index.grid(grid_size_for_zoom(16), bbox=VIEWPORT)),
+        ("bin.grid_zoom14_dow_hour", size, lambda: index.grid(grid_size_for_zoom(14), dow=5, hour=23)),
+        ("bin.grid_zoom14_dow_hour_cold", size, cold_time_grid),
+        ("bin.tile_zoom14", size, lambda: index.tiles.tile(14, tile_x, tile_y)),
+        ("query.noise_scores_60", size, lambda: index.noise_scores(places[:, 0], places[:, 1], 250)),
+        ("query.nearest_60_k10", size, lambda: index.nearest(places[:, 0], places[:, 1], 10)),
+        ("serialize.json", len(coarse), lambda: encode_points("json", coarse_lats, coarse_lngs, coarse.counts, metadata)),
+        ("serialize.columnar", len(coarse), lambda: encode_points("columnar", coarse_lats, coarse_lngs, coarse.counts, metadata)),
+        ("serialize.binary", len(coarse), lambda: encode_points("binary", coarse_lats, coarse_lngs, coarse.counts, metadata)),
+        ("serialize.json_gzip", len(coarse), lambda: encoded_response(json_body, "application/json", "gzip")),
+        ("serialize.json_br", len(coarse), lambda: encoded_response(json_body, "application/json", "br")),
+    ]
+    
+    results = []
+    for name, count, func in benchmarks:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result = measure(name, count, func, repeat)
+        result["dataset"] = size
+        results.append(result)
+        print(
+            f"{size:>9,}  {name:<28} {result['best_ms']:>10.3f} ms best "
+            f"{result['median_ms']:>10.3f} ms median  {count:>9,} rows",
+            flush=True,
+        )
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DATASET_SIZES[:2]),
+        help=f"Synthetic dataset sizes (default 10000 100000; {DATASET_SIZES[-1]} for the full run)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name starts with one of these")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+    
+    all_results = []
+    for size in args.sizes:
+        all_results.extend(run_benchmarks(size, args.repeat, args.only))
+    
+    if args.output:
+        args.output.write_text(json.dumps(all_results, indent=2))
+        print(f"Wrote {len(all_results)} results to {args.output}")
@@ -0,0 +1,123 @@
+"""Script to backfill the local complaint archive with historical NYC OpenData."""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.archive import ComplaintArchive, group_rows_by_day
+from app.services.nyc_opendata import NYCOpenDataClient
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_archive(start: date, end: date, days_per_request: int = 7, force: bool = False):
+    """
+    Download complaints day range by day range and archive one partition per day.
+    
+    Days that are already archived are skipped unless ``force`` is set, so
+    an interrupted backfill can simply be re-run.
+    
+    Args:
+        start: First day to archive
+        end: Last day to archive (inclusive)
+        days_per_request: Days fetched per OpenData query window (at least 1)
+        force: Whether to re-download days that are already archived
+    """
+    archive = ComplaintArchive(settings.ARCHIVE_DIR)
+    opendata_client = NYCOpenDataClient()
+    
+    logger.info(f"Backfilling archive at {archive.root} from {start} to {end}...")
+    archived_total = 0
+    
+    try:
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=days_per_request - 1), end)
+            days = [window_start + timedelta(days=i) for i in range((window_end - window_start).days + 1)]
+            window_start = window_end + timedelta(days=1)
+            
+            if not force and all(archive.has_partition(day) for day in days):
+                logger.info(f"Skipping {days[0]} to {days[-1]} (already archived)")
+                continue
+            
+            rows = [
+                row async for row in opendata_client.iter_complaints(
+                    f"{days[0].isoformat()}T00:00:00",
+                    f"{(days[-1] + timedelta(days=1)).isoformat()}T00:00:00",
+                )
+            ]
+            by_day = group_rows_by_day(rows)
+            
+            # Days without complaints get an empty partition so they count as done
+            for day in days:
+                archived = await asyncio.to_thread(archive.write_partition, day, by_day.get(day, []))
+                archived_total += archived
+                logger.info(f"Archived {archived} complaints for {day}")
+        
+        logger.info(f"Backfill complete: {archived_total} complaints archived")
+    
+    except Exception as e:
+        logger.error(f"Error during archive backfill: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        await opendata_client.close()
+
+
+def parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD command line argument."""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def positive_int(value: str) -> int:
+    """Parse a command line argument that must be a whole number of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+if __name__ == "__main__":
+    yesterday = date.today() - timedelta(days=1)
+    
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--start",
+        type=parse_date,
+        default=yesterday - timedelta(days=89),
+        help="First day to archive, YYYY-MM-DD (default 90 days ago)",
+    )
+    parser.add_argument(
+        "--end",
+        type=parse_date,
+        default=yesterday,
+        help="Last day to archive, YYYY-MM-DD (default yesterday, the last complete day)",
+    )
+    parser.add_argument(
+        "--days-per-request",
+        type=positive_int,
+        default=7,
+        help="Days downloaded per OpenData query window",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-download days that are already archived",
+    )
+    args = parser.parse_args()
+    
+    if args.start > args.end:
+        parser.error("--start must not be after --end")
+    
+    asyncio.run(backfill_archive(args.start, args.end, args.days_per_request, args.force))
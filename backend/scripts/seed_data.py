@@ -1,5 +1,6 @@
 """Script to seed noise complaints data from NYC OpenData into Supabase."""
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -8,6 +9,7 @@ from pathlib import Path
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.services.complaint_sync import sync_complaints
 from app.services.nyc_opendata import NYCOpenDataClient
 from app.services.supabase_service import SupabaseService
 
@@ -19,8 +21,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def seed_data():
-    """Fetch past week's noise complaints and store them in Supabase."""
+async def seed_data(full: bool = False):
+    """
+    Fetch noise complaints and store them in Supabase.
+    
+    Only complaints newer than the newest stored one are fetched, unless
+    ``full`` is set or the table is empty.
+    
+    Args:
+        full: Whether to re-fetch the whole past week
+    """
     logger.info("Starting data seeding process...")
     
     # Initialize clients
@@ -31,26 +41,29 @@ async def seed_data():
         # Ensure table exists
         supabase_service.ensure_table_exists()
         
-        # Fetch all complaints from the past week
-        logger.info("Fetching noise complaints from NYC OpenData...")
-        complaints = await opendata_client.fetch_all_past_week_complaints()
+        # Fetch new complaints and upsert them into Supabase
+        logger.info("Syncing noise complaints from NYC OpenData...")
+        summary = await sync_complaints(opendata_client, supabase_service, full=full)
         
-        if not complaints:
-            logger.warning("No complaints found for the past week")
+        if not summary["fetched"]:
+            logger.warning("No new complaints found")
             return
         
-        logger.info(f"Found {len(complaints)} complaints to insert")
-        
-        # Insert complaints into Supabase
-        logger.info("Inserting complaints into Supabase...")
-        inserted_count = supabase_service.insert_complaints(complaints)
+        logger.info(
+            f"Successfully seeded {summary['inserted']} noise complaints "
+            f"({summary['mode']} sync, {summary['fetched']} fetched)"
+        )
         
-        logger.info(f"Successfully seeded {inserted_count} noise complaints")
+        if summary["stopped"]:
+            logger.error(
+                f"Upsert chunk {summary['failed_chunks'][0]['index']} failed and the sync stopped; "
+                "re-run to resume from the last stored complaint (with --full if this run was)"
+            )
         
         # Get final count
         total_count = supabase_service.get_complaints_count()
         logger.info(f"Total complaints in database: {total_count}")
-        
+    
     except Exception as e:
         logger.error(f"Error during data seeding: {e}", exc_info=True)
         sys.exit(1)
@@ -60,5 +73,13 @@ async def seed_data():
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_data())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch the whole past week instead of only new complaints",
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(seed_data(full=args.full))
 
@@ -0,0 +1,12 @@
+"""Shared pytest setup: run the app against dummy credentials and temp directories."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to path to import app and benchmark modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fakes import configure_offline_env
+
+# Settings are read when app.config is first imported
+configure_offline_env()
@@ -0,0 +1,108 @@
+"""Tests for the in-memory TTL cache."""
+
+import asyncio
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache("test_lru", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire(clock):
+    cache = TTLCache("test_expiry", maxsize=10, ttl=60)
+    cache.set("a", 1)
+    
+    clock.now += 59
+    assert cache.get("a") == 1
+    
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = TTLCache("test_coalesce", maxsize=10, ttl=60)
+    calls = []
+    
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+    
+    async def run():
+        values = await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+        return values, await cache.get_or_fetch("key", fetch)
+    
+    values, cached = asyncio.run(run())
+    
+    assert values == ["value"] * 5
+    assert cached == "value"
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+
+
+def test_failed_fetch_is_not_cached():
+    cache = TTLCache("test_failure", maxsize=10, ttl=60)
+    
+    async def fail() -> str:
+        raise RuntimeError("upstream down")
+    
+    async def succeed() -> str:
+        return "value"
+    
+    async def run() -> str:
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(cache.get_or_fetch("key", fail), cache.get_or_fetch("key", fail))
+        return await cache.get_or_fetch("key", succeed)
+    
+    assert asyncio.run(run()) == "value"
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    cache = TTLCache("test_cancel", maxsize=10, ttl=60)
+    
+    async def fetch() -> str:
+        await asyncio.sleep(0.02)
+        return "value"
+    
+    async def run() -> str:
+        first = asyncio.ensure_future(cache.get_or_fetch("key", fetch))
+        second = asyncio.ensure_future(cache.get_or_fetch("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(run()) == "value"
+    assert cache.get("key") == "value"
@@ -0,0 +1,64 @@
+"""Tests for exact and near-duplicate chat answer caching."""
+
+import pytest
+
+from app.config import settings
+from app.services.chat_cache import ChatResponseCache
+
+PLACES = [{"name": "Bryant Park Cafe", "type": "cafe"}]
+
+
+def cache_with(message: str, similarity: float = 0.85) -> ChatResponseCache:
+    """Cache holding an answer to ``message`` asked with PLACES."""
+    cache = ChatResponseCache(name="test_chat", maxsize=10, ttl=60, similarity=similarity)
+    cache.set(cache.key_for(message, PLACES), f"answer to: {message}")
+    return cache
+
+
+def test_near_duplicates_are_off_by_default():
+    assert settings.CHAT_CACHE_SIMILARITY == 0
+    cache = cache_with("Where can I study quietly near Bryant Park?", similarity=settings.CHAT_CACHE_SIMILARITY)
+    
+    assert cache.lookup(cache.key_for("where can i study quietly near bryant park", PLACES))[1] == "exact"
+    assert cache.lookup(cache.key_for("Where can I study quietly near the Bryant Park?", PLACES)) == (None, None)
+
+
+def test_near_duplicate_differing_in_filler_words_matches():
+    cache = cache_with("What are some quiet cafes to study in near Bryant Park?")
+    
+    answer, match = cache.lookup(cache.key_for("What are quiet cafes to study in near Bryant Park?", PLACES))
+    assert match == "similar"
+    assert answer == "answer to: What are some quiet cafes to study in near Bryant Park?"
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("Is the library near Bryant Park quiet on Monday?", "Is the library near Bryant Park quiet on Sunday?"),
+    ("Is it noisy around the Bryant Park cafe in the evening?", "Is it not noisy around the Bryant Park cafe in the evening?"),
+    ("Is it noisy around the Bryant Park cafe in the evening?", "Isn't it noisy around the Bryant Park cafe in the evening?"),
+    ("Which quiet cafes are on 5th Avenue near the library?", "Which quiet cafes are on 6th Avenue near the library?"),
+    ("How quiet is the walk from Bryant Park to Madison Square Park?",
+     "How quiet is the walk from Madison Square Park to Bryant Park?"),
+    ("Where is a quiet place to study near Bryant Park?", "When is a quiet place to study near Bryant Park?"),
+    ("Are there quiet cafes near Bryant Park?", "Are there quiet cafes in Bryant Park?"),
+])
+def test_different_questions_do_not_match(cached, asked):
+    cache = cache_with(cached, similarity=0.5)
+    
+    assert cache.lookup(cache.key_for(asked, PLACES)) == (None, None)
+
+
+def test_near_duplicate_needs_same_places():
+    cache = cache_with("What are some quiet cafes to study in near Bryant Park?")
+    
+    key = cache.key_for("What are quiet cafes to study in near Bryant Park?", [{"name": "Other Cafe"}])
+    assert cache.lookup(key) == (None, None)
+
+
+def test_evicted_answers_leave_the_index():
+    cache = ChatResponseCache(name="test_chat_evict", maxsize=1, ttl=60, similarity=0.5)
+    cache.set(cache.key_for("quiet cafes near bryant park", PLACES), "first")
+    cache.set(cache.key_for("quiet libraries near union square", PLACES), "second")
+    
+    assert cache.lookup(cache.key_for("the quiet cafes near bryant park", PLACES)) == (None, None)
+    assert cache.lookup(cache.key_for("the quiet libraries near union square", PLACES)) == ("second", "similar")
+    assert len(cache._message_words) == 1
@@ -0,0 +1,89 @@
+"""Tests for chat slot and session lock handling of streamed chat answers."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.routers import chat
+
+
+class FakeChat:
+    """Gemini chat streaming one chunk once ``gate`` is set."""
+    
+    def __init__(self, gate: asyncio.Event, started: List[int]):
+        self.gate = gate
+        self.started = started
+    
+    async def send_message_async(self, message: str, stream: bool = False):
+        self.started.append(chat.chat_slots._value)
+        await self.gate.wait()
+        
+        async def chunks():
+            yield SimpleNamespace(text=f"re: {message}")
+        return chunks()
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """Replace the Gemini model with a FakeChat, returning its gate and slot log."""
+    gate = asyncio.Event()
+    started: List[int] = []
+    model = SimpleNamespace(start_chat=lambda history: FakeChat(gate, started))
+    monkeypatch.setattr(chat, "get_model", lambda system_instruction=None: model)
+    return gate, started
+
+
+def test_streams_of_one_session_hold_one_slot(fake_gemini):
+    gate, started = fake_gemini
+    app = FastAPI()
+    app.include_router(chat.router)
+    free_slots = chat.chat_slots._value
+    
+    async def run() -> List[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/chat/stream", json={"message": "one more question"})
+            session_id = first.headers["X-Chat-Session"]
+            
+            gate.clear()
+            second = asyncio.create_task(client.post("/chat/stream", json={"message": "a", "session_id": session_id}))
+            third = asyncio.create_task(client.post("/chat/stream", json={"message": "b", "session_id": session_id}))
+            while len(started) < 2:
+                await asyncio.sleep(0.01)
+            # The third request waits for the session lock, not for a slot
+            await asyncio.sleep(0.05)
+            assert chat.chat_slots._value == free_slots - 1
+            
+            gate.set()
+            return [first, await second, await third]
+    
+    gate.set()
+    responses = asyncio.run(run())
+    
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert all("event: done" in response.text for response in responses)
+    assert started == [free_slots - 1] * 3
+    assert chat.chat_slots._value == free_slots
+
+
+def test_unstarted_stream_releases_slot_and_lock(fake_gemini):
+    free_slots = chat.chat_slots._value
+    
+    async def run() -> chat.ChatSession:
+        response = await chat.chat_stream(chat.ChatRequest(message="never read"))
+        session = chat.chat_session_store.get_or_create(response.headers["X-Chat-Session"])
+        assert chat.chat_slots._value == free_slots - 1
+        assert session.lock.locked()
+        
+        # The client went away before the body was sent
+        await response.background()
+        return session
+    
+    session = asyncio.run(run())
+    
+    assert chat.chat_slots._value == free_slots
+    assert not session.lock.locked()
@@ -0,0 +1,124 @@
+"""Tests for the in-memory complaint index grids."""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from app.services.complaint_index import GRID_LEVELS, BoundingBox, CellGrid, ComplaintIndex, time_mask
+
+LEVEL = GRID_LEVELS[0]
+
+
+def random_index(size: int = 5000, seed: int = 7) -> ComplaintIndex:
+    """Index of random complaints around Manhattan, some without a timestamp."""
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(40.70, 40.80, size)
+    longitudes = rng.uniform(-74.02, -73.93, size)
+    stamps = np.datetime64("2024-01-01T00:00:00") + rng.integers(0, 365 * 86400, size).astype("timedelta64[s]")
+    created_dates = [None if i % 50 == 0 else str(stamp) for i, stamp in enumerate(stamps)]
+    return ComplaintIndex(latitudes, longitudes, created_dates=created_dates)
+
+
+def cells(grid: CellGrid) -> Dict[Tuple[int, int], int]:
+    """Map each cell of a grid to its count."""
+    return {(int(row), int(col)): int(count) for row, col, count in zip(grid.rows, grid.cols, grid.counts)}
+
+
+def brute_force(index: ComplaintIndex, dow: Optional[int], hour: Optional[int]) -> Dict[Tuple[int, int], int]:
+    """Bin the complaints of a time bucket point by point."""
+    selected = time_mask(index.hours_of_week, dow, hour)
+    counts: Dict[Tuple[int, int], int] = {}
+    for lat, lng in zip(index.latitudes[selected], index.longitudes[selected]):
+        cell = (int(np.rint(lat / LEVEL)), int(np.rint(lng / LEVEL)))
+        counts[cell] = counts.get(cell, 0) + 1
+    return counts
+
+
+def test_time_grids_are_built_on_first_use():
+    index = random_index()
+    assert index.time_grids == {}
+    
+    grid = index.grid(LEVEL, hour=9)
+    assert list(index.time_grids) == [(LEVEL, None, 9)]
+    assert index.grid(LEVEL, hour=9) is grid
+
+
+@pytest.mark.parametrize("dow, hour", [(3, 14), (0, 0), (6, 23), (2, None), (None, 9), (None, 0)])
+def test_time_filtered_grid_matches_brute_force(dow, hour):
+    index = random_index()
+    
+    assert cells(index.grid(LEVEL, dow=dow, hour=hour)) == brute_force(index, dow, hour)
+
+
+def test_time_filtered_limit_uses_bucket_total():
+    index = random_index()
+    total = int(time_mask(index.hours_of_week, 5, None).sum())
+    
+    # A limit covering the bucket is answered from the cube
+    index.grid(LEVEL, limit=total, dow=5)
+    assert (LEVEL, 5, None) in index.time_grids
+    
+    sampled = index.grid(LEVEL, limit=total // 2, dow=5)
+    assert int(sampled.counts.sum()) == total // 2
+
+
+def test_time_filtered_viewport():
+    index = random_index()
+    bbox = BoundingBox(min_lat=40.74, min_lng=-73.99, max_lat=40.76, max_lng=-73.96)
+    
+    expected = {
+        (row, col): count for (row, col), count in brute_force(index, None, 18).items()
+        if bbox.min_lat <= (row + 0.5) * LEVEL and (row - 0.5) * LEVEL <= bbox.max_lat
+        and bbox.min_lng <= (col + 0.5) * LEVEL and (col - 0.5) * LEVEL <= bbox.max_lng
+    }
+    assert cells(index.grid(LEVEL, bbox=bbox, hour=18)) == expected
+
+
+def test_unknown_timestamps_only_count_unfiltered():
+    index = random_index()
+    
+    assert int(index.grid(LEVEL).counts.sum()) == len(index)
+    assert sum(int(index.grid(LEVEL, dow=dow).counts.sum()) for dow in range(7)) == len(index) - len(index) // 50
+
+
+def in_viewport(grid_size: float, bbox: BoundingBox, row: int, col: int) -> bool:
+    """Whether a cell overlaps a viewport, from the cell's edges."""
+    return (
+        bbox.min_lat <= (row + 0.5) * grid_size and (row - 0.5) * grid_size <= bbox.max_lat
+        and bbox.min_lng <= (col + 0.5) * grid_size and (col - 0.5) * grid_size <= bbox.max_lng
+    )
+
+
+# Edges kept off cell boundaries, where rounding may go either way
+VIEWPORTS = [
+    BoundingBox(min_lat=40.7413, min_lng=-73.9877, max_lat=40.7617, max_lng=-73.9621),
+    BoundingBox(min_lat=40.7512, min_lng=-73.9788, max_lat=40.7513, max_lng=-73.9787),
+    BoundingBox(min_lat=40.7507),
+    BoundingBox(max_lng=-74.0),
+    BoundingBox(min_lat=41.0, max_lat=41.1),
+    BoundingBox(min_lat=40.76, max_lat=40.74),
+    BoundingBox(),
+]
+
+
+@pytest.mark.parametrize("bbox", VIEWPORTS)
+@pytest.mark.parametrize("grid_size", GRID_LEVELS)
+def test_window_matches_brute_force(bbox, grid_size):
+    index = random_index()
+    full = cells(index.grid(grid_size))
+    
+    expected = {cell: count for cell, count in full.items() if in_viewport(grid_size, bbox, *cell)}
+    assert cells(index.grid(grid_size).window(bbox)) == expected
+    assert cells(index.grid(grid_size, bbox=bbox)) == expected
+
+
+@pytest.mark.parametrize("bbox", VIEWPORTS[:3])
+def test_binned_viewport_matches_precomputed(bbox):
+    index = random_index()
+    
+    # An off-level grid size is binned on the fly from the points in the viewport
+    grid_size = GRID_LEVELS[0] * 1.5
+    full = CellGrid(grid_size, index.latitudes, index.longitudes)
+    expected = {cell: count for cell, count in cells(full).items() if in_viewport(grid_size, bbox, *cell)}
+    assert cells(index.grid(grid_size, bbox=bbox)) == expected
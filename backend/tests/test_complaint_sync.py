@@ -0,0 +1,77 @@
+"""Tests for syncing complaints from NYC OpenData into Supabase."""
+
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.complaint_sync import sync_complaints
+from app.services.nyc_opendata import NYCOpenDataClient
+from app.services.supabase_service import SupabaseService
+from benchmarks.fakes import FakeSupabaseClient, socrata_records, socrata_transport, synthetic_complaints
+
+CHUNK_SIZE = 100
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_UPSERT_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(settings, "SUPABASE_UPSERT_MAX_RETRIES", 0)
+
+
+def opendata_client(rows: List[dict], orders: List[str]) -> NYCOpenDataClient:
+    """Client serving ``rows`` from a fake Socrata, recording each page's $order."""
+    transport = socrata_transport(socrata_records(rows))
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "$order" in request.url.params:
+            orders.append(request.url.params["$order"])
+        return await transport.handle_async_request(request)
+    
+    client = NYCOpenDataClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_failed_chunk_keeps_high_water_mark_below_missing_rows():
+    # The fake serves rows in list order, as Socrata does for the oldest-first $order
+    rows = sorted(synthetic_complaints(1000, seed=3), key=lambda row: (row["created_date"], row["unique_key"]))
+    orders: List[str] = []
+    client = opendata_client(rows, orders)
+    service = SupabaseService(FakeSupabaseClient([]))
+    
+    table = service.client._table
+    upsert = table.upsert
+    calls = []
+    
+    def flaky_upsert(records: List[dict]) -> List[dict]:
+        calls.append(len(records))
+        if len(calls) == 4:
+            raise RuntimeError("connection reset")
+        return upsert(records)
+    
+    table.upsert = flaky_upsert
+    
+    summary = asyncio.run(sync_complaints(client, service))
+    
+    assert all(order.startswith("created_date,") for order in orders)
+    assert summary["stopped"]
+    assert [chunk["index"] for chunk in summary["failed_chunks"]] == [3]
+    # Nothing after the failed chunk was written
+    assert len(calls) == 4
+    assert {row["unique_key"] for row in table.rows} == {row["unique_key"] for row in rows[:3 * CHUNK_SIZE]}
+    
+    mark = service.get_latest_created_date()
+    assert mark.isoformat() <= rows[3 * CHUNK_SIZE]["created_date"]
+    
+    # The next incremental sync picks up from the mark and fills the gap
+    table.upsert = upsert
+    summary = asyncio.run(sync_complaints(client, service))
+    
+    assert summary["mode"] == "incremental"
+    assert not summary["stopped"]
+    assert len(table.rows) == len(rows)
+    
+    asyncio.run(client.close())
@@ -0,0 +1,174 @@
+"""Tests for the SQLite-backed stale-while-revalidate cache."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.utils.disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> DiskCache:
+    cache = DiskCache(name="test", path=tmp_path / "cache.sqlite3", fresh_ttl=60, stale_ttl=600)
+    yield cache
+    cache.close()
+
+
+def backdate(cache: DiskCache, key: str, seconds: float) -> None:
+    """Make an entry look ``seconds`` older, both stored and last read."""
+    conn = cache._connection()
+    conn.execute(
+        f"UPDATE {cache.name} SET stored_at = stored_at - ?, accessed_at = accessed_at - ? WHERE key = ?",
+        (seconds, seconds, key),
+    )
+    conn.commit()
+
+
+def accessed_at(cache: DiskCache, key: str) -> float:
+    """When an entry was last recorded as read."""
+    return cache._connection().execute(
+        f"SELECT accessed_at FROM {cache.name} WHERE key = ?", (key,)
+    ).fetchone()[0]
+
+
+def counting_fetch(calls: List[bytes], value: bytes, delay: float = 0.0):
+    """Fetch returning ``value``, recording each call."""
+    async def fetch() -> bytes:
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+    return fetch
+
+
+def test_fresh_entry_is_served_without_fetching(cache):
+    calls: List[bytes] = []
+    
+    async def run() -> List[bytes]:
+        return [await cache.get_or_fetch("key", counting_fetch(calls, b"v1")) for _ in range(3)]
+    
+    assert asyncio.run(run()) == [b"v1"] * 3
+    assert calls == [b"v1"]
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 2)
+
+
+def test_stale_entry_is_served_while_revalidated(cache):
+    cache.set("key", b"old")
+    backdate(cache, "key", 120)
+    calls: List[bytes] = []
+    
+    async def run() -> bytes:
+        value = await cache.get_or_fetch("key", counting_fetch(calls, b"new", delay=0.01))
+        # Let the background refresh finish
+        await asyncio.gather(*cache._revalidating)
+        return value
+    
+    assert asyncio.run(run()) == b"old"
+    assert calls == [b"new"]
+    assert cache.get("key")[0] == b"new"
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_failed_revalidation_keeps_stale_entry(cache):
+    cache.set("key", b"old")
+    backdate(cache, "key", 120)
+    
+    async def fail() -> bytes:
+        raise RuntimeError("upstream down")
+    
+    async def run() -> bytes:
+        value = await cache.get_or_fetch("key", fail)
+        await asyncio.gather(*cache._revalidating)
+        return value
+    
+    assert asyncio.run(run()) == b"old"
+    assert cache.get("key")[0] == b"old"
+
+
+def test_expired_entry_is_refetched_before_serving(cache):
+    cache.set("key", b"old")
+    backdate(cache, "key", 601)
+    calls: List[bytes] = []
+    
+    assert asyncio.run(cache.get_or_fetch("key", counting_fetch(calls, b"new"))) == b"new"
+    assert calls == [b"new"]
+    assert not cache.contains("missing")
+
+
+def test_concurrent_misses_share_one_fetch(cache):
+    calls: List[bytes] = []
+    fetch = counting_fetch(calls, b"value", delay=0.01)
+    
+    async def run() -> List[bytes]:
+        return await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+    
+    assert asyncio.run(run()) == [b"value"] * 5
+    assert calls == [b"value"]
+    assert (cache.stats()["misses"], cache.stats()["coalesced"]) == (1, 4)
+
+
+def test_evicts_least_recently_read_over_max_bytes(tmp_path):
+    cache = DiskCache(name="bounded", path=tmp_path / "bounded.sqlite3", fresh_ttl=60, max_bytes=30)
+    for key, age in (("a", 300), ("b", 200), ("c", 100)):
+        cache.set(key, b"x" * 10)
+        backdate(cache, key, age)
+    
+    # Reading "a" makes "b" the least recently used
+    cache.get("a")
+    cache.set("d", b"x" * 10)
+    
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "d"))
+    assert cache.stats()["bytes"] == 30
+    cache.close()
+
+
+def test_reads_record_access_at_most_once_per_resolution(cache):
+    cache.set("key", b"value")
+    backdate(cache, "key", 30)
+    before = accessed_at(cache, "key")
+    
+    # A read within the resolution leaves the access time alone
+    cache.get("key")
+    assert accessed_at(cache, "key") == before
+    
+    backdate(cache, "key", 60)
+    cache.get("key")
+    assert accessed_at(cache, "key") > before
+
+
+def test_byte_total_tracks_replacements_and_reopening(tmp_path):
+    path = tmp_path / "sized.sqlite3"
+    cache = DiskCache(name="sized", path=path, fresh_ttl=60, max_bytes=100)
+    cache.set("a", b"x" * 40)
+    cache.set("b", b"x" * 40)
+    cache.set("a", b"x" * 10)
+    assert cache.stats()["bytes"] == 50
+    cache.close()
+    
+    reopened = DiskCache(name="sized", path=path, fresh_ttl=60, max_bytes=100)
+    reopened.set("c", b"x" * 60)
+    assert reopened.stats()["bytes"] == 70
+    assert reopened.stats()["evictions"] == 1
+    reopened.close()
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = tmp_path / "lazy" / "cache.sqlite3"
+    cache = DiskCache(name="lazy", path=path, fresh_ttl=60)
+    assert not path.parent.exists()
+    
+    assert cache.get("key") is None
+    assert path.exists()
+    cache.close()
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = tmp_path / "persistent.sqlite3"
+    cache = DiskCache(name="persistent", path=path, fresh_ttl=60)
+    cache.set("key", b"value")
+    cache.close()
+    
+    reopened = DiskCache(name="persistent", path=path, fresh_ttl=60)
+    assert reopened.get("key")[0] == b"value"
+    reopened.close()
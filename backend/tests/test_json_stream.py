@@ -0,0 +1,64 @@
+"""Tests for incremental JSON array parsing."""
+
+import asyncio
+import json
+from typing import Any, List
+
+import pytest
+
+from app.utils.json_stream import iter_json_array
+
+ELEMENTS = [1, 2.5, -3e-2, 1e10, 0, "text, with ] inside", {"a": [1, 2]}, [3.25, {"b": None}], True, False, None, "é"]
+
+
+def parse(chunks: List[bytes]) -> List[Any]:
+    """Run iter_json_array over a list of chunks and collect the elements."""
+    async def collect() -> List[Any]:
+        async def source():
+            for chunk in chunks:
+                yield chunk
+        return [value async for value in iter_json_array(source())]
+    
+    return asyncio.run(collect())
+
+
+def test_single_chunk():
+    body = json.dumps(ELEMENTS).encode()
+    assert parse([body]) == ELEMENTS
+
+
+def test_split_at_every_offset():
+    body = json.dumps(ELEMENTS).encode()
+    for offset in range(1, len(body)):
+        assert parse([body[:offset], body[offset:]]) == ELEMENTS, f"split at byte {offset}"
+
+
+@pytest.mark.parametrize("number", ["2.5", "-12.75", "6.02e23", "1E-7", "-0.5e+3", "42"])
+def test_numbers_split_at_every_offset(number: str):
+    body = f"[1,{number}, {number}]".encode()
+    expected = [1, json.loads(number), json.loads(number)]
+    for offset in range(1, len(body)):
+        assert parse([body[:offset], body[offset:]]) == expected, f"split at byte {offset}"
+
+
+def test_number_split_after_decimal_point():
+    assert parse([b"[1,2.", b"5]"]) == [1, 2.5]
+
+
+def test_one_byte_chunks():
+    body = json.dumps(ELEMENTS, indent=2).encode()
+    assert parse([body[i:i + 1] for i in range(len(body))]) == ELEMENTS
+
+
+def test_empty_array():
+    assert parse([b" [ ", b"]"]) == []
+
+
+def test_truncated_array():
+    with pytest.raises(ValueError):
+        parse([b"[1,2", b",3"])
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        parse([b'{"a": 1}'])
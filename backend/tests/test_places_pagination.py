@@ -0,0 +1,92 @@
+"""Tests for cached Google Places nearby search pagination."""
+
+import asyncio
+import json
+from typing import List
+
+import httpx
+
+from app.routers import places
+
+AREA = (40.75, -73.98, 1000)
+
+
+def nearby_transport(requests: List[dict], pages: int = 3) -> httpx.MockTransport:
+    """Fake Nearby Search issuing tokens that are only valid once."""
+    issued = set()
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append(params)
+        if "pagetoken" in params:
+            if params["pagetoken"] not in issued:
+                return httpx.Response(200, json={"status": "INVALID_REQUEST"})
+            issued.discard(params["pagetoken"])
+            page = json.loads(params["pagetoken"])["page"]
+        else:
+            page = 0
+        
+        body = {"status": "OK", "results": [
+            {"place_id": f"p{page}-{i}", "name": f"Place {page}-{i}", "rating": 4.0,
+             "geometry": {"location": {"lat": 40.75, "lng": -73.98}}}
+            for i in range(places.NEARBY_PAGE_SIZE)
+        ]}
+        if page + 1 < pages:
+            token = json.dumps({"page": page + 1, "serial": len(requests)})
+            issued.add(token)
+            body["next_page_token"] = token
+        return httpx.Response(200, json=body)
+    
+    return httpx.MockTransport(handler)
+
+
+def reset_caches() -> None:
+    places.nearby_search_cache.clear()
+    places.page_token_cache.clear()
+
+
+def test_follows_pages_and_caches_places_without_tokens():
+    reset_caches()
+    requests: List[dict] = []
+    
+    async def run():
+        async with httpx.AsyncClient(transport=nearby_transport(requests)) as client:
+            return await places.search_places_by_type(*AREA, "library", 0, client, max_results=60)
+    
+    results = asyncio.run(run())
+    assert len(results) == 60
+    assert len(requests) == 3
+    for key in [(*AREA, "library", page) for page in range(3)]:
+        cached = places.nearby_search_cache.get(key)
+        assert cached is not None and not hasattr(cached, "next_page_token")
+
+
+def test_expired_token_is_replaced_from_a_fresh_previous_page():
+    reset_caches()
+    requests: List[dict] = []
+    
+    async def run():
+        async with httpx.AsyncClient(transport=nearby_transport(requests)) as client:
+            await places.search_places_by_type(*AREA, "library", 0, client, max_results=20)
+            # Page 0 is still cached but its token has expired
+            places.page_token_cache.clear()
+            return await places.search_places_by_type(*AREA, "library", 0, client, max_results=40)
+    
+    results = asyncio.run(run())
+    assert len(results) == 40
+    # First page, first page again for a new token, then the second page
+    assert ["pagetoken" in params for params in requests] == [False, False, True]
+
+
+def test_prefetch_is_off_by_default():
+    reset_caches()
+    requests: List[dict] = []
+    
+    async def run():
+        async with httpx.AsyncClient(transport=nearby_transport(requests)) as client:
+            results = await places.search_places_by_type(*AREA, "library", 0, client, max_results=20)
+            await asyncio.sleep(0.05)
+            return results
+    
+    assert len(asyncio.run(run())) == 20
+    assert len(requests) == 1
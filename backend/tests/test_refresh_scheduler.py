@@ -0,0 +1,39 @@
+"""Tests for background complaint refresh jobs."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+from app.services import refresh_scheduler as scheduler_module
+from app.services.refresh_scheduler import RefreshScheduler
+
+
+def test_partial_refresh_makes_next_refreshes_full(monkeypatch):
+    outcomes = [[{"index": 3}], [{"index": 0}], [], []]
+    modes: List[bool] = []
+    
+    async def fake_sync(opendata_client, supabase_service, full=False):
+        modes.append(full)
+        failed = outcomes[len(modes) - 1]
+        return {"mode": "full" if full else "incremental", "fetched": 10, "inserted": 10, "failed_chunks": failed}
+    
+    async def rebuild():
+        return []
+    
+    monkeypatch.setattr(scheduler_module, "sync_complaints", fake_sync)
+    scheduler = RefreshScheduler(None, None, SimpleNamespace(rebuild=rebuild), interval_seconds=0)
+    
+    async def run() -> List[str]:
+        statuses = []
+        for _ in outcomes:
+            job = scheduler.submit(trigger="schedule")
+            await scheduler._tasks[job.id]
+            statuses.append(job.status)
+        return statuses
+    
+    statuses = asyncio.run(run())
+    
+    assert statuses == ["partial", "partial", "success", "success"]
+    # Full until a full refresh succeeds, then incremental again
+    assert modes == [False, True, True, False]
+    assert not scheduler.status()["backfill_pending"]
@@ -0,0 +1,36 @@
+"""Tests for response format and encoding negotiation."""
+
+import pytest
+
+from app.utils import wire_format
+from app.utils.wire_format import negotiate_encoding
+
+needs_brotli = pytest.mark.skipif(wire_format.brotli is None, reason="brotli is not installed")
+
+
+@needs_brotli
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br; q=0.0, gzip;q=0.5", "gzip"),
+    ("gzip;q=1.0, br;q=0.8", "gzip"),
+    ("BR;Q=0.9, gzip;q=0.9", "br"),
+    ("*", "br"),
+    ("*;q=0.5, br;q=0", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("br;q=oops, gzip", "gzip"),
+])
+def test_negotiate_encoding_honors_q_values(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("deflate, gzip;q=0.1", "gzip"),
+    ("*;q=0", None),
+])
+def test_negotiate_encoding_falls_back_to_gzip_or_identity(header, expected):
+    assert negotiate_encoding(header) == expected
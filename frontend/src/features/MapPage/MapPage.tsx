@@ -1,8 +1,7 @@
 // MapPage.tsx
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import Box from "@mui/material/Box";
 import Button from "@mui/material/Button";
-import CircularProgress from "@mui/material/CircularProgress";
 import Typography from "@mui/material/Typography";
 import NavigateNextIcon from "@mui/icons-material/NavigateNext";
 import NavigateBeforeIcon from "@mui/icons-material/NavigateBefore";
@@ -10,9 +9,8 @@ import ListingsPanel from "./components/ListingsPanel";
 import MapPanel from "./components/MapPanel";
 import PlaceDetailModal from "./components/PlaceDetailModal";
 import ChatBot from "./components/ChatBot";
-import type { HeatmapPoint } from "./components/MapPanel";
 import { useUserLocation } from "./hooks/useUserLocation";
-import { fetchPlaces, fetchDensity } from "../../services/placesApi";
+import { fetchPlaces } from "../../services/placesApi";
 import type { Place } from "../../services/placesApi";
 import {
   mainColor,
@@ -28,8 +26,6 @@ export default function MapPage() {
 
   // Data state
   const [places, setPlaces] = useState<Place[]>([]);
-  const [heatmapPoints, setHeatmapPoints] = useState<HeatmapPoint[]>([]);
-  const [loading, setLoading] = useState(true);
   const [placesLoading, setPlacesLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -51,22 +47,10 @@ export default function MapPage() {
     }
   }, [userLocation, hasInitialCentered]);
 
-  // Fetch heatmap density data on mount
-  useEffect(() => {
-    async function loadDensity() {
-      try {
-        setLoading(true);
-        const data = await fetchDensity(0.003, 5000);
-        setHeatmapPoints(data.points);
-      } catch (err) {
-        console.error("Failed to fetch density:", err);
-        setError("Failed to load noise data.");
-      } finally {
-        setLoading(false);
-      }
-    }
-
-    loadDensity();
+  // The map loads heatmap tiles for its viewport as it pans and zooms
+  const handleHeatmapError = useCallback((err: unknown) => {
+    console.error("Failed to fetch density tiles:", err);
+    setError("Failed to load noise data.");
   }, []);
 
   // Fetch places when user location is available
@@ -115,27 +99,6 @@ export default function MapPage() {
     }
   };
 
-  // Show loading state for initial density load
-  if (loading) {
-    return (
-      <Box
-        sx={{
-          display: "flex",
-          flexDirection: "column",
-          alignItems: "center",
-          justifyContent: "center",
-          height: "100%",
-          gap: 2,
-        }}
-      >
-        <CircularProgress sx={{ color: mainColor }} />
-        <Typography variant="body1" color="text.secondary">
-          Loading noise data...
-        </Typography>
-      </Box>
-    );
-  }
-
   return (
     <Box
       sx={{
@@ -223,7 +186,7 @@ export default function MapPage() {
       {/* --- MAP PANEL --- */}
       <Box sx={{ flexGrow: 1, height: "100%", position: "relative" }}>
         <MapPanel
-          heatmapPoints={heatmapPoints}
+          onHeatmapError={handleHeatmapError}
           places={places}
           selectedPlace={selectedPlace}
           onSelectPlace={handleMapMarkerSelect}
@@ -12,7 +12,7 @@ import CloseIcon from "@mui/icons-material/Close";
 import SendIcon from "@mui/icons-material/Send";
 import SmartToyIcon from "@mui/icons-material/SmartToy";
 
-import { sendChatMessage } from "../../../services/chatApi";
+import { streamChatMessage } from "../../../services/chatApi";
 import type { Place } from "../../../services/placesApi";
 import { mainColor, secondaryColor } from "../../../types";
 
@@ -40,6 +40,8 @@ export default function ChatBot({ places }: ChatBotProps) {
   const [inputValue, setInputValue] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  // Server-side conversation, so follow-up questions keep their context
+  const sessionIdRef = useRef<string | undefined>(undefined);
 
   // Auto-scroll to bottom when new messages arrive
   useEffect(() => {
@@ -60,15 +62,31 @@ export default function ChatBot({ places }: ChatBotProps) {
     setInputValue("");
     setIsLoading(true);
 
+    const aiMessageId = `ai-${Date.now()}`;
+
     try {
-      const response = await sendChatMessage(userMessage.text, places);
-      const aiMessage: Message = {
-        id: `ai-${Date.now()}`,
-        text: response,
-        isUser: false,
-        timestamp: new Date(),
-      };
-      setMessages((prev) => [...prev, aiMessage]);
+      // Show the answer as it is generated, growing one message
+      const reply = await streamChatMessage(
+        userMessage.text,
+        places,
+        (text) => {
+          setMessages((prev) => {
+            const last = prev[prev.length - 1];
+            if (last?.id === aiMessageId) {
+              return [...prev.slice(0, -1), { ...last, text: last.text + text }];
+            }
+            const aiMessage: Message = {
+              id: aiMessageId,
+              text,
+              isUser: false,
+              timestamp: new Date(),
+            };
+            return [...prev, aiMessage];
+          });
+        },
+        sessionIdRef.current
+      );
+      sessionIdRef.current = reply.sessionId;
     } catch (error) {
       const errorMessage: Message = {
         id: `error-${Date.now()}`,
@@ -172,7 +190,7 @@ export default function ChatBot({ places }: ChatBotProps) {
                 </Box>
               </Box>
             ))}
-            {isLoading && (
+            {isLoading && messages[messages.length - 1]?.isUser && (
               <Box sx={{ display: "flex", justifyContent: "flex-start" }}>
                 <Box
                   sx={{
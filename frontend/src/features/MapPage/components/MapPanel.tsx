@@ -8,14 +8,23 @@ import {
 } from "@vis.gl/react-google-maps";
 import { Box } from "@mui/material";
 import { DEFAULT_CENTER_LOCATION } from "../../../types";
-import type { Place, HeatmapPoint } from "../../../services/placesApi";
+import { fetchDensityForBounds } from "../../../services/placesApi";
+import type { Place, HeatmapPoint, LatLngBounds } from "../../../services/placesApi";
 
 type LatLngLiteral = { lat: number; lng: number };
 
 export type { HeatmapPoint, Place };
 
-// Heatmap Layer Component
-function HeatmapLayer({ points }: { points: HeatmapPoint[] }) {
+// Area covered by complaint data
+const NYC_BOUNDS: LatLngBounds = {
+  north: 40.92,
+  south: 40.49,
+  east: -73.70,
+  west: -74.26,
+};
+
+// Heatmap Layer Component - loads the complaint tiles covering the viewport
+function HeatmapLayer({ onError }: { onError: (err: unknown) => void }) {
   const map = useMap();
   const visualization = useMapsLibrary("visualization");
   const [heatmap, setHeatmap] = useState<google.maps.visualization.HeatmapLayer | null>(null);
@@ -49,17 +58,42 @@ function HeatmapLayer({ points }: { points: HeatmapPoint[] }) {
     };
   }, [visualization, map]);
 
-  // Update heatmap data when points change
+  // Load the tiles of the viewport whenever the map settles after a pan or zoom
   useEffect(() => {
-    if (!heatmap || !points.length) return;
+    if (!heatmap || !map) return;
+    let latestRequest = 0;
+
+    const listener = map.addListener("idle", async () => {
+      const bounds = map.getBounds()?.toJSON();
+      const zoom = map.getZoom();
+      if (!bounds || zoom === undefined) return;
+
+      // Only the part of the viewport with complaint data
+      const area = {
+        north: Math.min(bounds.north, NYC_BOUNDS.north),
+        south: Math.max(bounds.south, NYC_BOUNDS.south),
+        east: Math.min(bounds.east, NYC_BOUNDS.east),
+        west: Math.max(bounds.west, NYC_BOUNDS.west),
+      };
+      if (area.north < area.south || area.east < area.west) return;
 
-    const data = points.map((point) => ({
-      location: new google.maps.LatLng(point.lat, point.lng),
-      weight: point.weight,
-    }));
+      const request = ++latestRequest;
+      try {
+        const points = await fetchDensityForBounds(area, zoom);
+        // Skip results a later pan or zoom has superseded
+        if (request !== latestRequest) return;
+
+        heatmap.setData(points.map((point) => ({
+          location: new google.maps.LatLng(point.lat, point.lng),
+          weight: point.weight,
+        })));
+      } catch (err) {
+        onError(err);
+      }
+    });
 
-    heatmap.setData(data);
-  }, [heatmap, points]);
+    return () => listener.remove();
+  }, [heatmap, map, onError]);
 
   return null;
 }
@@ -73,12 +107,7 @@ function QuietZoneOverlay() {
 
     // Cover NYC area with green overlay to represent quiet zones
     const quietZone = new google.maps.Rectangle({
-      bounds: {
-        north: 40.92,
-        south: 40.49,
-        east: -73.70,
-        west: -74.26,
-      },
+      bounds: NYC_BOUNDS,
       fillColor: "#4CAF50",
       fillOpacity: 0.15,
       strokeWeight: 0,
@@ -162,7 +191,7 @@ function getPlaceIcon(types: string[]): string {
 
 // Controlled Map Component
 interface ControlledMapProps {
-  heatmapPoints: HeatmapPoint[];
+  onHeatmapError: (err: unknown) => void;
   places: Place[];
   selectedPlace: Place | null;
   onSelectPlace: (place: Place) => void;
@@ -171,7 +200,7 @@ interface ControlledMapProps {
 }
 
 function ControlledMap({
-  heatmapPoints,
+  onHeatmapError,
   places,
   selectedPlace,
   onSelectPlace,
@@ -213,7 +242,7 @@ function ControlledMap({
       mapId={"id"}
     >
       <QuietZoneOverlay />
-      <HeatmapLayer points={heatmapPoints} />
+      <HeatmapLayer onError={onHeatmapError} />
       <PlacesMarkersLayer
         places={places}
         selectedPlace={selectedPlace}
@@ -226,7 +255,7 @@ function ControlledMap({
 
 // Main MapPanel Component
 interface MapPanelProps {
-  heatmapPoints: HeatmapPoint[];
+  onHeatmapError: (err: unknown) => void;
   places: Place[];
   selectedPlace: Place | null;
   onSelectPlace: (place: Place) => void;
@@ -235,7 +264,7 @@ interface MapPanelProps {
 }
 
 export default function MapPanel({
-  heatmapPoints,
+  onHeatmapError,
   places,
   selectedPlace,
   onSelectPlace,
@@ -249,7 +278,7 @@ export default function MapPanel({
         libraries={["visualization"]}
       >
         <ControlledMap
-          heatmapPoints={heatmapPoints}
+          onHeatmapError={onHeatmapError}
           places={places}
           selectedPlace={selectedPlace}
           onSelectPlace={onSelectPlace}
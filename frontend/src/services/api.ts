@@ -9,12 +9,30 @@ export interface NoiseComplaint {
   latitude: number | null;
   longitude: number | null;
   complaint_type: string | null;
+  created_date?: string | null;
 }
 
-export interface RefreshResponse {
-  status: string;
+export interface RefreshSummary {
+  mode: "incremental" | "full";
+  since: string | null;
   fetched: number;
   inserted: number;
+  chunks: number;
+  failed_chunks: unknown[];
+}
+
+export interface RefreshResponse {
+  id: string;
+  full: boolean;
+  trigger: "manual" | "schedule";
+  status: "queued" | "running" | "success" | "partial" | "failed";
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  duration_seconds: number | null;
+  summary: RefreshSummary | null;
+  indexed: number | null;
+  error: string | null;
 }
 
 /**
@@ -42,8 +60,8 @@ export async function fetchComplaints(
 }
 
 /**
- * Trigger a refresh of complaints data from NYC OpenData
- * @returns Refresh operation summary
+ * Trigger a background refresh of complaints data from NYC OpenData
+ * @returns The queued (or already running) refresh job
  */
 export async function refreshComplaints(): Promise<RefreshResponse> {
   const response = await fetch(`${API_BASE_URL}/complaints/refresh`, {
@@ -57,6 +75,21 @@ export async function refreshComplaints(): Promise<RefreshResponse> {
   return response.json();
 }
 
+/**
+ * Get the progress or result of a refresh job
+ * @param jobId Id returned by refreshComplaints
+ * @returns The refresh job
+ */
+export async function fetchRefreshJob(jobId: string): Promise<RefreshResponse> {
+  const response = await fetch(`${API_BASE_URL}/complaints/refresh/${jobId}`);
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch refresh job: ${response.statusText}`);
+  }
+
+  return response.json();
+}
+
 /**
  * Check if the backend API is healthy
  * @returns True if healthy
@@ -16,24 +16,31 @@ interface PlaceContext {
 interface ChatRequest {
   message: string;
   places?: PlaceContext[];
+  session_id?: string;
 }
 
 interface ChatResponse {
   response: string;
+  session_id: string;
+  cached?: boolean;
+}
+
+export interface ChatReply {
+  response: string;
+  sessionId: string;
 }
 
 /**
- * Send a message to the Gemini chatbot
- * @param message User's message
- * @param places Optional array of nearby places for context
- * @returns AI response text
+ * Build a chat request, converting places to the context format
  */
-export async function sendChatMessage(
+function toChatRequest(
   message: string,
-  places?: Place[]
-): Promise<string> {
+  places?: Place[],
+  sessionId?: string
+): ChatRequest {
   const requestBody: ChatRequest = {
     message,
+    session_id: sessionId,
   };
 
   // Convert places to context format if provided
@@ -46,12 +53,27 @@ export async function sendChatMessage(
     }));
   }
 
+  return requestBody;
+}
+
+/**
+ * Send a message to the Gemini chatbot
+ * @param message User's message
+ * @param places Optional array of nearby places for context
+ * @param sessionId Session id from an earlier reply, to continue that conversation
+ * @returns AI response text and the conversation's session id
+ */
+export async function sendChatMessage(
+  message: string,
+  places?: Place[],
+  sessionId?: string
+): Promise<ChatReply> {
   const response = await fetch(`${API_BASE_URL}/chat`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
-    body: JSON.stringify(requestBody),
+    body: JSON.stringify(toChatRequest(message, places, sessionId)),
   });
 
   if (!response.ok) {
@@ -60,5 +82,76 @@ export async function sendChatMessage(
   }
 
   const data: ChatResponse = await response.json();
-  return data.response;
+  return { response: data.response, sessionId: data.session_id };
+}
+
+/**
+ * Send a message to the Gemini chatbot and receive the answer as it is generated
+ * @param message User's message
+ * @param places Optional array of nearby places for context
+ * @param onText Called with each chunk of text as it arrives
+ * @param sessionId Session id from an earlier reply, to continue that conversation
+ * @returns Full AI response text and the conversation's session id
+ */
+export async function streamChatMessage(
+  message: string,
+  places: Place[] | undefined,
+  onText: (text: string) => void,
+  sessionId?: string
+): Promise<ChatReply> {
+  const response = await fetch(`${API_BASE_URL}/chat/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Accept: "text/event-stream",
+    },
+    body: JSON.stringify(toChatRequest(message, places, sessionId)),
+  });
+
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || `Failed to send message: ${response.statusText}`);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  const replySessionId = response.headers.get("X-Chat-Session") ?? sessionId ?? "";
+  let buffer = "";
+  let fullText = "";
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += value;
+
+    // Server-Sent Events are separated by a blank line
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      let data = "";
+      for (const line of rawEvent.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === "error") {
+        throw new Error(payload.detail || "Failed to generate response");
+      }
+      if (event === "done") {
+        return {
+          response: payload.response ?? fullText,
+          sessionId: payload.session_id ?? replySessionId,
+        };
+      }
+      fullText += payload.text;
+      onText(payload.text);
+    }
+  }
+
+  return { response: fullText, sessionId: replySessionId };
 }
@@ -25,6 +25,7 @@ export interface Place {
   types: string[];
   photo: PlacePhoto | null;
   is_open: boolean | null;
+  noise_score: number | null;
 }
 
 export interface PlacesResponse {
@@ -75,19 +76,22 @@ export interface PlaceDetails {
  * @param lng Longitude of search center
  * @param radius Search radius in meters
  * @param minRating Minimum rating filter
+ * @param sort Result order ("rating" or "quietness")
  * @returns List of places
  */
 export async function fetchPlaces(
   lat: number,
   lng: number,
   radius: number = 2000,
-  minRating: number = 4.0
+  minRating: number = 4.0,
+  sort: "rating" | "quietness" = "rating"
 ): Promise<Place[]> {
   const params = new URLSearchParams({
     lat: lat.toString(),
     lng: lng.toString(),
     radius: radius.toString(),
     min_rating: minRating.toString(),
+    sort,
   });
 
   const response = await fetch(`${API_BASE_URL}/places?${params}`);
@@ -100,20 +104,42 @@ export async function fetchPlaces(
   return data.places;
 }
 
+interface ColumnarDensityResponse {
+  lat: number[];
+  lng: number[];
+  w: number[];
+  total_complaints: number;
+  max_density: number;
+}
+
 /**
  * Fetch noise complaint density data for heatmap
+ * Requested in the compact columnar format and expanded into points here
  * @param gridSize Grid cell size in degrees
- * @param limit Maximum complaints to process
+ * @param limit Maximum complaints to process (default all)
+ * @param hour Only count complaints from this hour of the day (0-23)
+ * @param dow Only count complaints from this day of the week (0 = Sunday)
  * @returns Density data with heatmap points
  */
 export async function fetchDensity(
   gridSize: number = 0.005,
-  limit: number = 5000
+  limit?: number,
+  hour?: number,
+  dow?: number
 ): Promise<DensityResponse> {
   const params = new URLSearchParams({
     grid_size: gridSize.toString(),
-    limit: limit.toString(),
+    format: "columnar",
   });
+  if (limit !== undefined) {
+    params.set("limit", limit.toString());
+  }
+  if (hour !== undefined) {
+    params.set("hour", hour.toString());
+  }
+  if (dow !== undefined) {
+    params.set("dow", dow.toString());
+  }
 
   const response = await fetch(`${API_BASE_URL}/complaints/density?${params}`);
 
@@ -121,43 +147,153 @@ export async function fetchDensity(
     throw new Error(`Failed to fetch density: ${response.statusText}`);
   }
 
-  return response.json();
+  const data: ColumnarDensityResponse = await response.json();
+  return {
+    points: data.lat.map((lat, i) => ({ lat, lng: data.lng[i], weight: data.w[i] })),
+    total_complaints: data.total_complaints,
+    max_density: data.max_density,
+  };
+}
+
+export interface DensityTile {
+  z: number;
+  x: number;
+  y: number;
+  points: HeatmapPoint[];
+  total_complaints: number;
+  max_density: number;
+}
+
+export interface LatLngBounds {
+  north: number;
+  south: number;
+  east: number;
+  west: number;
+}
+
+// Zoom levels the backend precomputes heatmap tiles for
+const MIN_TILE_ZOOM = 8;
+const MAX_TILE_ZOOM = 16;
+
+// Tiles fetched recently, kept as long as the backend lets browsers cache them
+const TILE_CACHE_MS = 5 * 60 * 1000;
+const TILE_CACHE_MAX_ENTRIES = 512;
+const tileCache = new Map<string, { expires: number; tile: Promise<DensityTile> }>();
+
+/**
+ * Fetch the heatmap points of one z/x/y map tile
+ * Tiles already fetched in the last few minutes are served from memory
+ * @param z Zoom level
+ * @param x Tile column
+ * @param y Tile row
+ * @returns Heatmap points inside the tile
+ */
+export async function fetchDensityTile(
+  z: number,
+  x: number,
+  y: number
+): Promise<DensityTile> {
+  const key = `${z}/${x}/${y}`;
+  const cached = tileCache.get(key);
+  if (cached && cached.expires > Date.now()) {
+    return cached.tile;
+  }
+
+  const tile = (async () => {
+    const response = await fetch(`${API_BASE_URL}/complaints/tiles/${key}?format=columnar`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch density tile: ${response.statusText}`);
+    }
+
+    const data: ColumnarDensityResponse = await response.json();
+    return {
+      z,
+      x,
+      y,
+      points: data.lat.map((lat, i) => ({ lat, lng: data.lng[i], weight: data.w[i] })),
+      total_complaints: data.total_complaints,
+      max_density: data.max_density,
+    };
+  })();
+
+  // Least recently fetched tiles are dropped first
+  tileCache.delete(key);
+  tileCache.set(key, { expires: Date.now() + TILE_CACHE_MS, tile });
+  if (tileCache.size > TILE_CACHE_MAX_ENTRIES) {
+    tileCache.delete(tileCache.keys().next().value!);
+  }
+  tile.catch(() => {
+    if (tileCache.get(key)?.tile === tile) tileCache.delete(key);
+  });
+
+  return tile;
+}
+
+function tileColumn(lng: number, zoom: number): number {
+  return Math.floor(((lng + 180) / 360) * 2 ** zoom);
+}
+
+function tileRow(lat: number, zoom: number): number {
+  const rad = (Math.max(Math.min(lat, 85.0511), -85.0511) * Math.PI) / 180;
+  return Math.floor(((1 - Math.log(Math.tan(rad) + 1 / Math.cos(rad)) / Math.PI) / 2) * 2 ** zoom);
 }
 
 /**
- * Get the photo URL for a place
+ * Fetch the heatmap points of a map viewport from the tiles covering it
+ * Pans and zooms back to an area reuse the tiles already fetched
+ * @param bounds Viewport to cover
+ * @param zoom Map zoom level, clamped to the zoom levels tiles exist for
+ * @returns Heatmap points of every tile overlapping the viewport
+ */
+export async function fetchDensityForBounds(
+  bounds: LatLngBounds,
+  zoom: number
+): Promise<HeatmapPoint[]> {
+  const z = Math.min(Math.max(Math.round(zoom), MIN_TILE_ZOOM), MAX_TILE_ZOOM);
+  const last = 2 ** z - 1;
+  const clamp = (value: number) => Math.min(Math.max(value, 0), last);
+
+  const requests: Promise<DensityTile>[] = [];
+  for (let x = clamp(tileColumn(bounds.west, z)); x <= clamp(tileColumn(bounds.east, z)); x++) {
+    for (let y = clamp(tileRow(bounds.north, z)); y <= clamp(tileRow(bounds.south, z)); y++) {
+      requests.push(fetchDensityTile(z, x, y));
+    }
+  }
+
+  const tiles = await Promise.all(requests);
+  return tiles.flatMap((tile) => tile.points);
+}
+
+/**
+ * Get the photo URL for a place.
+ * This URL can be used directly as an image src - the backend
+ * serves the cached photo, scaled to the requested size.
  * @param photoReference Photo reference from Google Places
  * @param maxWidth Maximum width of the photo
- * @returns Photo URL
+ * @returns Backend URL of the photo
  */
-export async function getPlacePhotoUrl(
+export function getPlacePhotoUrl(
   photoReference: string,
   maxWidth: number = 400
-): Promise<string> {
+): string {
   const params = new URLSearchParams({
     photo_reference: photoReference,
     max_width: maxWidth.toString(),
   });
 
-  const response = await fetch(`${API_BASE_URL}/places/photo?${params}`);
-
-  if (!response.ok) {
-    throw new Error(`Failed to get photo URL: ${response.statusText}`);
-  }
-
-  const data = await response.json();
-  return data.photo_url;
+  return `${API_BASE_URL}/places/photo?${params}`;
 }
 
 /**
  * Get Street View image URL for a location.
  * This URL can be used directly as an image src - the backend
- * will redirect to the actual Google Street View image.
+ * serves the cached Street View image at the requested size.
  * @param lat Latitude of the location
  * @param lng Longitude of the location
  * @param width Image width in pixels
  * @param height Image height in pixels
- * @returns Backend URL that redirects to Street View image
+ * @returns Backend URL of the Street View image
  */
 export function getStreetViewImageUrl(
   lat: number,